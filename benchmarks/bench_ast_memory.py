@@ -0,0 +1,62 @@
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.corpus import generate_program
+from interpret_deez import arena, ast, compact_ast, lexer, parser
+
+
+def count_nodes(node) -> int:
+    """Counts AST nodes of any representation, Program included"""
+    if isinstance(node, arena.Arena):
+        return len(node)
+    count = 1
+    for value in vars(node).values() if hasattr(node, "__dict__") else slotted_values(node):
+        if isinstance(value, list | tuple):
+            count += sum(count_nodes(item) for item in value)
+        elif isinstance(value, ast.Node | compact_ast.Node):
+            count += count_nodes(value)
+    return count
+
+
+def slotted_values(node) -> list:
+    return [
+        getattr(node, name) for cls in type(node).__mro__ for name in getattr(cls, "__slots__", ())
+    ]
+
+
+def retained(build) -> tuple[object, int]:
+    """Builds an object and returns it with the traced memory it still holds on to"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="AST bytes per node benchmark")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"source: {len(source):,} chars")
+
+    for name, build in (
+        ("ast", lambda: parser.Parser(lexer.TableLexer(source)).parse_program()),
+        ("compact_ast", lambda: compact_ast.parse_compact(source)[0]),
+        ("arena", lambda: arena.parse_arena(source)[0]),
+    ):
+        program, size = retained(build)
+        nodes = count_nodes(program)
+        print(
+            f"{name:<12} {nodes:>10,} nodes {size / 2**20:>8.2f} MiB "
+            f"{size / nodes:>8.1f} bytes/node"
+        )
+        del program
+
+
+if __name__ == "__main__":
+    main()
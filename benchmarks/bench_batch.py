@@ -0,0 +1,41 @@
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import batch
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Multi file parsing scaling benchmark")
+    arg_parser.add_argument("--files", type=int, default=200)
+    arg_parser.add_argument("--statements", type=int, default=100)
+    arg_parser.add_argument("--chunksize", type=int, default=16)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"{args.files} files of {len(source):,} chars, {os.process_cpu_count()} CPUs")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(args.files):
+            path = pathlib.Path(directory, f"rules_{i}.monkey")
+            path.write_text(source)
+            paths.append(path)
+
+        baseline = 0.0
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            batch.parse_files(paths, workers=workers, chunksize=args.chunksize)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(
+                f"{workers} workers {seconds * 1000:>10.1f} ms {args.files / seconds:>10,.0f} "
+                f"files/s {baseline / seconds:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
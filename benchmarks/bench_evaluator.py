@@ -0,0 +1,82 @@
+import argparse
+import sys
+import time
+
+from interpret_deez import arena, closure_compiler, compiler, evaluator, lexer, objects, parser, vm
+
+programs = {
+    "fib": """
+        let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+        fib({n});
+    """,
+    "loop": """
+        let sum = fn(i, total) { if (i == 0) { total } else { sum(i - 1, total + i) } };
+        let repeat = fn(times) { if (times == 0) { 0 } else { sum(500, 0); repeat(times - 1) } };
+        repeat({n});
+    """,
+    "closures": """
+        let adder = fn(x) { fn(y) { x + y } };
+        let apply = fn(i, total) {
+            if (i == 0) { total } else { apply(i - 1, adder(i)(total)) }
+        };
+        let repeat = fn(times) { if (times == 0) { 0 } else { apply(500, 0); repeat(times - 1) } };
+        repeat({n});
+    """,
+}
+
+
+def walk(program) -> objects.Object | None:
+    return evaluator.evaluate(program, objects.Environment())
+
+
+def walk_arena(program) -> objects.Object | None:
+    return arena.evaluate(arena.from_program(program), objects.Environment())
+
+
+def run_compiled(program) -> objects.Object | None:
+    return closure_compiler.compile_program(program)(objects.Environment())
+
+
+def run_vm(program) -> objects.Object | None:
+    comp = compiler.Compiler()
+    comp.compile(program)
+    machine = vm.VM(comp.bytecode())
+    machine.run()
+    return machine.last_popped_stack_elem()
+
+
+def bench(run, program, repeat: int) -> tuple[str, float]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(program)
+        best = min(best, time.perf_counter() - start)
+    return result.inspect() if result else "", best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Evaluation backends benchmark")
+    arg_parser.add_argument("--fib", type=int, default=20)
+    arg_parser.add_argument("--times", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+    # Monkey recursion is Python recursion for the tree walking backends
+    sys.setrecursionlimit(100_000)
+
+    for name, template in programs.items():
+        n = args.fib if name == "fib" else args.times
+        program = parser.Parser(lexer.Lexer(template.replace("{n}", str(n)))).parse_program()
+        timings = []
+        for run in (walk, walk_arena, run_compiled, run_vm):
+            result, seconds = bench(run, program, args.repeat)
+            timings.append(seconds)
+            speedup = timings[0] / seconds
+            print(
+                f"{name:<10} {run.__name__:<14} {seconds * 1000:>10.1f} ms {speedup:>6.2f}x  "
+                f"result={result}"
+            )
+
+
+if __name__ == "__main__":
+    main()
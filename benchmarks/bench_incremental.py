@@ -0,0 +1,41 @@
+import argparse
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import incremental, lexer, parser
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Incremental reparse latency benchmark")
+    arg_parser.add_argument("--statements", type=int, default=10_000)
+    arg_parser.add_argument("--edits", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"source: {len(source):,} chars, {source.count(chr(10)) + 1:,} lines")
+
+    start = time.perf_counter()
+    parser.Parser(lexer.TableLexer(source)).parse_program()
+    full = time.perf_counter() - start
+    print(f"{'full parse':<20} {full * 1000:>10.2f} ms")
+
+    document = incremental.parse_document(source)
+    middle = document.span(len(document.statements) // 2)[0]
+    worst = total = 0.0
+    # type a character in the middle of the file and delete it again, like a keystroke
+    for i in range(args.edits):
+        start = time.perf_counter()
+        if i % 2 == 0:
+            document.edit(middle, 0, "x")
+        else:
+            document.edit(middle, 1, "")
+        seconds = time.perf_counter() - start
+        worst = max(worst, seconds)
+        total += seconds
+    average = total / args.edits
+    # the first edit in the middle moves the span gap over half the file, later ones are local
+    print(f"{'incremental edit':<20} {average * 1000:>10.2f} ms avg {worst * 1000:.2f} ms max")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import io
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import lexer, tokenizer
+
+lexers = {
+    "Lexer": lexer.Lexer,
+    "TableLexer": lexer.TableLexer,
+    "StreamLexer": lambda source: lexer.StreamLexer(io.StringIO(source)),
+}
+
+
+def count_tokens(lexer_class, source: str) -> int:
+    lex = lexer_class(source)
+    count = 0
+    while lex.next_token().type != tokenizer.EOF:
+        count += 1
+    return count
+
+
+def bench(lexer_class, source: str, repeat: int) -> tuple[int, float]:
+    best = float("inf")
+    tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = count_tokens(lexer_class, source)
+        best = min(best, time.perf_counter() - start)
+    return tokens, best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Lexer tokens/second benchmark")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"source: {len(source):,} chars, best of {args.repeat}")
+
+    for name, lexer_class in lexers.items():
+        tokens, seconds = bench(lexer_class, source, args.repeat)
+        rate = tokens / seconds
+        print(f"{name:<12} {tokens:>10,} tokens {rate:>14,.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import sys
+import time
+
+from interpret_deez import evaluator, lexer, objects, optimizer, parser
+
+# generated rules recompute the same constants on every call
+program = """
+    let rule = fn(x) {
+        if (1 * 2 * 3 * 4 * 5 > 100) { x * (60 * 60 * 24) + (7 - 7) * 1000 } else { 0 }
+    };
+    let loop = fn(i, total) { if (i == 0) { total } else { loop(i - 1, total + rule(i)) } };
+    loop({n}, 0);
+"""
+
+
+def bench(tree, repeat: int) -> tuple[str, float]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = evaluator.evaluate(tree, objects.Environment())
+        best = min(best, time.perf_counter() - start)
+    return result.inspect() if result else "", best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Evaluation before and after constant folding")
+    arg_parser.add_argument("--n", type=int, default=2_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+    sys.setrecursionlimit(100_000)
+
+    tree = parser.Parser(lexer.Lexer(program.replace("{n}", str(args.n)))).parse_program()
+    start = time.perf_counter()
+    folded = optimizer.fold_constants(tree)
+    print(f"fold_constants {(time.perf_counter() - start) * 1000:>8.3f} ms")
+
+    result, baseline = bench(tree, args.repeat)
+    print(f"original       {baseline * 1000:>8.1f} ms  result={result}")
+    result, seconds = bench(folded, args.repeat)
+    print(f"folded         {seconds * 1000:>8.1f} ms  result={result} {baseline / seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import lexer, parser
+from interpret_deez.iterative_parser import IterativeParser
+
+parsers = {"Parser": parser.Parser, "IterativeParser": IterativeParser}
+
+
+def bench(parser_class: type[parser.Parser], source: str, repeat: int) -> tuple[int, int, float]:
+    best = float("inf")
+    statements = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        program = parser_class(lexer.TableLexer(source)).parse_program()
+        best = min(best, time.perf_counter() - start)
+        statements = len(program.statements)
+    tokens = len(lexer.tokenize_all(source))
+    return tokens, statements, best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Parser throughput benchmark")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"source: {len(source):,} chars, best of {args.repeat}")
+    for name, parser_class in parsers.items():
+        tokens, statements, seconds = bench(parser_class, source, args.repeat)
+        print(
+            f"{name:<16} {tokens / seconds:>12,.0f} tokens/s "
+            f"{statements / seconds:>12,.0f} statements/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import lexer, tokenizer
+
+
+def count_newlines(source: str, offsets: list[int]) -> list[tuple[int, int]]:
+    positions = []
+    for offset in offsets:
+        line_start = source.rfind("\n", 0, offset) + 1
+        positions.append((source.count("\n", 0, line_start) + 1, offset - line_start + 1))
+    return positions
+
+
+def line_index(source: str, offsets: list[int]) -> list[tuple[int, int]]:
+    lines = tokenizer.LineIndex(source)
+    return [lines.position(offset) for offset in offsets]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Offset to line and column lookups")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    arg_parser.add_argument("--lookups", type=int, default=1_000)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    buffer = lexer.tokenize_all(source)
+    step = max(len(buffer) // args.lookups, 1)
+    offsets = list(buffer.starts[::step])
+    print(f"{len(source):,} characters, {len(offsets):,} lookups")
+
+    results = []
+    for run in (count_newlines, line_index):
+        start = time.perf_counter()
+        results.append(run(source, offsets))
+        print(f"{run.__name__:<16} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    assert results[0] == results[1], "positions differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import io
+import sys
+import time
+
+from benchmarks.corpus import corpora
+from interpret_deez import lexer, parser
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="AST rendering throughput benchmark")
+    arg_parser.add_argument("--statements", type=int, default=5_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+    sys.setrecursionlimit(100_000)
+
+    print(f"best of {args.repeat}")
+    for name, source in corpora(args.statements).items():
+        program = parser.Parser(lexer.TableLexer(source)).parse_program()
+        best = float("inf")
+        chars = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            out = io.StringIO()
+            program.write(out)
+            best = min(best, time.perf_counter() - start)
+            chars = len(out.getvalue())
+        print(
+            f"{name:<18} {chars:>12,} chars {best * 1000:>10.1f} ms {chars / best:>14,.0f} chars/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
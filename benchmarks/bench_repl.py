@@ -0,0 +1,57 @@
+import argparse
+import time
+
+from benchmarks.corpus import small_functions
+from interpret_deez import lexer, parser
+from interpret_deez.emulate_repl import emulate_repl
+
+
+def emulate_parser(inputs: list[str]) -> None:
+    for input in inputs:
+        emulate_repl.emulate_parser(input)
+
+
+def parser_per_input(inputs: list[str]) -> None:
+    for input in inputs:
+        parser.Parser(lexer.TableLexer(input)).parse_program()
+
+
+def reused_parser(inputs: list[str]) -> None:
+    pars = parser.Parser(lexer.TableLexer(""))
+    for input in inputs:
+        pars.parse(input)
+
+
+def parse_many(inputs: list[str]) -> None:
+    for _ in emulate_repl.parse_many(inputs):
+        pass
+
+
+runs = [emulate_parser, parser_per_input, reused_parser, parse_many]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="One parser per input vs batched parsing")
+    arg_parser.add_argument("--inputs", type=int, default=20_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    inputs = small_functions(args.inputs // 2).splitlines()
+    print(f"{len(inputs):,} inputs, best of {args.repeat}")
+
+    baseline = 0.0
+    for run in runs:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run(inputs)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(
+            f"{run.__name__:<18} {best * 1000:>10.1f} ms {len(inputs) / best:>10,.0f} inputs/s "
+            f"{baseline / best:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import os
+import time
+
+from benchmarks.corpus import generate_program
+from interpret_deez import batch, lexer, parser
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Single file split parsing benchmark")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    arg_parser.add_argument("--chunk-size", type=int, default=1 << 18)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    chunks = len(batch.split_source(source, args.chunk_size))
+    print(f"source: {len(source):,} chars in {chunks} chunks, {os.process_cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    parser.Parser(lexer.TableLexer(source)).parse_program()
+    baseline = time.perf_counter() - start
+    print(f"Parser    {baseline * 1000:>10.1f} ms")
+
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        batch.parse_split(source, workers=workers, chunk_size=args.chunk_size)
+        seconds = time.perf_counter() - start
+        print(f"{workers} workers {seconds * 1000:>10.1f} ms {baseline / seconds:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
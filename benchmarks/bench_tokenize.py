@@ -0,0 +1,57 @@
+import argparse
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import generate_program
+from interpret_deez import lexer, tokenizer
+
+
+def token_list(path: pathlib.Path) -> list[tokenizer.Token]:
+    lex = lexer.TableLexer(path.read_text())
+    tokens = [lex.next_token()]
+    while tokens[-1].type != tokenizer.EOF:
+        tokens.append(lex.next_token())
+    return tokens
+
+
+def read_and_tokenize_all(path: pathlib.Path) -> tokenizer.TokenBuffer:
+    return lexer.tokenize_all(path.read_text())
+
+
+def measure(tokenize, path: pathlib.Path) -> tuple[int, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = tokenize(path)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tokens), seconds, peak
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Token list vs token buffer benchmark")
+    arg_parser.add_argument("--statements", type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.statements)
+    print(f"source: {len(source):,} chars, read from a file")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory, "program.monkey")
+        path.write_text(source)
+        for name, tokenize in (
+            ("list[Token]", token_list),
+            ("tokenize_all", read_and_tokenize_all),
+            ("tokenize_file", lexer.tokenize_file),
+        ):
+            tokens, seconds, peak = measure(tokenize, path)
+            print(
+                f"{name:<14} {tokens:>10,} tokens {tokens / seconds:>14,.0f} tokens/s "
+                f"peak {peak / 2**20:>8.2f} MiB ({peak / tokens:.1f} bytes/token)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+def generate_program(statements: int) -> str:
+    """Builds a Monkey program that cycles through the constructs the parser knows about
+
+    Args:
+        statements (int): number of top level statements
+
+    Returns:
+        str: program source
+    """
+    templates = [
+        "let value_{i} = {i} * (value_{j} + 42) / 7 - {i};",
+        "let add_{i} = fn(x, y) {{ x + y * {i}; }};",
+        "let result_{i} = add_{j}(value_{j}, {i});",
+        "if (value_{j} < {i}) {{ return true; }} else {{ return !false; }}",
+        "value_{j} == {i} != (-value_{j} > {i});",
+    ]
+    lines = []
+    for i in range(statements):
+        template = templates[i % len(templates)]
+        lines.append(template.format(i=i, j=max(i - 1, 0)))
+    return "\n".join(lines)
+
+
+def name(i: int, prefix: str = "v") -> str:
+    """Identifier for a number, identifiers are letters and underscores only"""
+    letters = []
+    while True:
+        i, digit = divmod(i, 26)
+        letters.append(chr(ord("a") + digit))
+        if not i:
+            return f"{prefix}_{''.join(reversed(letters))}"
+
+
+def arithmetic_chain(statements: int, length: int = 200) -> str:
+    """`let` statements whose values are long chains of mixed precedence operators"""
+    operators = ["+", "*", "-", "/", "+", "*"]
+    lines = []
+    for i in range(statements):
+        terms = [str((i + k) % 97) for k in range(length)]
+        chain = "".join(f"{terms[k]} {operators[k % len(operators)]} " for k in range(length - 1))
+        lines.append(f"let {name(i)} = {chain}{terms[-1]};")
+    return "\n".join(lines)
+
+
+def deep_nesting(statements: int, depth: int = 60) -> str:
+    """Deeply nested parentheses, prefix operators and `if`/`fn` blocks"""
+    lines = []
+    for i in range(statements):
+        grouped = f"{'(' * depth}{i}{''.join(f' + {k})' for k in range(depth))}"
+        prefixed = f"{'-' * depth}{name(i)}"
+        block = name(i)
+        for k in range(depth // 4):
+            block = f"if ({name(k)} < {k}) {{ fn({name(k, 'p')}) {{ {block} }} }}"
+        lines.append(f"let {name(i)} = {grouped}; {prefixed}; {block}")
+    return "\n".join(lines)
+
+
+def small_functions(statements: int) -> str:
+    """Many small function definitions and calls, the shape of helper heavy scripts"""
+    lines = []
+    for i in range(statements):
+        function = name(i, "f")
+        lines.append(f"let {function} = fn(x, y) {{ if (x > y) {{ return x; }} x * y + {i} }};")
+        lines.append(f"let {name(i)} = {function}({i}, {name(max(i - 1, 0))});")
+    return "\n".join(lines)
+
+
+def let_list(statements: int) -> str:
+    """A flat list of simple `let` statements, the shape of large generated data files"""
+    return "\n".join(f"let {name(i)} = {i};" for i in range(statements))
+
+
+def corpora(statements: int) -> dict[str, str]:
+    """Every corpus the benchmark harness runs, sized by top level statements"""
+    return {
+        "mixed": generate_program(statements),
+        "arithmetic_chain": arithmetic_chain(max(statements // 100, 1)),
+        "deep_nesting": deep_nesting(max(statements // 50, 1)),
+        "small_functions": small_functions(max(statements // 2, 1)),
+        "let_list": let_list(statements),
+    }
@@ -0,0 +1,135 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import corpora
+from interpret_deez import lexer, parser, tokenizer
+
+
+def lex_all(source: str) -> int:
+    lex = lexer.Lexer(source)
+    tokens = 0
+    while lex.next_token().type != tokenizer.EOF:
+        tokens += 1
+    return tokens
+
+
+def parse_all(source: str) -> int:
+    return len(parser.Parser(lexer.Lexer(source)).parse_program().statements)
+
+
+stages = {"lexer": lex_all, "parser": parse_all}
+
+
+def measure(stage: str, source: str, repeat: int) -> dict:
+    """Best of `repeat` timings, then one run under tracemalloc for the memory figures"""
+    run = stages[stage]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = run(source)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    run(source)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    tokens = lex_all(source)
+    result = {
+        "tokens": tokens,
+        "seconds": best,
+        "tokens_per_second": tokens / best,
+        # most memory the run held allocated at once, what was traced before it not included
+        "peak_bytes": peak - traced_before,
+        # blocks still allocated once the run returned, a proxy for leaks and caches
+        "retained_blocks": retained,
+    }
+    if stage == "parser":
+        result["statements"] = count
+        result["statements_per_second"] = count / best
+    return result
+
+
+def run_suite(statements: int, repeat: int) -> dict:
+    results = {}
+    for corpus, source in corpora(statements).items():
+        for stage in stages:
+            results[f"{corpus}/{stage}"] = measure(stage, source, repeat)
+    return {
+        "python": platform.python_version(),
+        "statements": statements,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Benchmarks whose throughput dropped, or whose peak memory grew, by more than `threshold`
+
+    A `threshold` of 0.1 is 10%.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        before = baseline["results"][key]["tokens_per_second"]
+        after = result["tokens_per_second"]
+        if after < before * (1 - threshold):
+            regressions.append(
+                f"{key}: {after:,.0f} tokens/s, baseline {before:,.0f} ({after / before - 1:+.1%})"
+            )
+        # baselines saved before peak_bytes covered only the run, or with nothing allocated,
+        # have no peak to compare against
+        before = baseline["results"][key].get("peak_bytes")
+        after = result["peak_bytes"]
+        if before and after > before * (1 + threshold):
+            regressions.append(
+                f"{key}: {after:,} peak bytes, baseline {before:,} ({after / before - 1:+.1%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Lexer and parser benchmark suite")
+    arg_parser.add_argument("--statements", type=int, default=5_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--output", help="write the results to this JSON file")
+    arg_parser.add_argument("--baseline", help="JSON results to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=0.1)
+    args = arg_parser.parse_args()
+
+    current = run_suite(args.statements, args.repeat)
+    for key, result in current["results"].items():
+        statements = result.get("statements_per_second")
+        print(
+            f"{key:<24} {result['tokens_per_second']:>12,.0f} tokens/s "
+            f"{f'{statements:,.0f}' if statements else '-':>10} statements/s "
+            f"peak {result['peak_bytes'] / 1024:>9,.1f} KiB "
+            f"{result['retained_blocks']:>8,} blocks retained"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"regression {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regression beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+import enum
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from interpret_deez import ast, evaluator, lexer, objects, parser
+from interpret_deez.evaluator import or_null
+
+# Index stored in a slot that has no node, e.g. a missing else branch
+NONE = -1
+
+# Every node owns SLOTS consecutive entries of `Arena.slots`
+SLOTS = 3
+
+
+class NodeKind(enum.IntEnum):
+    PROGRAM = 0
+    IDENTIFIER = 1
+    INTEGER = 2
+    BOOLEAN = 3
+    PREFIX = 4
+    INFIX = 5
+    BLOCK = 6
+    IF = 7
+    FUNCTION = 8
+    CALL = 9
+    LET = 10
+    RETURN = 11
+    EXPRESSION_STATEMENT = 12
+    WIDE_INTEGER = 13
+
+
+# Slot layout per kind, "first, count" is a range of `Arena.children`:
+#   PROGRAM, BLOCK         first, count
+#   IDENTIFIER             string
+#   INTEGER, BOOLEAN       value
+#   WIDE_INTEGER           index in `Arena.integers`, for literals not fitting in 64 bits
+#   PREFIX                 operator string, right
+#   INFIX                  left, operator string, right
+#   IF                     condition, consequence, alternative
+#   FUNCTION               first, count (parameter identifiers), body
+#   CALL                   function, first, count (arguments)
+#   LET                    name, value
+#   RETURN                 value
+#   EXPRESSION_STATEMENT   expression
+PROGRAM = NodeKind.PROGRAM.value
+IDENTIFIER = NodeKind.IDENTIFIER.value
+INTEGER = NodeKind.INTEGER.value
+BOOLEAN = NodeKind.BOOLEAN.value
+PREFIX = NodeKind.PREFIX.value
+INFIX = NodeKind.INFIX.value
+BLOCK = NodeKind.BLOCK.value
+IF = NodeKind.IF.value
+FUNCTION = NodeKind.FUNCTION.value
+CALL = NodeKind.CALL.value
+LET = NodeKind.LET.value
+RETURN = NodeKind.RETURN.value
+EXPRESSION_STATEMENT = NodeKind.EXPRESSION_STATEMENT.value
+WIDE_INTEGER = NodeKind.WIDE_INTEGER.value
+
+
+@dataclass
+class Arena:
+    """Parsed program stored as parallel typed arrays, nodes are plain int indices
+
+    Identifier names and operators are interned in `strings`, integer literals too wide for a
+    slot are kept in `integers`. The root node is the last one added, a PROGRAM.
+    """
+
+    kinds: array = field(default_factory=lambda: array("B"))
+    starts: array = field(default_factory=lambda: array("q"))
+    slots: array = field(default_factory=lambda: array("q"))
+    children: array = field(default_factory=lambda: array("I"))
+    strings: list[str] = field(default_factory=list)
+    integers: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def root(self) -> int:
+        return len(self.kinds) - 1
+
+    def kind(self, node: int) -> NodeKind:
+        return NodeKind(self.kinds[node])
+
+    def slot(self, node: int, index: int) -> int:
+        return self.slots[node * SLOTS + index]
+
+    def string(self, node: int, index: int = 0) -> str:
+        return self.strings[self.slots[node * SLOTS + index]]
+
+    def add(self, kind: int, start: int, a: int = NONE, b: int = NONE, c: int = NONE) -> int:
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.slots.extend((a, b, c))
+        return len(self.kinds) - 1
+
+    def add_children(self, nodes: list[int]) -> tuple[int, int]:
+        first = len(self.children)
+        self.children.extend(nodes)
+        return first, len(nodes)
+
+
+def parse_arena(source: str) -> tuple[Arena, list[str]]:
+    pars = parser.Parser(lexer.TableLexer(source))
+    program = pars.parse_program()
+    return from_program(program), pars.get_errors()
+
+
+def from_program(program: ast.Program) -> Arena:
+    """Flattens a parsed program into an arena
+
+    Args:
+        program (ast.Program): program built by `parser.Parser`
+
+    Returns:
+        Arena: the same tree, its root is the last node
+    """
+    builder = ArenaBuilder()
+    statements = [builder.add(statement) for statement in program.statements]
+    start = program.statements[0].token.start if program.statements else 0
+    builder.arena.add(PROGRAM, start, *builder.arena.add_children(statements))
+    return builder.arena
+
+
+@dataclass
+class ArenaBuilder:
+    arena: Arena = field(default_factory=Arena)
+    interned: dict[str, int] = field(default_factory=dict)
+
+    def intern(self, string: str) -> int:
+        index = self.interned.get(string)
+        if index is None:
+            index = self.interned[string] = len(self.arena.strings)
+            self.arena.strings.append(string)
+        return index
+
+    def add(self, node: ast.Node | None) -> int:
+        arena = self.arena
+        match node:
+            case None:
+                return NONE
+            case ast.Identifier():
+                return arena.add(IDENTIFIER, node.token.start, self.intern(node.value))
+            case ast.IntegerLiteral():
+                if not -(2**63) <= node.value < 2**63:  # type: ignore
+                    arena.integers.append(node.value)  # type: ignore
+                    return arena.add(WIDE_INTEGER, node.token.start, len(arena.integers) - 1)
+                return arena.add(INTEGER, node.token.start, node.value)  # type: ignore
+            case ast.Boolean():
+                return arena.add(BOOLEAN, node.token.start, int(bool(node.value)))
+            case ast.PrefixExpression():
+                right = self.add(node.right)
+                return arena.add(PREFIX, node.token.start, self.intern(node.operator), right)
+            case ast.InfixExpression():
+                left = self.add(node.left)
+                right = self.add(node.right)
+                operator = self.intern(node.operator)
+                return arena.add(INFIX, node.token.start, left, operator, right)
+            case ast.BlockStatement():
+                statements = [self.add(statement) for statement in node.statements]
+                return arena.add(BLOCK, node.token.start, *arena.add_children(statements))
+            case ast.IfExpression():
+                condition = self.add(node.condition)
+                consequence = self.add(node.consequence)
+                alternative = self.add(node.alternative)
+                return arena.add(IF, node.token.start, condition, consequence, alternative)
+            case ast.FunctionLiteral():
+                parameters = [self.add(parameter) for parameter in node.parameters or ()]
+                body = self.add(node.body)
+                first, count = arena.add_children(parameters)
+                return arena.add(FUNCTION, node.token.start, first, count, body)
+            case ast.CallExpression():
+                function = self.add(node.function)
+                arguments = [self.add(argument) for argument in node.arguments or ()]
+                return arena.add(CALL, node.token.start, function, *arena.add_children(arguments))
+            case ast.LetStatement():
+                name = self.add(node.name)
+                value = self.add(node.value)
+                return arena.add(LET, node.token.start, name, value)
+            case ast.ReturnStatement():
+                return arena.add(RETURN, node.token.start, self.add(node.return_value))
+            case ast.ExpressionStatement():
+                return arena.add(EXPRESSION_STATEMENT, node.token.start, self.add(node.expression))
+        raise TypeError(f"cannot add {type(node).__name__} to an arena")
+
+
+def child_nodes(arena: Arena, node: int) -> list[int]:
+    """Direct children of a node in source order, missing children are left out"""
+    kind = arena.kinds[node]
+    base = node * SLOTS
+    a, b, c = arena.slots[base], arena.slots[base + 1], arena.slots[base + 2]
+    if kind in (PROGRAM, BLOCK):
+        return arena.children[a : a + b].tolist()
+    if kind == FUNCTION:
+        return [*arena.children[a : a + b], *([c] if c != NONE else [])]
+    if kind == CALL:
+        return [*([a] if a != NONE else []), *arena.children[b : b + c]]
+    if kind == PREFIX:
+        return [b] if b != NONE else []
+    if kind == INFIX:
+        return [child for child in (a, c) if child != NONE]
+    if kind in (IF, LET, RETURN, EXPRESSION_STATEMENT):
+        return [child for child in (a, b, c) if child != NONE]
+    return []
+
+
+def walk(arena: Arena, node: int | None = None) -> Iterator[int]:
+    """Yields the nodes of a subtree in pre-order, without recursion
+
+    Args:
+        arena (Arena): arena holding the subtree
+        node (int | None): subtree root, the whole program by default
+    """
+    stack = [arena.root if node is None else node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(child_nodes(arena, node)))
+
+
+def to_string(arena: Arena, node: int | None = None) -> str:
+    """Renders a subtree like `compact_ast` does, literals in their canonical form"""
+    out: list[str] = []
+    write(arena, arena.root if node is None else node, out)
+    return "".join(out)
+
+
+def write(arena: Arena, node: int, out: list[str]) -> None:
+    if node == NONE:
+        return
+    kind = arena.kinds[node]
+    base = node * SLOTS
+    slots = arena.slots
+    a, b, c = slots[base], slots[base + 1], slots[base + 2]
+    if kind == IDENTIFIER:
+        out.append(arena.strings[a])
+    elif kind == INTEGER:
+        out.append(str(a))
+    elif kind == WIDE_INTEGER:
+        out.append(str(arena.integers[a]))
+    elif kind == BOOLEAN:
+        out.append("true" if a else "false")
+    elif kind == PREFIX:
+        out.append(f"({arena.strings[a]}")
+        write(arena, b, out)
+        out.append(")")
+    elif kind == INFIX:
+        out.append("(")
+        write(arena, a, out)
+        out.append(f" {arena.strings[b]} ")
+        write(arena, c, out)
+        out.append(")")
+    elif kind in (PROGRAM, BLOCK):
+        for child in arena.children[a : a + b]:
+            write(arena, child, out)
+    elif kind == IF:
+        out.append("if")
+        write(arena, a, out)
+        out.append(" ")
+        write(arena, b, out)
+        if c != NONE:
+            out.append("else ")
+            write(arena, c, out)
+    elif kind == FUNCTION:
+        parameters = (arena.strings[slots[child * SLOTS]] for child in arena.children[a : a + b])
+        out.append(f"fn({', '.join(parameters)}) ")
+        write(arena, c, out)
+    elif kind == CALL:
+        write(arena, a, out)
+        out.append("(")
+        for i, child in enumerate(arena.children[b : b + c]):
+            if i:
+                out.append(", ")
+            write(arena, child, out)
+        out.append(")")
+    elif kind == LET:
+        out.append("let ")
+        write(arena, a, out)
+        out.append(" =")
+        if b != NONE:
+            out.append(" ")
+            write(arena, b, out)
+        out.append(";")
+    elif kind == RETURN:
+        out.append("return")
+        if a != NONE:
+            out.append(" ")
+            write(arena, a, out)
+        out.append(";")
+    elif kind == EXPRESSION_STATEMENT:
+        write(arena, a, out)
+
+
+@dataclass(eq=False)
+class ArenaFunction(objects.Object):
+    """Function value of the arena evaluator, `body` is a BLOCK node of `arena`"""
+
+    parameters: tuple[str, ...]
+    body: int
+    arena: Arena
+    env: objects.Environment
+
+    def type(self) -> objects.ObjectType:
+        return objects.FUNCTION_OBJ
+
+    def inspect(self) -> str:
+        return f"fn({', '.join(self.parameters)}) {{\n{to_string(self.arena, self.body)}\n}}"
+
+
+def evaluate(arena: Arena, env: objects.Environment) -> objects.Object | None:
+    """Evaluates the program held by an arena, same semantics as `evaluator.evaluate`"""
+    return evaluate_node(arena, arena.root, env)
+
+
+def evaluate_node(arena: Arena, node: int, env: objects.Environment) -> objects.Object | None:
+    if node == NONE:
+        return None
+    kind = arena.kinds[node]
+    base = node * SLOTS
+    slots = arena.slots
+    a, b, c = slots[base], slots[base + 1], slots[base + 2]
+
+    if kind == INTEGER:
+        return objects.Integer(a)
+    if kind == IDENTIFIER:
+        name = arena.strings[a]
+        value = env.get(name)
+        if value is None:
+            return objects.Error(f"identifier not found: {name}")
+        return value
+    if kind == INFIX:
+        left = evaluate_node(arena, a, env)
+        if type(left) is objects.Error:
+            return left
+        right = evaluate_node(arena, c, env)
+        if type(right) is objects.Error:
+            return right
+        return evaluator.eval_infix_expression(arena.strings[b], or_null(left), or_null(right))
+    if kind == EXPRESSION_STATEMENT:
+        return evaluate_node(arena, a, env)
+    if kind == CALL:
+        function = evaluate_node(arena, a, env)
+        if type(function) is objects.Error:
+            return function
+        args = []
+        for argument in arena.children[b : b + c]:
+            value = evaluate_node(arena, argument, env)
+            if type(value) is objects.Error:
+                return value
+            args.append(or_null(value))
+        return apply_function(or_null(function), args)
+    if kind == BOOLEAN:
+        return objects.TRUE if a else objects.FALSE
+    if kind == PREFIX:
+        right = evaluate_node(arena, b, env)
+        if type(right) is objects.Error:
+            return right
+        return evaluator.eval_prefix_expression(arena.strings[a], or_null(right))
+    if kind == IF:
+        condition = evaluate_node(arena, a, env)
+        if type(condition) is objects.Error:
+            return condition
+        if evaluator.is_truthy(or_null(condition)):
+            return evaluate_node(arena, b, env)
+        if c != NONE:
+            return evaluate_node(arena, c, env)
+        return objects.NULL
+    if kind == BLOCK:
+        result = None
+        for statement in arena.children[a : a + b]:
+            result = evaluate_node(arena, statement, env)
+            # return values are unwrapped by the caller so they can bubble up nested blocks
+            if type(result) is objects.ReturnValue or type(result) is objects.Error:
+                return result
+        return result
+    if kind == LET:
+        value = evaluate_node(arena, b, env)
+        if type(value) is objects.Error:
+            return value
+        env.set(arena.strings[slots[a * SLOTS]], or_null(value))
+        return None
+    if kind == RETURN:
+        value = evaluate_node(arena, a, env)
+        if type(value) is objects.Error:
+            return value
+        return objects.ReturnValue(or_null(value))
+    if kind == FUNCTION:
+        strings = arena.strings
+        parameters = tuple(strings[slots[child * SLOTS]] for child in arena.children[a : a + b])
+        return ArenaFunction(parameters, c, arena, env)
+    if kind == PROGRAM:
+        result = None
+        for statement in arena.children[a : a + b]:
+            result = evaluate_node(arena, statement, env)
+            if type(result) is objects.ReturnValue:
+                return result.value
+            if type(result) is objects.Error:
+                return result
+        return result
+    if kind == WIDE_INTEGER:
+        return objects.Integer(arena.integers[a])
+    return None
+
+
+def apply_function(function: objects.Object, args: list[objects.Object]) -> objects.Object | None:
+    if type(function) is not ArenaFunction:
+        return objects.Error(f"not a function: {function.type()}")
+    if len(args) != len(function.parameters):
+        return objects.Error(
+            f"wrong number of arguments: want={len(function.parameters)}, got={len(args)}"
+        )
+
+    env = objects.new_enclosed_environment(function.env)
+    for parameter, arg in zip(function.parameters, args, strict=True):
+        env.set(parameter, arg)
+    return evaluator.unwrap_return_value(evaluate_node(function.arena, function.body, env))
@@ -1,5 +1,7 @@
+import io
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import IO
 
 from interpret_deez.tokenizer import Token
 
@@ -16,13 +18,23 @@ class Node(ABC):
         """
         return self.token.literal
 
-    @abstractmethod
     def to_string(self) -> str:
         """Debugging AST nodes
 
         Returns:
             str: AST node as string
         """
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
+
+    @abstractmethod
+    def write(self, out: IO[str]) -> None:
+        """Writes `to_string` to a text stream, a whole tree is rendered in a single traversal
+
+        Args:
+            out (IO[str]): `io.StringIO`, open file or any other text stream
+        """
         ...
 
 
@@ -45,8 +57,11 @@ class PrefixExpression(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        return f"({self.operator}{self.right.to_string() if self.right else ''})"
+    def write(self, out: IO[str]) -> None:
+        out.write(f"({self.operator}")
+        if self.right:
+            self.right.write(out)
+        out.write(")")
 
 
 @dataclass
@@ -57,11 +72,14 @@ class InfixExpression(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        out = f"{self.left.to_string() if self.left else ''}"
-        out = f"{out} {self.operator}"
-        out = f"({out} {self.right.to_string() if self.right else ''})"
-        return out
+    def write(self, out: IO[str]) -> None:
+        out.write("(")
+        if self.left:
+            self.left.write(out)
+        out.write(f" {self.operator} ")
+        if self.right:
+            self.right.write(out)
+        out.write(")")
 
 
 @dataclass
@@ -70,8 +88,9 @@ class BlockStatement(Statement):
 
     def statement_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        return "".join(statement.to_string() for statement in self.statements)
+    def write(self, out: IO[str]) -> None:
+        for statement in self.statements:
+            statement.write(out)
 
 
 @dataclass
@@ -82,15 +101,17 @@ class IfExpression(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        out = "if"
-        out = f"{out}{self.condition.to_string() if self.condition else ''} "
-        out = f"{out}{self.consequence.to_string() if self.consequence else ''}"
+    def write(self, out: IO[str]) -> None:
+        out.write("if")
+        if self.condition:
+            self.condition.write(out)
+        out.write(" ")
+        if self.consequence:
+            self.consequence.write(out)
 
         if self.alternative is not None:
-            out = f"{out}else "
-            out = f"{out}{self.alternative.to_string() if self.alternative else ''}"
-        return out
+            out.write("else ")
+            self.alternative.write(out)
 
 
 @dataclass
@@ -100,13 +121,17 @@ class CallExpression(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        args = []
-        for arg in self.arguments:  # type: ignore
-            args.append(arg.to_string())
-
-        out = f"{self.function.to_string()}({', '.join(args)})"  # type: ignore
-        return out
+    def write(self, out: IO[str]) -> None:
+        if self.function:
+            self.function.write(out)
+        out.write("(")
+        # arguments are None when the argument list did not parse
+        for i, argument in enumerate(self.arguments or ()):
+            if i:
+                out.write(", ")
+            if argument:
+                argument.write(out)
+        out.write(")")
 
 
 @dataclass
@@ -115,8 +140,8 @@ class Identifier(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        return self.value
+    def write(self, out: IO[str]) -> None:
+        out.write(self.value)
 
 
 @dataclass
@@ -125,8 +150,8 @@ class IntegerLiteral(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        return self.token.literal
+    def write(self, out: IO[str]) -> None:
+        out.write(self.token.literal)
 
 
 @dataclass
@@ -136,14 +161,12 @@ class FunctionLiteral(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        params = "".join(parameter.to_string() for parameter in self.parameters)  # type: ignore
-
-        out = (
-            f"{self.token_literal()}({', '.join(params)}) "
-            f"{self.body.to_string() if self.body else ''}"
-        )
-        return out
+    def write(self, out: IO[str]) -> None:
+        # parameters are None when the parameter list did not parse
+        parameters = ", ".join(parameter.value for parameter in self.parameters or ())
+        out.write(f"{self.token_literal()}({parameters}) ")
+        if self.body:
+            self.body.write(out)
 
 
 @dataclass
@@ -152,8 +175,8 @@ class Boolean(Expression):
 
     def expression_node(self) -> None: ...
 
-    def to_string(self) -> str:
-        return self.token.literal
+    def write(self, out: IO[str]) -> None:
+        out.write(self.token.literal)
 
 
 @dataclass
@@ -163,15 +186,14 @@ class LetStatement(Statement):
 
     def statement_node(self) -> str: ...
 
-    def to_string(self) -> str:
-        out = f"{self.token_literal()} {self.name.to_string() if self.name else ''} ="
+    def write(self, out: IO[str]) -> None:
+        out.write(f"{self.token_literal()} {self.name.value if self.name else ''} =")
 
         if self.value is not None:
-            out = f"{out} {self.value.to_string()}"
+            out.write(" ")
+            self.value.write(out)
 
-        out = f"{out};"
-
-        return out
+        out.write(";")
 
 
 @dataclass
@@ -180,15 +202,14 @@ class ReturnStatement(Statement):
 
     def statement_node(self) -> str: ...
 
-    def to_string(self) -> str:
-        out = f"{self.token_literal()}"
+    def write(self, out: IO[str]) -> None:
+        out.write(self.token_literal())
 
         if self.return_value is not None:
-            out = f"{out} {self.return_value.to_string()}"
-
-        out = f"{out};"
+            out.write(" ")
+            self.return_value.write(out)
 
-        return out
+        out.write(";")
 
 
 @dataclass
@@ -197,11 +218,9 @@ class ExpressionStatement(Statement):
 
     def statement_node(self) -> str: ...
 
-    def to_string(self) -> str:
+    def write(self, out: IO[str]) -> None:
         if self.expression is not None:
-            return self.expression.to_string()
-
-        return ""
+            self.expression.write(out)
 
 
 @dataclass
@@ -214,4 +233,11 @@ class Program:
         return ""
 
     def to_string(self) -> str:
-        return "".join(statement.to_string() for statement in self.statements)
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
+
+    def write(self, out: IO[str]) -> None:
+        """Writes `to_string` to a text stream, for example straight to a file"""
+        for statement in self.statements:
+            statement.write(out)
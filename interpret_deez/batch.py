@@ -0,0 +1,209 @@
+import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from interpret_deez import arena, ast, lexer, parser, tokenizer
+
+# Monkey has no strings or comments, these characters are always tokens of their own
+nesting_rexp = re.compile(r"[;{}()]")
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """Outcome of parsing one file, cheap to pickle back from a worker process
+
+    Diagnostic spans are UTF-8 byte offsets into the file.
+    """
+
+    path: str
+    program: arena.Arena
+    errors: tuple[str, ...]
+    diagnostics: tuple[parser.Diagnostic, ...]
+
+
+def parse_file(path: str | os.PathLike) -> ParseResult:
+    """Parses one UTF-8 file into an arena
+
+    A file that cannot be read or parsed gets an empty program and the failure as its only
+    error, so one file does not sink a whole batch.
+
+    Args:
+        path (str | os.PathLike): file to parse
+
+    Returns:
+        ParseResult: flattened program, parser errors and their diagnostics
+    """
+    try:
+        pars = parser.Parser(lexer.tokenize_file(path))
+        program = arena.from_program(pars.parse_program())
+    except Exception as error:
+        return ParseResult(
+            os.fspath(path),
+            arena.from_program(ast.Program()),
+            (f"cannot parse {os.fspath(path)}: {error}",),
+            (),
+        )
+    return ParseResult(
+        os.fspath(path), program, tuple(pars.get_errors()), tuple(pars.get_diagnostics())
+    )
+
+
+def parse_files(
+    paths: Iterable[str | os.PathLike], workers: int | None = None, chunksize: int = 16
+) -> list[ParseResult]:
+    """Parses independent files across a process pool, results come back in input order
+
+    Args:
+        paths (Iterable[str | os.PathLike]): files to parse
+        workers (int | None): worker processes, `os.process_cpu_count()` by default. With 1 the
+            files are parsed in this process
+        chunksize (int): files handed to a worker at a time, larger chunks mean less IPC
+
+    Returns:
+        list[ParseResult]: one result per path
+    """
+    paths = list(paths)
+    workers = workers or os.process_cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        return [parse_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(parse_file, paths, chunksize=chunksize))
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    """Statements and errors of one chunk of a source split by `split_source`"""
+
+    statements: list[ast.Statement]
+    errors: list[str]
+    # spans are offsets into the whole source, `OffsetLexer` moved the tokens there
+    diagnostics: list[parser.Diagnostic]
+    # False when the last statement did not end inside the chunk, its end is then not a
+    # statement boundary and the chunk has to be parsed again together with what follows
+    clean: bool
+
+
+@dataclass
+class OffsetLexer:
+    """Moves the token offsets of a lexer over a slice of the source back into the source"""
+
+    lex: tokenizer.TokenSource
+    base: int
+
+    def next_token(self) -> tokenizer.Token:
+        token = self.lex.next_token()
+        token.start += self.base
+        return token
+
+
+def split_source(source: str, chunk_size: int) -> list[tuple[int, int]]:
+    """Cuts a source into `[start, end)` chunks of about `chunk_size` characters
+
+    Chunks end right after a `;` outside of any braces or parentheses, so each one usually
+    holds whole top level statements.
+    """
+    chunks = []
+    start = 0
+    target = chunk_size
+    depth = 0
+    for match in nesting_rexp.finditer(source):
+        char = match[0]
+        if char == "{" or char == "(":
+            depth += 1
+        elif char == "}" or char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and match.start() >= target:
+            end = match.end()
+            chunks.append((start, end))
+            start = end
+            target = end + chunk_size
+    if start < len(source) or not chunks:
+        chunks.append((start, len(source)))
+    return chunks
+
+
+def parse_chunk(text: str, base: int, end: int) -> ChunkResult:
+    """Parses the statements starting in `text[:end]`
+
+    `text` goes on with the first token after the chunk, the parser peeks at it to decide
+    whether the last statement is over.
+    """
+    pars = parser.Parser(OffsetLexer(lexer.TableLexer(text), base))
+    statements: list[ast.Statement] = []
+    end += base
+    while not pars.is_current(tokenizer.EOF) and pars.current.start < end:
+        statement = pars.parse_statement()
+        if statement is not None:
+            statements.append(statement)
+        if pars.current.start >= end:
+            return ChunkResult(statements, pars.get_errors(), pars.get_diagnostics(), clean=False)
+        pars.next_token()
+    return ChunkResult(statements, pars.get_errors(), pars.get_diagnostics(), clean=True)
+
+
+def parse_split(
+    source: str, workers: int | None = None, chunk_size: int = 1 << 20
+) -> tuple[ast.Program, list[str], list[parser.Diagnostic]]:
+    """Parses one large source by parsing chunks of top level statements in parallel
+
+    Gives the same program, token offsets included, and the same errors and diagnostics as
+    parsing the whole source with `parser.Parser`.
+
+    Args:
+        source (str): program source
+        workers (int | None): worker processes, `os.process_cpu_count()` by default
+        chunk_size (int): approximate characters per chunk
+
+    Returns:
+        tuple[ast.Program, list[str], list[parser.Diagnostic]]: parsed program, parser errors
+            and their diagnostics
+    """
+    # the lexers stop at the first NUL
+    if (nul := source.find("\0")) != -1:
+        source = source[:nul]
+    chunks = split_source(source, chunk_size)
+    texts, bases, ends = [], [], []
+    for start, end in chunks:
+        lookahead = lexer.token_rexp.match(source, end)
+        texts.append(source[start : lookahead.end() if lookahead else end])
+        bases.append(start)
+        ends.append(end - start)
+
+    workers = workers or os.process_cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        results = list(map(parse_chunk, texts, bases, ends))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(parse_chunk, texts, bases, ends))
+
+    program = ast.Program()
+    errors: list[str] = []
+    diagnostics: list[parser.Diagnostic] = []
+    chunk_at = {start: index for index, (start, _) in enumerate(chunks)}
+    index = 0
+    while index < len(chunks):
+        result = results[index]
+        if result.clean:
+            program.statements.extend(result.statements)
+            errors.extend(result.errors)
+            diagnostics.extend(result.diagnostics)
+            index += 1
+            continue
+        # reparse from this chunk on until the parser is at the start of a later chunk
+        pars = parser.Parser(lexer.TableLexer(source, chunks[index][0]))
+        next_index = len(chunks)
+        while not pars.is_current(tokenizer.EOF):
+            resume = chunk_at.get(pars.current.start, -1)
+            if resume > index:
+                next_index = resume
+                break
+            statement = pars.parse_statement()
+            if statement is not None:
+                program.statements.append(statement)
+            pars.next_token()
+        errors.extend(pars.get_errors())
+        diagnostics.extend(pars.get_diagnostics())
+        index = next_index
+    return program, errors, diagnostics
@@ -0,0 +1,112 @@
+import enum
+from dataclasses import dataclass
+
+
+class Opcode(enum.IntEnum):
+    CONSTANT = 0
+    POP = 1
+    ADD = 2
+    SUB = 3
+    MUL = 4
+    DIV = 5
+    TRUE = 6
+    FALSE = 7
+    EQUAL = 8
+    NOT_EQUAL = 9
+    GREATER_THAN = 10
+    MINUS = 11
+    BANG = 12
+    JUMP_NOT_TRUTHY = 13
+    JUMP = 14
+    NULL = 15
+    GET_GLOBAL = 16
+    SET_GLOBAL = 17
+    CALL = 18
+    RETURN_VALUE = 19
+    RETURN = 20
+    GET_LOCAL = 21
+    SET_LOCAL = 22
+    CLOSURE = 23
+    GET_FREE = 24
+    CURRENT_CLOSURE = 25
+    LESS_THAN = 26
+
+
+@dataclass(frozen=True)
+class Definition:
+    name: str
+    operand_widths: tuple[int, ...] = ()
+
+
+# Operands are big endian, widths in bytes
+definitions: dict[Opcode, Definition] = {
+    Opcode.CONSTANT: Definition("OpConstant", (2,)),
+    Opcode.POP: Definition("OpPop"),
+    Opcode.ADD: Definition("OpAdd"),
+    Opcode.SUB: Definition("OpSub"),
+    Opcode.MUL: Definition("OpMul"),
+    Opcode.DIV: Definition("OpDiv"),
+    Opcode.TRUE: Definition("OpTrue"),
+    Opcode.FALSE: Definition("OpFalse"),
+    Opcode.EQUAL: Definition("OpEqual"),
+    Opcode.NOT_EQUAL: Definition("OpNotEqual"),
+    Opcode.GREATER_THAN: Definition("OpGreaterThan"),
+    Opcode.MINUS: Definition("OpMinus"),
+    Opcode.BANG: Definition("OpBang"),
+    Opcode.JUMP_NOT_TRUTHY: Definition("OpJumpNotTruthy", (2,)),
+    Opcode.JUMP: Definition("OpJump", (2,)),
+    Opcode.NULL: Definition("OpNull"),
+    Opcode.GET_GLOBAL: Definition("OpGetGlobal", (2,)),
+    Opcode.SET_GLOBAL: Definition("OpSetGlobal", (2,)),
+    Opcode.CALL: Definition("OpCall", (1,)),
+    Opcode.RETURN_VALUE: Definition("OpReturnValue"),
+    Opcode.RETURN: Definition("OpReturn"),
+    Opcode.GET_LOCAL: Definition("OpGetLocal", (1,)),
+    Opcode.SET_LOCAL: Definition("OpSetLocal", (1,)),
+    Opcode.CLOSURE: Definition("OpClosure", (2, 1)),
+    Opcode.GET_FREE: Definition("OpGetFree", (1,)),
+    Opcode.CURRENT_CLOSURE: Definition("OpCurrentClosure"),
+    Opcode.LESS_THAN: Definition("OpLessThan"),
+}
+
+
+def make(opcode: Opcode, *operands: int) -> bytes:
+    """Encodes one instruction
+
+    Args:
+        opcode (Opcode): instruction opcode
+        *operands (int): operands, as many as the opcode definition has widths
+
+    Returns:
+        bytes: encoded instruction
+    """
+    instruction = bytearray([opcode])
+    for operand, width in zip(operands, definitions[opcode].operand_widths, strict=True):
+        instruction += operand.to_bytes(width, "big")
+    return bytes(instruction)
+
+
+def read_operands(
+    definition: Definition, instructions: bytes, offset: int
+) -> tuple[list[int], int]:
+    """Decodes the operands of the instruction whose operands start at `offset`
+
+    Returns:
+        tuple[list[int], int]: operands and the number of bytes read
+    """
+    operands = []
+    for width in definition.operand_widths:
+        operands.append(int.from_bytes(instructions[offset : offset + width], "big"))
+        offset += width
+    return operands, sum(definition.operand_widths)
+
+
+def instructions_to_string(instructions: bytes) -> str:
+    out = []
+    i = 0
+    while i < len(instructions):
+        definition = definitions[Opcode(instructions[i])]
+        operands, read = read_operands(definition, instructions, i + 1)
+        out.append(f"{i:04d} {' '.join([definition.name, *map(str, operands)])}\n")
+        i += 1 + read
+    return "".join(out)
@@ -0,0 +1,285 @@
+import operator
+from collections.abc import Callable
+
+from interpret_deez import ast, evaluator, objects
+
+# Compiled form of a node: evaluates it in the given environment
+type Code = Callable[[objects.Environment], objects.Object | None]
+
+integer_operators: dict[str, Callable[[int, int], int]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+comparison_operators: dict[str, Callable[[int, int], bool]] = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def compile_program(program: ast.Program) -> Code:
+    """Compiles a program into nested closures
+
+    Node types are only dispatched here, once. Running the returned closure gives the same result
+    as `evaluator.evaluate(program, env)`.
+
+    Args:
+        program (ast.Program): parsed program
+
+    Returns:
+        Code: callable evaluating the program in an environment
+    """
+    codes = [compile_node(statement) for statement in program.statements]
+
+    def run_program(env: objects.Environment) -> objects.Object | None:
+        result = None
+        for code in codes:
+            result = code(env)
+            if type(result) is objects.ReturnValue:
+                return result.value
+            if type(result) is objects.Error:
+                return result
+        return result
+
+    return run_program
+
+
+def compile_node(node: ast.Node | None) -> Code:
+    compiler = node_compilers.get(type(node))
+    if compiler is None:
+        return compile_nothing(node)
+    return compiler(node)
+
+
+def compile_nothing(_: ast.Node | None) -> Code:
+    def run_nothing(env: objects.Environment) -> None:
+        return None
+
+    return run_nothing
+
+
+def compile_expression_statement(node: ast.ExpressionStatement) -> Code:
+    return compile_node(node.expression)
+
+
+def compile_block_statement(node: ast.BlockStatement) -> Code:
+    codes = [compile_node(statement) for statement in node.statements]
+
+    def run_block(env: objects.Environment) -> objects.Object | None:
+        result = None
+        for code in codes:
+            result = code(env)
+            if type(result) is objects.ReturnValue or type(result) is objects.Error:
+                return result
+        return result
+
+    return run_block
+
+
+def compile_return_statement(node: ast.ReturnStatement) -> Code:
+    value_code = compile_node(node.return_value)
+    or_null = evaluator.or_null
+
+    def run_return(env: objects.Environment) -> objects.Object | None:
+        value = value_code(env)
+        if type(value) is objects.Error:
+            return value
+        return objects.ReturnValue(or_null(value))
+
+    return run_return
+
+
+def compile_let_statement(node: ast.LetStatement) -> Code:
+    name = node.name.value  # type: ignore
+    value_code = compile_node(node.value)
+    or_null = evaluator.or_null
+
+    def run_let(env: objects.Environment) -> objects.Object | None:
+        value = value_code(env)
+        if type(value) is objects.Error:
+            return value
+        env.store[name] = or_null(value)
+        return None
+
+    return run_let
+
+
+def compile_integer_literal(node: ast.IntegerLiteral) -> Code:
+    value = objects.Integer(node.value)  # type: ignore
+
+    def run_integer(env: objects.Environment) -> objects.Object:
+        return value
+
+    return run_integer
+
+
+def compile_boolean(node: ast.Boolean) -> Code:
+    value = evaluator.native_bool_to_boolean(bool(node.value))
+
+    def run_boolean(env: objects.Environment) -> objects.Object:
+        return value
+
+    return run_boolean
+
+
+def compile_identifier(node: ast.Identifier) -> Code:
+    name = node.value
+    error = objects.Error(f"identifier not found: {name}")
+
+    def run_identifier(env: objects.Environment) -> objects.Object:
+        scope: objects.Environment | None = env
+        while scope is not None:
+            value = scope.store.get(name)
+            if value is not None:
+                return value
+            scope = scope.outer
+        return error
+
+    return run_identifier
+
+
+def compile_prefix_expression(node: ast.PrefixExpression) -> Code:
+    prefix_operator = node.operator
+    right_code = compile_node(node.right)
+    or_null = evaluator.or_null
+
+    def run_prefix(env: objects.Environment) -> objects.Object | None:
+        right = right_code(env)
+        if type(right) is objects.Error:
+            return right
+        return evaluator.eval_prefix_expression(prefix_operator, or_null(right))
+
+    return run_prefix
+
+
+def compile_infix_expression(node: ast.InfixExpression) -> Code:
+    infix_operator = node.operator
+    left_code = compile_node(node.left)
+    right_code = compile_node(node.right)
+    eval_infix_expression = evaluator.eval_infix_expression
+    or_null = evaluator.or_null
+    Integer = objects.Integer
+    Error = objects.Error
+
+    if (integer_operator := integer_operators.get(infix_operator)) is not None:
+
+        def run_integer_infix(env: objects.Environment) -> objects.Object | None:
+            left = left_code(env)
+            if type(left) is Error:
+                return left
+            right = right_code(env)
+            if type(right) is Error:
+                return right
+            if type(left) is Integer and type(right) is Integer:
+                return Integer(integer_operator(left.value, right.value))
+            return eval_infix_expression(infix_operator, or_null(left), or_null(right))
+
+        return run_integer_infix
+
+    if (comparison_operator := comparison_operators.get(infix_operator)) is not None:
+        true, false = objects.TRUE, objects.FALSE
+
+        def run_comparison(env: objects.Environment) -> objects.Object | None:
+            left = left_code(env)
+            if type(left) is Error:
+                return left
+            right = right_code(env)
+            if type(right) is Error:
+                return right
+            if type(left) is Integer and type(right) is Integer:
+                return true if comparison_operator(left.value, right.value) else false
+            return eval_infix_expression(infix_operator, or_null(left), or_null(right))
+
+        return run_comparison
+
+    def run_infix(env: objects.Environment) -> objects.Object | None:
+        left = left_code(env)
+        if type(left) is Error:
+            return left
+        right = right_code(env)
+        if type(right) is Error:
+            return right
+        return eval_infix_expression(infix_operator, or_null(left), or_null(right))
+
+    return run_infix
+
+
+def compile_if_expression(node: ast.IfExpression) -> Code:
+    condition_code = compile_node(node.condition)
+    consequence_code = compile_node(node.consequence)
+    alternative_code = compile_node(node.alternative) if node.alternative is not None else None
+    null, false = objects.NULL, objects.FALSE
+
+    def run_if(env: objects.Environment) -> objects.Object | None:
+        condition = condition_code(env)
+        if type(condition) is objects.Error:
+            return condition
+        if condition is not null and condition is not false and condition is not None:
+            return consequence_code(env)
+        if alternative_code is not None:
+            return alternative_code(env)
+        return null
+
+    return run_if
+
+
+def compile_function_literal(node: ast.FunctionLiteral) -> Code:
+    parameters = node.parameters
+    body = node.body
+    body_code = compile_node(body)
+
+    def run_function_literal(env: objects.Environment) -> objects.Object:
+        return objects.Function(parameters, body, env, body_code)  # type: ignore
+
+    return run_function_literal
+
+
+def compile_call_expression(node: ast.CallExpression) -> Code:
+    function_code = compile_node(node.function)
+    argument_codes = [compile_node(argument) for argument in node.arguments]  # type: ignore
+    Error = objects.Error
+    or_null = evaluator.or_null
+
+    def run_call(env: objects.Environment) -> objects.Object | None:
+        function = function_code(env)
+        if type(function) is Error:
+            return function
+
+        args = []
+        for argument_code in argument_codes:
+            arg = argument_code(env)
+            if type(arg) is Error:
+                return arg
+            args.append(or_null(arg))
+
+        if type(function) is not objects.Function or function.code is None:
+            return evaluator.apply_function(or_null(function), args)
+
+        function_env = evaluator.extend_function_environment(function, args)
+        if type(function_env) is Error:
+            return function_env
+        result = function.code(function_env)  # type: ignore
+        if type(result) is objects.ReturnValue:
+            return result.value
+        return result
+
+    return run_call
+
+
+node_compilers: dict[type, Callable[..., Code]] = {
+    ast.ExpressionStatement: compile_expression_statement,
+    ast.BlockStatement: compile_block_statement,
+    ast.ReturnStatement: compile_return_statement,
+    ast.LetStatement: compile_let_statement,
+    ast.IntegerLiteral: compile_integer_literal,
+    ast.Boolean: compile_boolean,
+    ast.Identifier: compile_identifier,
+    ast.PrefixExpression: compile_prefix_expression,
+    ast.InfixExpression: compile_infix_expression,
+    ast.IfExpression: compile_if_expression,
+    ast.FunctionLiteral: compile_function_literal,
+    ast.CallExpression: compile_call_expression,
+}
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from interpret_deez import ast, lexer, parser
+
+
+# Same node kinds as `ast`, but frozen and slotted. Nodes keep the source offset of their token in
+# `start` instead of the `Token` itself and child lists are tuples. `to_string` renders literals in
+# their canonical form (`true`, `fn`, `7` for `007`).
+@dataclass(slots=True, frozen=True)
+class Node(ABC):
+    start: int
+
+    @abstractmethod
+    def to_string(self) -> str:
+        """Debugging AST nodes
+
+        Returns:
+            str: AST node as string
+        """
+        ...
+
+
+@dataclass(slots=True, frozen=True)
+class Identifier(Node):
+    value: str
+
+    def to_string(self) -> str:
+        return self.value
+
+
+@dataclass(slots=True, frozen=True)
+class IntegerLiteral(Node):
+    value: int
+
+    def to_string(self) -> str:
+        return str(self.value)
+
+
+@dataclass(slots=True, frozen=True)
+class Boolean(Node):
+    value: bool
+
+    def to_string(self) -> str:
+        return "true" if self.value else "false"
+
+
+@dataclass(slots=True, frozen=True)
+class PrefixExpression(Node):
+    operator: str
+    right: Node | None
+
+    def to_string(self) -> str:
+        return f"({self.operator}{self.right.to_string() if self.right else ''})"
+
+
+@dataclass(slots=True, frozen=True)
+class InfixExpression(Node):
+    left: Node | None
+    operator: str
+    right: Node | None
+
+    def to_string(self) -> str:
+        left = self.left.to_string() if self.left else ""
+        right = self.right.to_string() if self.right else ""
+        return f"({left} {self.operator} {right})"
+
+
+@dataclass(slots=True, frozen=True)
+class BlockStatement(Node):
+    statements: tuple[Node, ...]
+
+    def to_string(self) -> str:
+        return "".join(statement.to_string() for statement in self.statements)
+
+
+@dataclass(slots=True, frozen=True)
+class IfExpression(Node):
+    condition: Node | None
+    consequence: BlockStatement | None
+    alternative: BlockStatement | None
+
+    def to_string(self) -> str:
+        out = f"if{self.condition.to_string() if self.condition else ''} "
+        out = f"{out}{self.consequence.to_string() if self.consequence else ''}"
+        if self.alternative is not None:
+            out = f"{out}else {self.alternative.to_string()}"
+        return out
+
+
+@dataclass(slots=True, frozen=True)
+class FunctionLiteral(Node):
+    parameters: tuple[Identifier, ...]
+    body: BlockStatement | None
+
+    def to_string(self) -> str:
+        params = ", ".join(parameter.value for parameter in self.parameters)
+        return f"fn({params}) {self.body.to_string() if self.body else ''}"
+
+
+@dataclass(slots=True, frozen=True)
+class CallExpression(Node):
+    function: Node | None
+    arguments: tuple[Node, ...]
+
+    def to_string(self) -> str:
+        args = ", ".join(argument.to_string() for argument in self.arguments)
+        return f"{self.function.to_string() if self.function else ''}({args})"
+
+
+@dataclass(slots=True, frozen=True)
+class LetStatement(Node):
+    name: Identifier | None
+    value: Node | None
+
+    def to_string(self) -> str:
+        out = f"let {self.name.to_string() if self.name else ''} ="
+        if self.value is not None:
+            out = f"{out} {self.value.to_string()}"
+        return f"{out};"
+
+
+@dataclass(slots=True, frozen=True)
+class ReturnStatement(Node):
+    return_value: Node | None
+
+    def to_string(self) -> str:
+        if self.return_value is not None:
+            return f"return {self.return_value.to_string()};"
+        return "return;"
+
+
+@dataclass(slots=True, frozen=True)
+class ExpressionStatement(Node):
+    expression: Node | None
+
+    def to_string(self) -> str:
+        if self.expression is not None:
+            return self.expression.to_string()
+        return ""
+
+
+@dataclass(slots=True, frozen=True)
+class Program:
+    statements: tuple[Node, ...]
+
+    def to_string(self) -> str:
+        return "".join(statement.to_string() for statement in self.statements)
+
+
+def compact(program: ast.Program) -> Program:
+    """Converts a parsed program into compact nodes
+
+    Args:
+        program (ast.Program): program built by `parser.Parser`
+
+    Returns:
+        Program: the same tree with compact nodes
+    """
+    return Program(tuple(convert(statement) for statement in program.statements))  # type: ignore
+
+
+def parse_compact(source: str) -> tuple[Program, list[str]]:
+    pars = parser.Parser(lexer.TableLexer(source))
+    program = pars.parse_program()
+    return compact(program), pars.get_errors()
+
+
+def convert(node: ast.Node | None) -> Node | None:
+    match node:
+        case None:
+            return None
+        case ast.Identifier():
+            return Identifier(node.token.start, node.value)
+        case ast.IntegerLiteral():
+            return IntegerLiteral(node.token.start, node.value)  # type: ignore
+        case ast.Boolean():
+            return Boolean(node.token.start, bool(node.value))
+        case ast.PrefixExpression():
+            return PrefixExpression(node.token.start, node.operator, convert(node.right))
+        case ast.InfixExpression():
+            return InfixExpression(
+                node.token.start, convert(node.left), node.operator, convert(node.right)
+            )
+        case ast.BlockStatement():
+            return convert_block(node)
+        case ast.IfExpression():
+            return IfExpression(
+                node.token.start,
+                convert(node.condition),
+                convert_block(node.consequence),
+                convert_block(node.alternative),
+            )
+        case ast.FunctionLiteral():
+            parameters = tuple(
+                Identifier(parameter.token.start, parameter.value)
+                for parameter in node.parameters or ()
+            )
+            return FunctionLiteral(node.token.start, parameters, convert_block(node.body))
+        case ast.CallExpression():
+            arguments = tuple(convert(argument) for argument in node.arguments or ())
+            return CallExpression(node.token.start, convert(node.function), arguments)  # type: ignore
+        case ast.LetStatement():
+            return LetStatement(node.token.start, convert(node.name), convert(node.value))  # type: ignore
+        case ast.ReturnStatement():
+            return ReturnStatement(node.token.start, convert(node.return_value))
+        case ast.ExpressionStatement():
+            return ExpressionStatement(node.token.start, convert(node.expression))
+    raise TypeError(f"cannot convert {type(node).__name__} to a compact node")
+
+
+def convert_block(block: ast.BlockStatement | None) -> BlockStatement | None:
+    if block is None:
+        return None
+    statements = tuple(convert(statement) for statement in block.statements)
+    return BlockStatement(block.token.start, statements)  # type: ignore
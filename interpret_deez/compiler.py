@@ -0,0 +1,249 @@
+from dataclasses import dataclass, field
+
+from interpret_deez import ast, objects
+from interpret_deez import symbol_table as symbols
+from interpret_deez.bytecode import Opcode, definitions, make
+
+infix_opcodes: dict[str, Opcode] = {
+    "+": Opcode.ADD,
+    "-": Opcode.SUB,
+    "*": Opcode.MUL,
+    "/": Opcode.DIV,
+    "<": Opcode.LESS_THAN,
+    ">": Opcode.GREATER_THAN,
+    "==": Opcode.EQUAL,
+    "!=": Opcode.NOT_EQUAL,
+}
+
+prefix_opcodes: dict[str, Opcode] = {
+    "!": Opcode.BANG,
+    "-": Opcode.MINUS,
+}
+
+load_opcodes: dict[symbols.SymbolScope, Opcode] = {
+    symbols.GLOBAL_SCOPE: Opcode.GET_GLOBAL,
+    symbols.LOCAL_SCOPE: Opcode.GET_LOCAL,
+    symbols.FREE_SCOPE: Opcode.GET_FREE,
+}
+
+# Placeholder operand for jumps whose target is not known yet
+PLACEHOLDER = 0xFFFF
+# Constants are addressed by 2 byte operands
+MAX_CONSTANTS = 1 << 16
+
+
+class CompileError(Exception):
+    pass
+
+
+@dataclass
+class EmittedInstruction:
+    opcode: Opcode | None = None
+    position: int = 0
+
+
+@dataclass
+class CompilationScope:
+    instructions: bytearray = field(default_factory=bytearray)
+    last_instruction: EmittedInstruction = field(default_factory=EmittedInstruction)
+    previous_instruction: EmittedInstruction = field(default_factory=EmittedInstruction)
+
+
+@dataclass
+class Bytecode:
+    instructions: bytes
+    constants: list[objects.Object]
+
+
+@dataclass
+class Compiler:
+    """Compiles an AST into bytecode for `vm.VM`
+
+    Pass the `symbol_table` and `constants` of a previous compiler to keep globals across
+    compilations, like a REPL does.
+    """
+
+    symbol_table: symbols.SymbolTable = field(default_factory=symbols.SymbolTable)
+    constants: list[objects.Object] = field(default_factory=list)
+    # index of each integer value in `constants`, a literal repeated in the source is stored once
+    integer_constants: dict[int, int] = field(default_factory=dict)
+    scopes: list[CompilationScope] = field(default_factory=lambda: [CompilationScope()])
+
+    def compile(self, node: ast.Node | ast.Program | None) -> None:
+        match node:
+            case ast.Program() | ast.BlockStatement():
+                for statement in node.statements:
+                    self.compile(statement)
+            case ast.ExpressionStatement():
+                self.compile(node.expression)
+                self.emit(Opcode.POP)
+            case ast.LetStatement():
+                name = node.name.value  # type: ignore
+                if isinstance(node.value, ast.FunctionLiteral):
+                    # defined first so that a function can call itself through its binding
+                    symbol = self.symbol_table.define(name)
+                    self.compile_function_literal(node.value, name)
+                else:
+                    # defined after its value, `let x = x + 1` reads the previous `x`
+                    self.compile(node.value)
+                    symbol = self.symbol_table.define(name)
+                if symbol.scope == symbols.GLOBAL_SCOPE:
+                    self.emit(Opcode.SET_GLOBAL, symbol.index)
+                else:
+                    self.emit(Opcode.SET_LOCAL, symbol.index)
+            case ast.ReturnStatement():
+                if node.return_value is None:
+                    # a bare `return;` returns NULL, like a function without value does
+                    self.emit(Opcode.RETURN)
+                else:
+                    self.compile(node.return_value)
+                    self.emit(Opcode.RETURN_VALUE)
+            case ast.Identifier():
+                symbol = self.symbol_table.resolve(node.value)
+                if symbol is None:
+                    raise CompileError(f"undefined variable {node.value}")
+                self.load_symbol(symbol)
+            case ast.IntegerLiteral():
+                self.emit(Opcode.CONSTANT, self.add_integer(node.value))  # type: ignore
+            case ast.Boolean():
+                self.emit(Opcode.TRUE if node.value else Opcode.FALSE)
+            case ast.PrefixExpression():
+                self.compile(node.right)
+                opcode = prefix_opcodes.get(node.operator)
+                if opcode is None:
+                    raise CompileError(f"unknown operator {node.operator}")
+                self.emit(opcode)
+            case ast.InfixExpression():
+                self.compile(node.left)
+                self.compile(node.right)
+                opcode = infix_opcodes.get(node.operator)
+                if opcode is None:
+                    raise CompileError(f"unknown operator {node.operator}")
+                self.emit(opcode)
+            case ast.IfExpression():
+                self.compile_if_expression(node)
+            case ast.FunctionLiteral():
+                self.compile_function_literal(node)
+            case ast.CallExpression():
+                self.compile(node.function)
+                for argument in node.arguments:  # type: ignore
+                    self.compile(argument)
+                self.emit(Opcode.CALL, len(node.arguments))  # type: ignore
+            case None:
+                raise CompileError("cannot compile an incomplete program")
+
+    def compile_if_expression(self, node: ast.IfExpression) -> None:
+        self.compile(node.condition)
+        jump_not_truthy = self.emit(Opcode.JUMP_NOT_TRUTHY, PLACEHOLDER)
+
+        self.compile_branch(node.consequence)
+        jump = self.emit(Opcode.JUMP, PLACEHOLDER)
+        self.change_operand(jump_not_truthy, len(self.current_instructions()))
+
+        if node.alternative is None:
+            self.emit(Opcode.NULL)
+        else:
+            self.compile_branch(node.alternative)
+        self.change_operand(jump, len(self.current_instructions()))
+
+    def compile_branch(self, block: ast.BlockStatement | None) -> None:
+        """Compiles an if branch so that it leaves exactly its value on the stack"""
+        self.compile(block)
+        if self.last_instruction_is(Opcode.POP):
+            self.remove_last_pop()
+        elif (
+            not block or not block.statements or isinstance(block.statements[-1], ast.LetStatement)
+        ):
+            self.emit(Opcode.NULL)
+
+    def compile_function_literal(self, node: ast.FunctionLiteral, name: str | None = None) -> None:
+        self.enter_scope()
+        if name is not None:
+            self.symbol_table.define_function_name(name)
+        for parameter in node.parameters:  # type: ignore
+            self.symbol_table.define(parameter.value)
+
+        self.compile(node.body)
+        if self.last_instruction_is(Opcode.POP):
+            self.replace_last_pop_with_return()
+        if not self.last_instruction_is(Opcode.RETURN_VALUE):
+            self.emit(Opcode.RETURN)
+
+        free_symbols = self.symbol_table.free_symbols
+        num_locals = self.symbol_table.num_definitions
+        instructions = self.leave_scope()
+
+        for symbol in free_symbols:
+            self.load_symbol(symbol)
+
+        function = objects.CompiledFunction(instructions, num_locals, len(node.parameters))  # type: ignore
+        self.emit(Opcode.CLOSURE, self.add_constant(function), len(free_symbols))
+
+    def load_symbol(self, symbol: symbols.Symbol) -> None:
+        if symbol.scope == symbols.FUNCTION_SCOPE:
+            self.emit(Opcode.CURRENT_CLOSURE)
+        else:
+            self.emit(load_opcodes[symbol.scope], symbol.index)
+
+    def add_constant(self, obj: objects.Object) -> int:
+        if len(self.constants) == MAX_CONSTANTS:
+            raise CompileError(f"too many constants, at most {MAX_CONSTANTS} are supported")
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def add_integer(self, value: int) -> int:
+        index = self.integer_constants.get(value)
+        if index is None:
+            index = self.integer_constants[value] = self.add_constant(objects.Integer(value))
+        return index
+
+    def encode(self, opcode: Opcode, *operands: int) -> bytes:
+        try:
+            return make(opcode, *operands)
+        except OverflowError:
+            name = definitions[opcode].name
+            raise CompileError(f"operands {operands} out of range for {name}") from None
+
+    def emit(self, opcode: Opcode, *operands: int) -> int:
+        scope = self.scopes[-1]
+        position = len(scope.instructions)
+        scope.instructions += self.encode(opcode, *operands)
+        scope.previous_instruction = scope.last_instruction
+        scope.last_instruction = EmittedInstruction(opcode, position)
+        return position
+
+    def current_instructions(self) -> bytearray:
+        return self.scopes[-1].instructions
+
+    def last_instruction_is(self, opcode: Opcode) -> bool:
+        scope = self.scopes[-1]
+        return len(scope.instructions) > 0 and scope.last_instruction.opcode == opcode
+
+    def remove_last_pop(self) -> None:
+        scope = self.scopes[-1]
+        del scope.instructions[scope.last_instruction.position :]
+        scope.last_instruction = scope.previous_instruction
+
+    def replace_last_pop_with_return(self) -> None:
+        scope = self.scopes[-1]
+        position = scope.last_instruction.position
+        scope.instructions[position : position + 1] = make(Opcode.RETURN_VALUE)
+        scope.last_instruction.opcode = Opcode.RETURN_VALUE
+
+    def change_operand(self, position: int, operand: int) -> None:
+        instructions = self.current_instructions()
+        opcode = Opcode(instructions[position])
+        instruction = self.encode(opcode, operand)
+        instructions[position : position + len(instruction)] = instruction
+
+    def enter_scope(self) -> None:
+        self.scopes.append(CompilationScope())
+        self.symbol_table = symbols.SymbolTable(outer=self.symbol_table)
+
+    def leave_scope(self) -> bytes:
+        instructions = bytes(self.scopes.pop().instructions)
+        self.symbol_table = self.symbol_table.outer  # type: ignore
+        return instructions
+
+    def bytecode(self) -> Bytecode:
+        return Bytecode(bytes(self.current_instructions()), self.constants)
@@ -1,8 +1,14 @@
-from interpret_deez import lexer, parser
+import argparse
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO
 
+from interpret_deez import ast, lexer, parser, tokenizer
+from interpret_deez.parse_cache import ParseCache
 
-def get_errors(errors: list) -> str:
-    monkey_face = r'''            __,__
+MONKEY_FACE = r'''            __,__
    .--.  .-"     "-.  .--.
   / .. \/  .-. .-.  \/ .. \
  | |  '|  /   Y   \  |'  | |
@@ -14,33 +20,79 @@ def get_errors(errors: list) -> str:
         '._ '-=-' _.'
            '-----'
     '''
-    # number of spaces is 5, the same as the last char in monkey's char until end of triple quotes
-    error_message = "Woops! We ran into some monkey business here!\n     parser errors:\n"
+# number of spaces is 5, the same as the last char in monkey's char until end of triple quotes
+ERROR_HEADER = f"{MONKEY_FACE}Woops! We ran into some monkey business here!\n     parser errors:\n"
 
-    errors_output = ""
-    for error in errors:
-        errors_output = f"{errors_output}\t{error}\n"
 
-    errors_output = f"{monkey_face}{error_message}{errors_output}"
-    return errors_output
+def get_errors(errors: list) -> str:
+    return ERROR_HEADER + "".join(f"\t{error}\n" for error in errors)
 
 
-def emulate_parser(input: str) -> tuple[str, str]:
-    lex = lexer.Lexer(input)
-    pars = parser.Parser(lex)
-    program = pars.parse_program()
+def emulate_parser(input: str, cache: ParseCache | None = None) -> tuple[str, str]:
+    if cache is not None:
+        program, errors, _ = cache.parse(input)
+    else:
+        pars = parser.Parser(lexer.Lexer(input))
+        program = pars.parse_program()
+        errors = pars.get_errors()
     program_string = f">> {input}"
     errors_output = ""
 
-    if len(pars.errors) != 0:
-        errors_output = get_errors(pars.get_errors())
+    if len(errors) != 0:
+        errors_output = get_errors(errors)
         errors_output = f"{program_string}\n{errors_output}"
 
     program_string = f"{program_string}\n{program.to_string()}\n"
     return program_string, errors_output
 
 
-if __name__ == "__main__":
+@dataclass(frozen=True)
+class ParseOutcome:
+    input: str
+    program: ast.Program
+    errors: tuple[str, ...]
+    diagnostics: tuple[parser.Diagnostic, ...] = ()
+
+    def to_json(self) -> dict:
+        lines = tokenizer.LineIndex(self.input)
+        return {
+            "input": self.input,
+            "program": self.program.to_string(),
+            "errors": self.errors,
+            "diagnostics": [diagnostic.to_json(lines) for diagnostic in self.diagnostics],
+        }
+
+
+def parse_many(inputs: Iterable[str]) -> Iterator[ParseOutcome]:
+    """Parses each input on its own, reusing a single parser for all of them
+
+    Args:
+        inputs (Iterable[str]): independent snippets, consumed lazily
+
+    Yields:
+        ParseOutcome: program, parser errors and diagnostics of each input, in order
+    """
+    pars = parser.Parser(lexer.TableLexer(""))
+    for input in inputs:
+        program = pars.parse(input)
+        yield ParseOutcome(input, program, tuple(pars.errors), tuple(pars.diagnostics))
+
+
+def serve(inp: IO[str], out: IO[str]) -> None:
+    """Parses every line of `inp` as one input and writes one JSON object per line to `out`"""
+    for outcome in parse_many(line.rstrip("\n") for line in inp):
+        out.write(f"{json.dumps(outcome.to_json())}\n")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Monkey parser REPL")
+    arg_parser.add_argument(
+        "--ndjson", action="store_true", help="parse stdin line by line, write JSON lines"
+    )
+    if arg_parser.parse_args().ndjson:
+        serve(sys.stdin, sys.stdout)
+        return
+
     input_1 = "let  = 1 * 2 * 3 * 4 * 5;"  # wrong input on purpose
     input_2 = "x * y / 2 + 3 * 8 - 123"
     input_3 = "true == false"
@@ -56,3 +108,7 @@ if __name__ == "__main__":
             print(errors)
         else:
             print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+from interpret_deez import ast, objects
+
+
+def evaluate(
+    node: ast.Node | ast.Program | None, env: objects.Environment
+) -> objects.Object | None:
+    """Tree walking evaluator, dispatches on the node type at every visit
+
+    Args:
+        node (ast.Node | ast.Program | None): node to evaluate
+        env (objects.Environment): bindings visible to the node
+
+    Returns:
+        objects.Object | None: evaluated value, None for statements without value
+    """
+    match node:
+        case ast.Program():
+            return eval_program(node, env)
+        case ast.ExpressionStatement():
+            return evaluate(node.expression, env)
+        case ast.BlockStatement():
+            return eval_block_statement(node, env)
+        case ast.ReturnStatement():
+            value = evaluate(node.return_value, env)
+            if is_error(value):
+                return value
+            return objects.ReturnValue(or_null(value))
+        case ast.LetStatement():
+            value = evaluate(node.value, env)
+            if is_error(value):
+                return value
+            env.set(node.name.value, or_null(value))  # type: ignore
+            return None
+        case ast.IntegerLiteral():
+            return objects.Integer(node.value)  # type: ignore
+        case ast.Boolean():
+            return native_bool_to_boolean(bool(node.value))
+        case ast.PrefixExpression():
+            right = evaluate(node.right, env)
+            if is_error(right):
+                return right
+            return eval_prefix_expression(node.operator, or_null(right))
+        case ast.InfixExpression():
+            left = evaluate(node.left, env)
+            if is_error(left):
+                return left
+            right = evaluate(node.right, env)
+            if is_error(right):
+                return right
+            return eval_infix_expression(node.operator, or_null(left), or_null(right))
+        case ast.IfExpression():
+            return eval_if_expression(node, env)
+        case ast.Identifier():
+            return eval_identifier(node, env)
+        case ast.FunctionLiteral():
+            return objects.Function(node.parameters, node.body, env)  # type: ignore
+        case ast.CallExpression():
+            function = evaluate(node.function, env)
+            if is_error(function):
+                return function
+            args = eval_expressions(node.arguments, env)  # type: ignore
+            if len(args) == 1 and is_error(args[0]):
+                return args[0]
+            return apply_function(or_null(function), args)
+    return None
+
+
+def eval_program(program: ast.Program, env: objects.Environment) -> objects.Object | None:
+    result = None
+    for statement in program.statements:
+        result = evaluate(statement, env)
+        if isinstance(result, objects.ReturnValue):
+            return result.value
+        if isinstance(result, objects.Error):
+            return result
+    return result
+
+
+def eval_block_statement(
+    block: ast.BlockStatement, env: objects.Environment
+) -> objects.Object | None:
+    result = None
+    for statement in block.statements:
+        result = evaluate(statement, env)
+        # return values are unwrapped by the caller so they can bubble up nested blocks
+        if isinstance(result, objects.ReturnValue | objects.Error):
+            return result
+    return result
+
+
+def eval_if_expression(node: ast.IfExpression, env: objects.Environment) -> objects.Object | None:
+    condition = evaluate(node.condition, env)
+    if is_error(condition):
+        return condition
+
+    if is_truthy(or_null(condition)):
+        return evaluate(node.consequence, env)
+    if node.alternative is not None:
+        return evaluate(node.alternative, env)
+    return objects.NULL
+
+
+def eval_identifier(node: ast.Identifier, env: objects.Environment) -> objects.Object:
+    value = env.get(node.value)
+    if value is None:
+        return objects.Error(f"identifier not found: {node.value}")
+    return value
+
+
+def eval_expressions(
+    expressions: list[ast.Expression], env: objects.Environment
+) -> list[objects.Object]:
+    result = []
+    for expression in expressions:
+        value = evaluate(expression, env)
+        if is_error(value):
+            return [value]  # type: ignore
+        result.append(or_null(value))
+    return result
+
+
+def apply_function(function: objects.Object, args: list[objects.Object]) -> objects.Object | None:
+    if not isinstance(function, objects.Function):
+        return objects.Error(f"not a function: {function.type()}")
+
+    env = extend_function_environment(function, args)
+    if isinstance(env, objects.Error):
+        return env
+    return unwrap_return_value(evaluate(function.body, env))
+
+
+def extend_function_environment(
+    function: objects.Function, args: list[objects.Object]
+) -> objects.Environment | objects.Error:
+    if len(args) != len(function.parameters):
+        return objects.Error(
+            f"wrong number of arguments: want={len(function.parameters)}, got={len(args)}"
+        )
+
+    env = objects.new_enclosed_environment(function.env)
+    for parameter, arg in zip(function.parameters, args, strict=True):
+        env.set(parameter.value, arg)
+    return env
+
+
+def unwrap_return_value(value: objects.Object | None) -> objects.Object | None:
+    if isinstance(value, objects.ReturnValue):
+        return value.value
+    return value
+
+
+def eval_prefix_expression(operator: str, right: objects.Object) -> objects.Object:
+    match operator:
+        case "!":
+            return eval_bang_operator_expression(right)
+        case "-":
+            return eval_minus_prefix_operator_expression(right)
+    return objects.Error(f"unknown operator: {operator}{right.type()}")
+
+
+def eval_bang_operator_expression(right: objects.Object) -> objects.Object:
+    return objects.FALSE if is_truthy(right) else objects.TRUE
+
+
+def eval_minus_prefix_operator_expression(right: objects.Object) -> objects.Object:
+    if not isinstance(right, objects.Integer):
+        return objects.Error(f"unknown operator: -{right.type()}")
+    return objects.Integer(-right.value)
+
+
+def eval_infix_expression(
+    operator: str, left: objects.Object, right: objects.Object
+) -> objects.Object:
+    if isinstance(left, objects.Integer) and isinstance(right, objects.Integer):
+        return eval_integer_infix_expression(operator, left, right)
+    # booleans and null are singletons, identity is equality
+    if operator == "==":
+        return native_bool_to_boolean(left is right)
+    if operator == "!=":
+        return native_bool_to_boolean(left is not right)
+    if left.type() != right.type():
+        return objects.Error(f"type mismatch: {left.type()} {operator} {right.type()}")
+    return objects.Error(f"unknown operator: {left.type()} {operator} {right.type()}")
+
+
+def eval_integer_infix_expression(
+    operator: str, left: objects.Integer, right: objects.Integer
+) -> objects.Object:
+    match operator:
+        case "+":
+            return objects.Integer(left.value + right.value)
+        case "-":
+            return objects.Integer(left.value - right.value)
+        case "*":
+            return objects.Integer(left.value * right.value)
+        case "/":
+            if right.value == 0:
+                return objects.Error("division by zero")
+            return objects.Integer(divide(left.value, right.value))
+        case "<":
+            return native_bool_to_boolean(left.value < right.value)
+        case ">":
+            return native_bool_to_boolean(left.value > right.value)
+        case "==":
+            return native_bool_to_boolean(left.value == right.value)
+        case "!=":
+            return native_bool_to_boolean(left.value != right.value)
+    return objects.Error(f"unknown operator: {left.type()} {operator} {right.type()}")
+
+
+def divide(left: int, right: int) -> int:
+    """Integer division truncating toward zero, as Monkey (and Go) does"""
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+def native_bool_to_boolean(value: bool) -> objects.Boolean:
+    return objects.TRUE if value else objects.FALSE
+
+
+def is_truthy(value: objects.Object) -> bool:
+    return value is not objects.NULL and value is not objects.FALSE
+
+
+def is_error(value: objects.Object | None) -> bool:
+    return isinstance(value, objects.Error)
+
+
+def or_null(value: objects.Object | None) -> objects.Object:
+    """NULL for the missing value of an empty block or a `let`, where a value is needed"""
+    return objects.NULL if value is None else value
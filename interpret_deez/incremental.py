@@ -0,0 +1,170 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from interpret_deez import ast, lexer, parser, tokenizer
+
+
+@dataclass
+class Document:
+    """Parsed source that can be edited without reparsing all of it
+
+    Top level statements are kept with their `[start, end)` source span and their parse errors.
+    An edit re-lexes and reparses from the first statement it touches until the parser is back
+    at the start of an untouched statement, everything after that is reused as is.
+
+    Spans live in a gap buffer: entries before `gap` are offsets from the start of the source,
+    entries from `gap` on offsets from its end. An edit does not shift every span after it, only
+    the entries between the previous edit and this one change coordinates. Tokens of reused
+    statements keep the offsets they were parsed at, `token_start` corrects them.
+    """
+
+    source: str
+    # None where the parser gave up on a statement, its errors are still kept
+    statements: list[ast.Statement | None] = field(default_factory=list)
+    errors: list[list[str]] = field(default_factory=list)
+    # diagnostics of each statement at the offsets it was parsed at, like its tokens
+    diagnostics: list[list[parser.Diagnostic]] = field(default_factory=list)
+    starts: array = field(default_factory=lambda: array("q"))
+    ends: array = field(default_factory=lambda: array("q"))
+    # added to the token offsets of a statement to get their current offsets
+    shifts: array = field(default_factory=lambda: array("q"))
+    gap: int = 0
+
+    @property
+    def program(self) -> ast.Program:
+        return ast.Program([statement for statement in self.statements if statement is not None])
+
+    def get_errors(self) -> list[str]:
+        return [error for errors in self.errors for error in errors]
+
+    def get_diagnostics(self) -> list[parser.Diagnostic]:
+        """Diagnostics of all statements, at their offsets in the current source"""
+        return [
+            diagnostic.moved(self.shift(index))
+            for index, diagnostics in enumerate(self.diagnostics)
+            for diagnostic in diagnostics
+        ]
+
+    def span(self, index: int) -> tuple[int, int]:
+        if index < self.gap:
+            return self.starts[index], self.ends[index]
+        size = len(self.source)
+        return self.starts[index] + size, self.ends[index] + size
+
+    def spans(self) -> list[tuple[int, int]]:
+        return [self.span(index) for index in range(len(self.statements))]
+
+    def token_start(self, index: int, token: tokenizer.Token) -> int:
+        """Current source offset of a token belonging to statement `index`"""
+        return token.start + self.shift(index)
+
+    def shift(self, index: int) -> int:
+        """Added to the offsets statement `index` was parsed at to get its current offsets"""
+        shift = self.shifts[index]
+        return shift if index < self.gap else shift + len(self.source)
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> int:
+        """Replaces `deleted` characters at `offset` with `inserted` and reparses what changed
+
+        Args:
+            offset (int): where the edit starts in the current source
+            deleted (int): number of characters removed
+            inserted (str): text inserted in their place
+
+        Returns:
+            int: number of statements that were parsed again
+        """
+        if not 0 <= offset <= offset + deleted <= len(self.source):
+            raise ValueError(f"edit ({offset}, {deleted}) is outside of the source")
+        edit_end = offset + deleted
+        delta = len(inserted) - deleted
+        source = f"{self.source[:offset]}{inserted}{self.source[edit_end:]}"
+
+        # statements ending right at the edit are damaged too, "x" followed by "y" is "xy". The one
+        # before them as well: the parser peeked at the first token after it to decide it ended.
+        first = max(self.find(self.ends, offset) - 1, 0)
+        region_start = min(self.span(first)[0], offset) if self.statements else 0
+
+        # old statements starting after the edit are the candidates to resume at
+        resume = self.find(self.starts, edit_end + 1, first)
+
+        reparsed = Document(source)
+        pars = parser.Parser(lexer.TableLexer(source, region_start))
+        while not pars.is_current(tokenizer.EOF):
+            old_start = pars.current.start - delta
+            index = self.find(self.starts, old_start, resume)
+            if index < len(self.statements) and self.span(index)[0] == old_start:
+                break
+            reparsed.parse_statement(pars)
+            pars.next_token()
+        else:
+            index = len(self.statements)
+
+        self.splice(first, index, reparsed)
+        self.source = source
+        return len(reparsed.statements)
+
+    def find(self, values: array, offset: int, low: int = 0) -> int:
+        """Index of the first statement whose start or end in `values` is at least `offset`"""
+        if low < self.gap:
+            index = bisect_left(values, offset, low, self.gap)
+            if index < self.gap:
+                return index
+            low = self.gap
+        return bisect_left(values, offset - len(self.source), low)
+
+    def move_gap(self, index: int) -> None:
+        size = len(self.source)
+        gap = self.gap
+        for values in (self.starts, self.ends, self.shifts):
+            if index > gap:
+                values[gap:index] = array("q", [value + size for value in values[gap:index]])
+            elif index < gap:
+                values[index:gap] = array("q", [value - size for value in values[index:gap]])
+        self.gap = index
+
+    def splice(self, first: int, last: int, reparsed: "Document") -> None:
+        """Replaces statements `[first, last)` with reparsed ones, before `source` is updated"""
+        # statements before `first` keep their offsets from the start, the ones from `last` on
+        # their offsets from the end
+        if self.gap < first:
+            self.move_gap(first)
+        elif self.gap > last:
+            self.move_gap(last)
+        self.statements[first:last] = reparsed.statements
+        self.errors[first:last] = reparsed.errors
+        self.diagnostics[first:last] = reparsed.diagnostics
+        self.starts[first:last] = reparsed.starts
+        self.ends[first:last] = reparsed.ends
+        self.shifts[first:last] = reparsed.shifts
+        self.gap = first + len(reparsed.statements)
+
+    def parse_statement(self, pars: parser.Parser) -> None:
+        """Appends the statement the parser is at, only valid while the gap is at the end"""
+        start = pars.current.start
+        errors = len(pars.errors)
+        self.statements.append(pars.parse_statement())
+        self.errors.append(pars.errors[errors:])
+        self.diagnostics.append(pars.diagnostics[errors:])
+        self.starts.append(start)
+        self.ends.append(pars.current.start + len(pars.current.literal))
+        self.shifts.append(0)
+        self.gap += 1
+
+
+def parse_document(source: str) -> Document:
+    """Parses a whole source into an editable document
+
+    Args:
+        source (str): program source
+
+    Returns:
+        Document: statements of the program with their spans and errors
+    """
+    document = Document(source)
+    pars = parser.Parser(lexer.TableLexer(source))
+    while not pars.is_current(tokenizer.EOF):
+        document.parse_statement(pars)
+        pars.next_token()
+    return document
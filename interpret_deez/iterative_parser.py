@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+
+from interpret_deez import ast, tokenizer
+from interpret_deez.parser import Parser, Precedences
+
+# Pending work on the operand stack, each waits for the expression parsed after it
+PREFIX = 0  # PrefixExpression waiting for its right operand
+INFIX = 1  # InfixExpression waiting for its right operand
+GROUP = 2  # "(" waiting for the inner expression and ")"
+CALL = 3  # CallExpression waiting for its next argument
+
+
+@dataclass
+class IterativeParser(Parser):
+    """Parser whose expressions are parsed with an explicit stack instead of recursion
+
+    Produces the same trees and errors as `Parser`, but operator chains, prefix chains,
+    parentheses and call arguments nest on a list rather than on the Python call stack, so
+    arbitrarily long or deep expressions do not hit the recursion limit. Block bodies of `if`
+    and `fn` are still parsed recursively.
+    """
+
+    def parse_expression(self, precedence: int) -> ast.Expression | None:
+        # (kind, node, precedence of the level the frame was pushed from)
+        stack: list[tuple[int, ast.Expression | None, int]] = []
+        left: ast.Expression | None = None
+        # the functions the dispatch tables hold for the rules handled on the stack
+        cls = type(self)
+        parse_prefix = cls.parse_prefix_expression
+        parse_grouped = cls.parse_grouped_expression
+        parse_infix = cls.parse_infix_expression
+        parse_call = cls.parse_call_expression
+
+        while True:
+            # prefix position: descend through prefix operators and "(" without recursing
+            prefix = self.prefix_parse_functions.get(self.current.type)
+            if prefix is parse_prefix:
+                node = ast.PrefixExpression(self.current, self.current.literal)
+                stack.append((PREFIX, node, precedence))
+                precedence = Precedences.PREFIX
+                self.next_token()
+                continue
+            if prefix is parse_grouped:
+                stack.append((GROUP, None, precedence))
+                precedence = Precedences.LOWEST
+                self.next_token()
+                continue
+
+            if prefix is None:
+                self.no_prefix_parse_function_error(self.current.type)
+                left = None
+                # a missing prefix ends the level without looking for infix operators
+                skip_infix = True
+            else:
+                left = prefix(self)
+                skip_infix = False
+
+            descend = False
+            while not descend:
+                if not skip_infix:
+                    while not self.is_peek(tokenizer.SEMICOLON) and (
+                        precedence < self.peek_precedence()
+                    ):
+                        infix = self.infix_parse_functions.get(self.peek.type)
+                        if infix is None:
+                            break
+                        self.next_token()
+
+                        if infix is parse_call:
+                            call = ast.CallExpression(self.current, left, [])  # type: ignore
+                            if self.is_peek(tokenizer.RPAREN):
+                                self.next_token()
+                                left = call
+                                continue
+                            stack.append((CALL, call, precedence))
+                            precedence = Precedences.LOWEST
+                            self.next_token()
+                            descend = True
+                            break
+                        if infix is not parse_infix:
+                            left = infix(self, left)
+                            continue
+
+                        infix_node = ast.InfixExpression(self.current, left, self.current.literal)
+                        stack.append((INFIX, infix_node, precedence))
+                        precedence = self.current_precedence()
+                        self.next_token()
+                        descend = True
+                        break
+                    if descend:
+                        break
+                skip_infix = False
+
+                # the level is done, hand its expression to the frame that was waiting for it
+                if not stack:
+                    return left
+                kind, node, precedence = stack.pop()
+                if kind in (PREFIX, INFIX):
+                    node.right = left  # type: ignore
+                    left = node
+                elif kind == GROUP:
+                    if not self.expected_peek(tokenizer.RPAREN):
+                        left = None
+                else:
+                    node.arguments.append(left)  # type: ignore
+                    if self.is_peek(tokenizer.COMMA):
+                        self.next_token()
+                        self.next_token()
+                        stack.append((CALL, node, precedence))
+                        precedence = Precedences.LOWEST
+                        descend = True
+                        break
+                    if not self.expected_peek(tokenizer.RPAREN):
+                        node.arguments = None  # type: ignore
+                    left = node
@@ -1,17 +1,59 @@
+import codecs
+import mmap
+import os
 import re
+from collections.abc import Buffer, Iterable, Iterator
 from dataclasses import dataclass
+from typing import IO
 
 from interpret_deez import tokenizer
 
 is_letter_rexp = re.compile("[a-zA-Z_]")
 is_digit_rexp = re.compile("[0-9]")
 
+# One match per token: skip whitespace, then grab a whole identifier run (group 1), a whole integer
+# run (group 2) or a two/single character operator (group 3). The possessive `*+` stops the
+# whitespace from being given back to `.` when only whitespace is left.
+token_rexp = re.compile(r"[ \t\n\r]*+(?:([a-zA-Z_]+)|([0-9]+)|(==|!=|.))", re.DOTALL)
+
+# `token_rexp` for UTF-8 bytes, a non ASCII character is matched as one whole sequence
+token_bytes_rexp = re.compile(
+    rb"[ \t\n\r]*+(?:([a-zA-Z_]+)|([0-9]+)|(==|!=|[\xc0-\xff][\x80-\xbf]*|.))", re.DOTALL
+)
+
+operator_tokens: dict[str, tokenizer.TokenType] = {
+    "=": tokenizer.ASSIGN,
+    "==": tokenizer.EQ,
+    "!": tokenizer.BANG,
+    "!=": tokenizer.NOT_EQ,
+    ";": tokenizer.SEMICOLON,
+    "(": tokenizer.LPAREN,
+    ")": tokenizer.RPAREN,
+    ",": tokenizer.COMMA,
+    "+": tokenizer.PLUS,
+    "-": tokenizer.MINUS,
+    "/": tokenizer.SLASH,
+    "*": tokenizer.ASTERISK,
+    "<": tokenizer.LT,
+    ">": tokenizer.GT,
+    "{": tokenizer.LBRACE,
+    "}": tokenizer.RBRACE,
+    "[": tokenizer.LBRACKET,
+    "]": tokenizer.RBRACKET,
+    "\0": tokenizer.EOF,
+}
+
+byte_operator_tokens: dict[bytes, tokenizer.TokenType] = {
+    literal.encode(): token_type for literal, token_type in operator_tokens.items()
+}
+
 
 @dataclass
 class Lexer:
     inp: str
     position = 0
     read_position = 0
+    token_start = 0
     char = ""
 
     def __post_init__(self) -> None:
@@ -23,12 +65,13 @@ class Lexer:
         self.read_position += 1
 
     def new_token(self, token_type: tokenizer.TokenType, char: str) -> tokenizer.Token:
-        return tokenizer.Token(type=token_type, literal=char)
+        return tokenizer.Token(type=token_type, literal=char, start=self.token_start)
 
     def next_token(self) -> tokenizer.Token:
         _token: tokenizer.Token
 
         self.skip_whitespace()
+        self.token_start = self.position
 
         match self.char:
             case "=":
@@ -54,7 +97,7 @@ class Lexer:
                 if self.peek_char() == "=":
                     char = self.char
                     self.read_char()
-                    _token = self.new_token(tokenizer.NOT_EQ, f"{char}{tokenizer.ASSIGN}")
+                    _token = self.new_token(tokenizer.NOT_EQ, f"{char}=")
                 else:
                     _token = self.new_token(tokenizer.BANG, self.char)
             case "/":
@@ -74,6 +117,8 @@ class Lexer:
             case "]":
                 _token = self.new_token(tokenizer.RBRACKET, self.char)
             case "\0":
+                # position keeps growing once past the end, EOF is reported at the end
+                self.token_start = min(self.token_start, len(self.inp))
                 _token = self.new_token(tokenizer.EOF, "")
             case _:
                 if self.is_letter(self.char):
@@ -111,3 +156,209 @@ class Lexer:
         if self.read_position >= len(self.inp):
             return "\0"
         return self.inp[self.read_position]
+
+
+@dataclass
+class TableLexer:
+    """Single-pass scanner with the same `next_token` API as `Lexer`
+
+    Instead of walking the input one character at a time, every call runs `token_rexp` once at
+    the current position and classifies operators through the `operator_tokens` table.
+    """
+
+    inp: str
+    position: int = 0
+
+    def next_token(self) -> tokenizer.Token:
+        match = token_rexp.match(self.inp, self.position)
+        if match is None:
+            self.position = len(self.inp)
+            return tokenizer.Token(tokenizer.EOF, "", self.position)
+
+        self.position = match.end()
+        group = match.lastindex
+        literal = match[group]
+        start = match.start(group)
+
+        if group == 1:
+            return tokenizer.Token(tokenizer.lookup_identfier(literal), literal, start)
+        if group == 2:
+            return tokenizer.Token(tokenizer.INT, literal, start)
+
+        token_type = operator_tokens.get(literal, tokenizer.ILLEGAL)
+        if token_type == tokenizer.EOF:
+            literal = ""
+        return tokenizer.Token(token_type, literal, start)
+
+
+@dataclass
+class StreamLexer:
+    """`TableLexer` over a file object or an iterable of chunks, `str` or UTF-8 `bytes`
+
+    Only the unconsumed tail of the input is buffered: a token is produced once its match ends
+    before the end of the buffer, otherwise the next chunk is read first, so tokens spanning chunk
+    boundaries (`==`, long identifiers) come out whole. Token starts are absolute offsets into the
+    decoded input.
+    """
+
+    source: IO | Iterable[str | bytes]
+    chunk_size: int = 1 << 16
+
+    def __post_init__(self) -> None:
+        self.chunks = read_chunks(self.source, self.chunk_size)
+        self.buffer = ""
+        # absolute offset of buffer[0]
+        self.offset = 0
+        self.position = 0
+
+    def fill(self) -> bool:
+        """Appends the next chunk to the buffer, dropping what was consumed already
+
+        Returns:
+            bool: False once the input is exhausted
+        """
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.offset += self.position
+        self.position = 0
+        return True
+
+    def next_token(self) -> tokenizer.Token:
+        match = token_rexp.match(self.buffer, self.position)
+        while (match is None or match.end() == len(self.buffer)) and self.fill():
+            match = token_rexp.match(self.buffer, self.position)
+
+        if match is None:
+            self.position = len(self.buffer)
+            return tokenizer.Token(tokenizer.EOF, "", self.offset + self.position)
+
+        self.position = match.end()
+        group = match.lastindex
+        literal = match[group]
+        start = self.offset + match.start(group)
+
+        if group == 1:
+            return tokenizer.Token(tokenizer.lookup_identfier(literal), literal, start)
+        if group == 2:
+            return tokenizer.Token(tokenizer.INT, literal, start)
+
+        token_type = operator_tokens.get(literal, tokenizer.ILLEGAL)
+        if token_type == tokenizer.EOF:
+            literal = ""
+        return tokenizer.Token(token_type, literal, start)
+
+
+def read_chunks(source: IO | Iterable[str | bytes], chunk_size: int) -> Iterator[str]:
+    """Yields the non empty text chunks of a file object or an iterable, decoding UTF-8 bytes"""
+    if hasattr(source, "read"):
+        chunks: Iterable[str | bytes] = iter(lambda: source.read(chunk_size), source.read(0))  # type: ignore
+    else:
+        chunks = source  # type: ignore
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            # multi byte characters may be split across chunks
+            decoder = decoder or codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None and (tail := decoder.decode(b"", final=True)):
+        yield tail
+
+
+def stream_tokens(
+    source: IO | Iterable[str | bytes], chunk_size: int = 1 << 16
+) -> Iterator[tokenizer.Token]:
+    """Yields the tokens of a file object or an iterable of chunks, EOF included
+
+    Args:
+        source (IO | Iterable[str | bytes]): text or binary file, socket file, chunk iterator
+        chunk_size (int): characters or bytes read from a file object at a time
+    """
+    lex = StreamLexer(source, chunk_size)
+    while True:
+        token = lex.next_token()
+        yield token
+        if token.type == tokenizer.EOF:
+            return
+
+
+def tokenize_all(source: str) -> tokenizer.TokenBuffer:
+    """Tokenizes the whole source at once
+
+    Args:
+        source (str): program source
+
+    Returns:
+        tokenizer.TokenBuffer: tokens as parallel kind/start/end arrays, ending with EOF
+    """
+    buffer = tokenizer.TokenBuffer(source)
+    lookup_identfier = tokenizer.lookup_identfier
+    get_operator = operator_tokens.get
+    append = buffer.append
+
+    for match in token_rexp.finditer(source):
+        group = match.lastindex
+        if group == 1:
+            kind = lookup_identfier(match[1])
+        elif group == 2:
+            kind = tokenizer.INT
+        else:
+            kind = get_operator(match[3], tokenizer.ILLEGAL)
+            if kind == tokenizer.EOF:
+                append(kind, match.start(3), match.end())
+                return buffer
+        append(kind, match.start(group), match.end())
+
+    append(tokenizer.EOF, len(source), len(source))
+    return buffer
+
+
+def tokenize_bytes(source: Buffer) -> tokenizer.TokenBuffer:
+    """Tokenizes UTF-8 bytes without decoding them
+
+    Works on anything exposing the buffer protocol, `mmap` included. Offsets in the returned
+    buffer are byte offsets and literals are only decoded when the parser asks for them.
+
+    Args:
+        source (Buffer): UTF-8 encoded program source
+
+    Returns:
+        tokenizer.TokenBuffer: tokens over `source`, ending with EOF
+    """
+    buffer = tokenizer.TokenBuffer(source)
+    get_keyword = tokenizer.byte_keywords.get
+    get_operator = byte_operator_tokens.get
+    append = buffer.append
+
+    for match in token_bytes_rexp.finditer(source):  # type: ignore
+        group = match.lastindex
+        if group == 1:
+            kind = get_keyword(match[1], tokenizer.IDENT)
+        elif group == 2:
+            kind = tokenizer.INT
+        else:
+            kind = get_operator(match[3], tokenizer.ILLEGAL)
+            if kind == tokenizer.EOF:
+                append(kind, match.start(3), match.end())
+                return buffer
+        append(kind, match.start(group), match.end())
+
+    size = len(source)  # type: ignore
+    append(tokenizer.EOF, size, size)
+    return buffer
+
+
+def tokenize_file(path: str | os.PathLike) -> tokenizer.TokenBuffer:
+    """Tokenizes a UTF-8 file through a read only memory map, the file is never read whole
+
+    The map stays open for as long as the returned buffer references it.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty files cannot be mapped
+            return tokenize_bytes(b"")
+        source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return tokenize_bytes(source)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from interpret_deez import ast
+
+type ObjectType = str
+
+INTEGER_OBJ = "INTEGER"
+BOOLEAN_OBJ = "BOOLEAN"
+NULL_OBJ = "NULL"
+RETURN_VALUE_OBJ = "RETURN_VALUE"
+ERROR_OBJ = "ERROR"
+FUNCTION_OBJ = "FUNCTION"
+COMPILED_FUNCTION_OBJ = "COMPILED_FUNCTION"
+CLOSURE_OBJ = "CLOSURE"
+
+
+class Object(ABC):
+    @abstractmethod
+    def type(self) -> ObjectType:
+        """Object type used in error messages
+
+        Returns:
+            ObjectType: object type name
+        """
+        ...
+
+    @abstractmethod
+    def inspect(self) -> str:
+        """Object value as shown by the REPL
+
+        Returns:
+            str: object as string
+        """
+        ...
+
+
+@dataclass
+class Integer(Object):
+    value: int
+
+    def type(self) -> ObjectType:
+        return INTEGER_OBJ
+
+    def inspect(self) -> str:
+        return str(self.value)
+
+
+@dataclass
+class Boolean(Object):
+    value: bool
+
+    def type(self) -> ObjectType:
+        return BOOLEAN_OBJ
+
+    def inspect(self) -> str:
+        return "true" if self.value else "false"
+
+
+@dataclass
+class Null(Object):
+    def type(self) -> ObjectType:
+        return NULL_OBJ
+
+    def inspect(self) -> str:
+        return "null"
+
+
+@dataclass
+class ReturnValue(Object):
+    value: Object
+
+    def type(self) -> ObjectType:
+        return RETURN_VALUE_OBJ
+
+    def inspect(self) -> str:
+        return self.value.inspect()
+
+
+@dataclass
+class Error(Object):
+    message: str
+
+    def type(self) -> ObjectType:
+        return ERROR_OBJ
+
+    def inspect(self) -> str:
+        return f"ERROR: {self.message}"
+
+
+@dataclass(eq=False)
+class Function(Object):
+    parameters: list[ast.Identifier]
+    body: ast.BlockStatement
+    env: Environment
+    # body compiled by the closure backend, unused by the tree walker
+    code: Callable[[Environment], Object | None] | None = None
+
+    def type(self) -> ObjectType:
+        return FUNCTION_OBJ
+
+    def inspect(self) -> str:
+        params = ", ".join(parameter.to_string() for parameter in self.parameters)
+        return f"fn({params}) {{\n{self.body.to_string()}\n}}"
+
+
+# Booleans and null carry no state, every evaluation shares these
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+NULL = Null()
+
+
+@dataclass(eq=False)
+class Environment:
+    store: dict[str, Object] = field(default_factory=dict)
+    outer: Environment | None = None
+
+    def get(self, name: str) -> Object | None:
+        env: Environment | None = self
+        while env is not None:
+            value = env.store.get(name)
+            if value is not None:
+                return value
+            env = env.outer
+        return None
+
+    def set(self, name: str, value: Object) -> Object:
+        self.store[name] = value
+        return value
+
+
+def new_enclosed_environment(outer: Environment) -> Environment:
+    return Environment(outer=outer)
+
+
+@dataclass(eq=False)
+class CompiledFunction(Object):
+    instructions: bytes
+    num_locals: int = 0
+    num_parameters: int = 0
+
+    def type(self) -> ObjectType:
+        return COMPILED_FUNCTION_OBJ
+
+    def inspect(self) -> str:
+        return f"CompiledFunction[{id(self):#x}]"
+
+
+@dataclass(eq=False)
+class Closure(Object):
+    fn: CompiledFunction
+    free: list[Object] = field(default_factory=list)
+
+    def type(self) -> ObjectType:
+        return CLOSURE_OBJ
+
+    def inspect(self) -> str:
+        return f"Closure[{id(self):#x}]"
@@ -0,0 +1,215 @@
+import dataclasses
+
+from interpret_deez import ast, evaluator, objects, tokenizer
+
+# operators whose result is an integer or an error, never another type
+ARITHMETIC = frozenset("+-*/")
+
+
+def fold_constants(program: ast.Program) -> ast.Program:
+    """Folds constant subtrees, simplifies identities and prunes constant `if` branches
+
+    Operators are folded with the evaluator's own functions, so a folded program evaluates to
+    the same values and errors as the original. Subtrees that would evaluate to an error, like
+    a division by zero, are left alone. The input is not modified, unchanged subtrees are shared
+    with the result.
+
+    Args:
+        program (ast.Program): parsed program
+
+    Returns:
+        ast.Program: optimized program
+    """
+    statements = fold_statements(program.statements)
+    if statements is program.statements:
+        return program
+    return ast.Program(statements)
+
+
+def fold_statements(statements: list[ast.Statement]) -> list[ast.Statement]:
+    folded: list[ast.Statement] = []
+    changed = False
+    last = len(statements) - 1
+    for index, statement in enumerate(statements):
+        new = fold_statement(statement)
+        changed = changed or new is not statement
+        branch = constant_branch(new)
+        if branch is None:
+            folded.append(new)
+            continue
+        # `if` runs in the environment of its block, a decided branch can take its place. The
+        # value of the last statement is the value of the block, keep the `if` when it would
+        # give another one (an empty branch is None, a missing one NULL).
+        if index == last and not branch.statements:
+            folded.append(new)
+            continue
+        folded.extend(branch.statements)
+        changed = True
+    return folded if changed else statements
+
+
+# stands for the missing `else` of an `if` whose condition is falsy
+NOT_TAKEN = ast.BlockStatement(tokenizer.Token(tokenizer.LBRACE, "{"))
+
+
+def constant_branch(statement: ast.Statement) -> ast.BlockStatement | None:
+    """Branch an `if` expression statement always takes, `NOT_TAKEN` when it takes none"""
+    if not isinstance(statement, ast.ExpressionStatement):
+        return None
+    expression = statement.expression
+    if not isinstance(expression, ast.IfExpression):
+        return None
+    return taken_branch(expression)
+
+
+def taken_branch(expression: ast.IfExpression) -> ast.BlockStatement | None:
+    if expression.consequence is None:
+        return None
+    condition = constant_value(expression.condition)
+    if condition is None:
+        return None
+    if evaluator.is_truthy(condition):
+        return expression.consequence
+    return expression.alternative or NOT_TAKEN
+
+
+def fold_statement(statement: ast.Statement) -> ast.Statement:
+    match statement:
+        case ast.LetStatement(value=value) if value is not None:
+            return replace(statement, value=fold(value))
+        case ast.ReturnStatement(return_value=value) if value is not None:
+            return replace(statement, return_value=fold(value))
+        case ast.ExpressionStatement(expression=expression) if expression is not None:
+            return replace(statement, expression=fold(expression))
+        case ast.BlockStatement():
+            return fold_block(statement)
+    return statement
+
+
+def fold_block(block: ast.BlockStatement) -> ast.BlockStatement:
+    return replace(block, statements=fold_statements(block.statements))
+
+
+def fold(expression: ast.Expression) -> ast.Expression:
+    match expression:
+        case ast.PrefixExpression(right=right) if right is not None:
+            folded = replace(expression, right=fold(right))
+            value = constant_value(folded.right)
+            if value is None or constant_value(folded) is not None:
+                return folded
+            return to_literal(evaluator.eval_prefix_expression(folded.operator, value), folded)
+        case ast.InfixExpression(left=left, right=right) if left is not None and right is not None:
+            folded = replace(expression, left=fold(left), right=fold(right))
+            left_value = constant_value(folded.left)
+            right_value = constant_value(folded.right)
+            if left_value is not None and right_value is not None:
+                result = evaluator.eval_infix_expression(folded.operator, left_value, right_value)
+                return to_literal(result, folded)
+            return simplify(folded, left_value, right_value)
+        case ast.IfExpression():
+            condition = fold(expression.condition) if expression.condition else None
+            folded = replace(
+                expression,
+                condition=condition,
+                consequence=fold_block(expression.consequence) if expression.consequence else None,
+                alternative=fold_block(expression.alternative) if expression.alternative else None,
+            )
+            # in expression position a decided branch can only stand in for the `if` when it is
+            # a single expression, the value of the branch is then the value of the expression
+            branch = taken_branch(folded)
+            if branch is not None and len(branch.statements) == 1:
+                match branch.statements[0]:
+                    case ast.ExpressionStatement(expression=taken) if taken is not None:
+                        return taken
+            return folded
+        case ast.FunctionLiteral(body=body) if body is not None:
+            return replace(expression, body=fold_block(body))
+        case ast.CallExpression():
+            function = fold(expression.function) if expression.function else None
+            arguments = expression.arguments
+            if arguments is not None:
+                folded_arguments = [fold(argument) for argument in arguments]
+                if any(
+                    new is not old for new, old in zip(folded_arguments, arguments, strict=True)
+                ):
+                    arguments = folded_arguments
+            return replace(expression, function=function, arguments=arguments)
+    return expression
+
+
+def simplify(
+    expression: ast.InfixExpression,
+    left: objects.Object | None,
+    right: objects.Object | None,
+) -> ast.Expression:
+    """`x + 0`, `0 + x`, `x - 0`, `x * 1`, `1 * x` and `x / 1` are `x` when `x` is an integer
+
+    With any other type the operator is a runtime error, so the identity is only applied when
+    `x` is known to be an integer or an error.
+    """
+    operator = expression.operator
+    right_identity = (operator in "+-" and is_int(right, 0)) or (
+        operator in "*/" and is_int(right, 1)
+    )
+    if right_identity and is_integer(expression.left):
+        return expression.left  # type: ignore
+    left_identity = (operator == "+" and is_int(left, 0)) or (operator == "*" and is_int(left, 1))
+    if left_identity and is_integer(expression.right):
+        return expression.right  # type: ignore
+    return expression
+
+
+def is_int(value: objects.Object | None, number: int) -> bool:
+    return isinstance(value, objects.Integer) and value.value == number
+
+
+def is_integer(expression: ast.Expression | None) -> bool:
+    """Whether an expression evaluates to an integer or to an error"""
+    match expression:
+        case ast.IntegerLiteral():
+            return True
+        case ast.PrefixExpression(operator="-"):
+            return True
+        case ast.InfixExpression(operator=operator):
+            return operator in ARITHMETIC
+    return False
+
+
+def constant_value(expression: ast.Expression | None) -> objects.Object | None:
+    """Value of a literal, negative integers are `-` applied to a literal"""
+    match expression:
+        case ast.IntegerLiteral(value=value) if value is not None:
+            return objects.Integer(value)
+        case ast.Boolean(value=value) if value is not None:
+            return evaluator.native_bool_to_boolean(value)
+        case ast.PrefixExpression(operator="-", right=ast.IntegerLiteral(value=value)) if (
+            value is not None
+        ):
+            return objects.Integer(-value)
+    return None
+
+
+def to_literal(value: objects.Object, expression: ast.Expression) -> ast.Expression:
+    """Literal for a folded value at the position of the expression it replaces"""
+    start = expression.token.start
+    if isinstance(value, objects.Integer):
+        literal = ast.IntegerLiteral(
+            tokenizer.Token(tokenizer.INT, str(abs(value.value)), start), abs(value.value)
+        )
+        if value.value >= 0:
+            return literal
+        return ast.PrefixExpression(tokenizer.Token(tokenizer.MINUS, "-", start), "-", literal)
+    if isinstance(value, objects.Boolean):
+        token_type = tokenizer.TRUE if value.value else tokenizer.FALSE
+        return ast.Boolean(
+            tokenizer.Token(token_type, str(value.value).lower(), start), value.value
+        )
+    # errors are raised when the program runs, not here
+    return expression
+
+
+def replace[T: ast.Node](node: T, **children) -> T:
+    """`node` with new children, or `node` itself when none of them changed"""
+    if all(getattr(node, name) is child for name, child in children.items()):
+        return node
+    return dataclasses.replace(node, **children)
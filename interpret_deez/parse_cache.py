@@ -0,0 +1,124 @@
+import contextlib
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from interpret_deez import ast, lexer, parser
+
+type ParseResult = tuple[ast.Program, list[str], list[parser.Diagnostic]]
+
+VERSION_DIRECTORY = re.compile(r"v[0-9a-f]{16}")
+
+
+@dataclass
+class ParseCache:
+    """On disk cache of parse results keyed by source hash and `parser.GRAMMAR_VERSION`
+
+    Entries are pickles of `(program, errors, diagnostics)` stored under
+    `directory/v<GRAMMAR_VERSION>/`. Directories of other grammar versions are removed on
+    creation, anything else in `directory` is left alone. The least recently used entries are
+    evicted once the cache holds more than `max_bytes`. Only point it at a directory you trust,
+    entries are unpickled.
+    """
+
+    directory: Path
+    max_bytes: int = 64 * 2**20
+    version_directory: Path = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.directory = Path(self.directory)
+        self.version_directory = self.directory / f"v{parser.GRAMMAR_VERSION}"
+        self.version_directory.mkdir(parents=True, exist_ok=True)
+        self.remove_stale_versions()
+
+    def parse(self, source: str) -> ParseResult:
+        """Parses the source, or loads the result of a previous parse of the same source
+
+        Args:
+            source (str): program source
+
+        Returns:
+            ParseResult: parsed program, the parser errors and their diagnostics
+        """
+        path = self.entry_path(source)
+        result = self.load(path)
+        if result is not None:
+            return result
+
+        pars = parser.Parser(lexer.TableLexer(source))
+        result = pars.parse_program(), pars.get_errors(), pars.get_diagnostics()
+        self.store(path, result)
+        return result
+
+    def entry_path(self, source: str) -> Path:
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        return self.version_directory / f"{digest}.pickle"
+
+    def load(self, path: Path) -> ParseResult | None:
+        try:
+            with path.open("rb") as file:
+                program, errors, diagnostics = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # truncated or written by incompatible code, drop it and parse again
+            path.unlink(missing_ok=True)
+            return None
+
+        # refresh the mtime, eviction goes by least recently used
+        # evicted meanwhile, touching it would recreate it empty
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return program, errors, diagnostics
+
+    def store(self, path: Path, result: ParseResult) -> None:
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            # pathologically deep trees are not worth caching
+            return
+
+        # write then rename, concurrent readers never see a partial entry
+        fd, temporary = tempfile.mkstemp(dir=self.version_directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.version_directory.glob("*.pickle"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def remove_stale_versions(self) -> None:
+        for path in self.directory.iterdir():
+            if (
+                VERSION_DIRECTORY.fullmatch(path.name)
+                and path.is_dir()
+                and path != self.version_directory
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self) -> None:
+        for path in self.version_directory.glob("*.pickle"):
+            path.unlink(missing_ok=True)
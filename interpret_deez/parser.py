@@ -1,13 +1,46 @@
 import enum
+import hashlib
+import importlib.metadata
 from collections.abc import Callable
 from dataclasses import dataclass, field
-
-from defer.sugarfree import defer
+from pathlib import Path
+from typing import ClassVar
 
 from interpret_deez import ast, lexer, tokenizer
+from interpret_deez.parser_profiling import ParseProfile
 from interpret_deez.parser_tracing import TraceDeez
 
 
+def grammar_version() -> str:
+    """Hash of the modules shaping parse results: tokens, lexers, AST classes and the parser
+
+    Hashes the sources, or the bytecode of installs shipping only `.pyc` files. When neither
+    can be read, the package version is hashed instead.
+    """
+    directory = Path(__file__).parent
+    digest = hashlib.sha256()
+    for module in ("tokenizer", "lexer", "ast", "parser"):
+        for path in (directory / f"{module}.py", directory / f"{module}.pyc"):
+            if path.is_file():
+                digest.update(path.read_bytes())
+                break
+        else:
+            digest.update(package_version().encode())
+    return digest.hexdigest()[:16]
+
+
+def package_version() -> str:
+    try:
+        return importlib.metadata.version("interpreter-in-go-but-python")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Persisted parse results are keyed by it, any change to the grammar, the AST classes or the
+# reported errors gives a new version
+GRAMMAR_VERSION = grammar_version()
+
+
 class Precedences(enum.IntEnum):
     LOWEST = 1
     EQUALS = 2  # ==
@@ -30,46 +63,133 @@ precedences = {
     tokenizer.LPAREN: Precedences.CALL,
 }
 
+# Same as `precedences` but indexed by token kind, tokens without precedence get LOWEST
+precedence_table: tuple[Precedences, ...] = tuple(
+    precedences.get(token_type, Precedences.LOWEST) for token_type in tokenizer.TokenType
+)
+
+
+# Method parsing an expression that starts with (prefix) or continues with (infix) a token
+prefix_rules = {
+    tokenizer.IDENT: "parse_identifier",
+    tokenizer.INT: "parse_integer_literal",
+    tokenizer.BANG: "parse_prefix_expression",
+    tokenizer.MINUS: "parse_prefix_expression",
+    tokenizer.TRUE: "parse_boolean",
+    tokenizer.FALSE: "parse_boolean",
+    tokenizer.LPAREN: "parse_grouped_expression",
+    tokenizer.IF: "parse_if_expression",
+    tokenizer.FUNCTION: "parse_function_literal",
+}
+infix_rules = {
+    tokenizer.EQ: "parse_infix_expression",
+    tokenizer.NOT_EQ: "parse_infix_expression",
+    tokenizer.LT: "parse_infix_expression",
+    tokenizer.GT: "parse_infix_expression",
+    tokenizer.PLUS: "parse_infix_expression",
+    tokenizer.MINUS: "parse_infix_expression",
+    tokenizer.SLASH: "parse_infix_expression",
+    tokenizer.ASTERISK: "parse_infix_expression",
+    tokenizer.LPAREN: "parse_call_expression",
+}
+
+ParseFunction = Callable[..., ast.Expression | None]
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """Parser error at the `[start, end)` source span of the token it was reported on"""
+
+    message: str
+    start: int
+    end: int
+
+    def line_column(self, source: str | tokenizer.LineIndex) -> tuple[int, int]:
+        """1-based line and column of `start`, only computed when asked for
+
+        Args:
+            source (str | tokenizer.LineIndex): source the diagnostic was reported on, or its
+                line index, which is worth sharing between the diagnostics of a source
+
+        Returns:
+            tuple[int, int]: line and column
+        """
+        lines = source if isinstance(source, tokenizer.LineIndex) else tokenizer.LineIndex(source)
+        return lines.position(self.start)
+
+    def moved(self, delta: int) -> "Diagnostic":
+        """Same diagnostic with its span moved by `delta` characters"""
+        if not delta:
+            return self
+        return Diagnostic(self.message, self.start + delta, self.end + delta)
+
+    def to_json(self, lines: tokenizer.LineIndex) -> dict:
+        line, column = lines.position(self.start)
+        return {
+            "message": self.message,
+            "start": self.start,
+            "end": self.end,
+            "line": line,
+            "column": column,
+        }
+
 
 @dataclass
 class Parser:
-    lex: lexer.Lexer
+    lex: tokenizer.TokenSource
     errors: list = field(default_factory=list)
-    prefix_parse_functions: dict[tokenizer.TokenType, Callable[[], ast.Expression | None]] = field(
-        init=False
-    )
-    infix_parse_functions: dict[
-        tokenizer.TokenType, Callable[[ast.Expression | None], ast.Expression | None]
-    ] = field(init=False)
-    enable_defer: bool = field(default=False)
+    # same errors with the span they were reported at
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+    # instruments this parser when given, untraced parsers carry no tracing code at all
+    tracer: TraceDeez | None = None
+    # same for profiling, counts tokens and rule calls and reports at the end of `parse_program`
+    profile: ParseProfile | None = None
+
+    # Built once per class from `prefix_rules` and `infix_rules`, a subclass overriding a rule
+    # dispatches to its override. Entries are plain functions taking the parser first.
+    prefix_parse_functions: ClassVar[
+        dict[tokenizer.TokenType, Callable[..., ast.Expression | None]]
+    ]
+    infix_parse_functions: ClassVar[dict[tokenizer.TokenType, Callable[..., ast.Expression | None]]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.build_dispatch_tables()
+
+    @classmethod
+    def build_dispatch_tables(cls) -> None:
+        cls.prefix_parse_functions = {
+            token_type: getattr(cls, rule) for token_type, rule in prefix_rules.items()
+        }
+        cls.infix_parse_functions = {
+            token_type: getattr(cls, rule) for token_type, rule in infix_rules.items()
+        }
 
     def __post_init__(self):
-        self.current = tokenizer.Token(tokenizer.ILLEGAL, "ILLEGAL")  # avoid type hinting warnings
-        self.peek = tokenizer.Token(tokenizer.ILLEGAL, "ILLEGAL")  # avoid type hinting warnings
-        self.next_token()
-        self.next_token()
+        if self.tracer is not None:
+            self.tracer.instrument(self)
+        if self.profile is not None:
+            self.profile.instrument(self)
+        self.reset(self.lex)
+
+    def reset(self, lex: tokenizer.TokenSource) -> None:
+        """Points the parser at a new token source, reusing it costs no more than the tokens"""
+        if self.profile is not None:
+            lex = self.profile.count_tokens(lex)
+        self.lex = lex
         self.errors = []
-        self.prefix_parse_functions = {}
-        self.infix_parse_functions = {}
-        self.register_prefix(tokenizer.IDENT, self.parse_identifier)
-        self.register_prefix(tokenizer.INT, self.parse_integer_literal)
-        self.register_prefix(tokenizer.BANG, self.parse_prefix_expression)
-        self.register_prefix(tokenizer.MINUS, self.parse_prefix_expression)
-        self.register_prefix(tokenizer.TRUE, self.parse_boolean)
-        self.register_prefix(tokenizer.FALSE, self.parse_boolean)
-        self.register_prefix(tokenizer.LPAREN, self.parse_grouped_expression)
-        self.register_prefix(tokenizer.IF, self.parse_if_expression)
-        self.register_prefix(tokenizer.FUNCTION, self.parse_function_literal)
-        self.register_infix(tokenizer.EQ, self.parse_infix_expression)
-        self.register_infix(tokenizer.NOT_EQ, self.parse_infix_expression)
-        self.register_infix(tokenizer.LT, self.parse_infix_expression)
-        self.register_infix(tokenizer.GT, self.parse_infix_expression)
-        self.register_infix(tokenizer.PLUS, self.parse_infix_expression)
-        self.register_infix(tokenizer.MINUS, self.parse_infix_expression)
-        self.register_infix(tokenizer.SLASH, self.parse_infix_expression)
-        self.register_infix(tokenizer.ASTERISK, self.parse_infix_expression)
-        self.register_infix(tokenizer.LPAREN, self.parse_call_expression)  # type: ignore
-        self.trace_deez = TraceDeez()
+        self.diagnostics = []
+        # set by the first error of a statement, the errors that follow until the parser
+        # synchronizes at the end of the statement are not reported
+        self.panicking = False
+        self.error_token: tokenizer.Token | None = None
+        self.current = lex.next_token()
+        self.peek = lex.next_token()
+
+    def parse(self, source: str) -> ast.Program:
+        """Parses a whole new source with this parser, errors are in `errors` afterwards"""
+        self.reset(lexer.TableLexer(source))
+        return self.parse_program()
 
     def next_token(self) -> None:
         self.current = self.peek
@@ -86,13 +206,36 @@ class Parser:
         return program
 
     def parse_statement(self) -> ast.Statement | None:
+        statement: ast.Statement | None
         match self.current.type:
             case tokenizer.LET:
-                return self.parse_let_statement()
+                statement = self.parse_let_statement()
             case tokenizer.RETURN:
-                return self.parse_return_statement()
+                statement = self.parse_return_statement()
             case _:
-                return self.parse_expression_statement()
+                statement = self.parse_expression_statement()
+        if self.panicking:
+            self.synchronize()
+        return statement
+
+    def synchronize(self) -> None:
+        """Skips the rest of a statement with an error, up to its `;` or up to the `}` closing the
+        block around it, braces opened in between are skipped whole"""
+        self.panicking = False
+        if self.is_current(tokenizer.RBRACE) and self.current is self.error_token:
+            # the error was on the closing brace itself, the block loop stops on it
+            return
+        depth = 0
+        while not self.is_current(tokenizer.EOF):
+            if self.is_current(tokenizer.LBRACE):
+                depth += 1
+            elif self.is_current(tokenizer.RBRACE) and depth:
+                depth -= 1
+            elif self.is_current(tokenizer.SEMICOLON) and not depth:
+                return
+            if not depth and (self.is_peek(tokenizer.RBRACE) or self.is_peek(tokenizer.EOF)):
+                return
+            self.next_token()
 
     def parse_let_statement(self) -> ast.LetStatement | None:
         statement = ast.LetStatement(self.current)
@@ -122,10 +265,6 @@ class Parser:
         return statement
 
     def parse_expression_statement(self) -> ast.ExpressionStatement | None:
-        if self.enable_defer:
-            defer(
-                self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_expression_statement")
-            )
         statement = ast.ExpressionStatement(self.current)
         statement.expression = self.parse_expression(Precedences.LOWEST)
 
@@ -135,13 +274,11 @@ class Parser:
         return statement
 
     def parse_expression(self, precedence: int) -> ast.Expression | None:
-        if self.enable_defer:
-            defer(self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_expression"))
         prefix = self.prefix_parse_functions.get(self.current.type)
         if prefix is None:
             self.no_prefix_parse_function_error(self.current.type)
             return None
-        left_expression = prefix()
+        left_expression = prefix(self)
 
         while not self.is_peek(tokenizer.SEMICOLON) and (precedence < self.peek_precedence()):
             infix = self.infix_parse_functions.get(self.peek.type)
@@ -149,7 +286,7 @@ class Parser:
                 return left_expression
 
             self.next_token()
-            left_expression = infix(left_expression)
+            left_expression = infix(self, left_expression)
 
         return left_expression
 
@@ -173,25 +310,23 @@ class Parser:
         return expression
 
     def parse_integer_literal(self) -> ast.Expression | None:
-        if self.enable_defer:
-            defer(self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_integer_literal"))
         integer_literal = ast.IntegerLiteral(self.current)
 
         try:
             integer_value = int(self.current.literal)
         except ValueError:
-            message = f"could not parse {self.current.literal} as int"
-            self.errors.append(message)
+            self.error(f"could not parse {self.current.literal} as int", self.current)
             return None
 
         integer_literal.value = integer_value
         return integer_literal
 
     def parse_function_literal(self) -> ast.Expression | None:
+        token = self.current
         if not self.expected_peek(tokenizer.LPAREN):
             return None
 
-        fn_literal = ast.FunctionLiteral(self.current, self.parse_function_parameters())
+        fn_literal = ast.FunctionLiteral(token, self.parse_function_parameters())
 
         if not self.expected_peek(tokenizer.LBRACE):
             return None
@@ -243,8 +378,6 @@ class Parser:
         return args
 
     def parse_prefix_expression(self) -> ast.Expression:
-        if self.enable_defer:
-            defer(self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_prefix_expression"))
         expression = ast.PrefixExpression(self.current, self.current.literal)
         self.next_token()
         expression.right = self.parse_expression(Precedences.PREFIX)
@@ -252,8 +385,6 @@ class Parser:
         return expression
 
     def parse_infix_expression(self, left: ast.Expression | None) -> ast.Expression:
-        if self.enable_defer:
-            defer(self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_infix_expression"))
         expression = ast.InfixExpression(self.current, left, self.current.literal)
         precedence = self.current_precedence()
         self.next_token()
@@ -262,8 +393,6 @@ class Parser:
         return expression
 
     def parse_if_expression(self) -> ast.Expression | None:
-        if self.enable_defer:
-            defer(self.trace_deez.end_trace, self.trace_deez.begin_trace("parse_if_expression"))
         expression = ast.IfExpression(self.current)
 
         if not self.expected_peek(tokenizer.LPAREN):
@@ -297,6 +426,10 @@ class Parser:
             statement = self.parse_statement()
             if statement is not None:
                 block.statements.append(statement)
+            if self.is_current(tokenizer.RBRACE) and self.current is self.error_token:
+                # this block owns the brace, enclosing blocks must not stop on it again
+                self.error_token = None
+                break
             self.next_token()
 
         return block
@@ -317,37 +450,31 @@ class Parser:
 
     def peek_errors(self, token_type: tokenizer.TokenType) -> None:
         message = f"expected next token to be '{token_type}', got '{self.peek.type}' instead"
-        self.errors.append(message)
+        self.error(message, self.peek)
 
     def get_errors(self) -> list[str]:
         return self.errors.copy()
 
-    def register_prefix(
-        self, token_type: tokenizer.TokenType, fn: Callable[[], ast.Expression | None]
-    ):
-        self.prefix_parse_functions[token_type] = fn
-
-    def register_infix(
-        self,
-        token_type: tokenizer.TokenType,
-        fn: Callable[[ast.Expression | None], ast.Expression | None],
-    ):
-        self.infix_parse_functions[token_type] = fn
+    def get_diagnostics(self) -> list[Diagnostic]:
+        return self.diagnostics.copy()
 
     def no_prefix_parse_function_error(self, token_type: tokenizer.TokenType):
-        message = f"no prefix parse function {token_type} found"
+        self.error(f"no prefix parse function {token_type} found", self.current)
+
+    def error(self, message: str, token: tokenizer.Token) -> None:
+        """Reports an error on a token, unless it follows another one in the same statement"""
+        if self.panicking:
+            return
+        self.panicking = True
+        self.error_token = token
         self.errors.append(message)
+        self.diagnostics.append(Diagnostic(message, token.start, token.start + len(token.literal)))
 
     def peek_precedence(self) -> int:
-        return (
-            Precedences.LOWEST
-            if not precedences.get(self.peek.type)
-            else precedences[self.peek.type]
-        )
+        return precedence_table[self.peek.type]
 
     def current_precedence(self) -> int:
-        return (
-            Precedences.LOWEST
-            if not precedences.get(self.current.type)
-            else precedences[self.current.type]
-        )
+        return precedence_table[self.current.type]
+
+
+Parser.build_dispatch_tables()
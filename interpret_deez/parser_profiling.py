@@ -0,0 +1,107 @@
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from interpret_deez import tokenizer
+from interpret_deez.parser_tracing import instrumented_class
+
+
+@dataclass
+class CountingLexer:
+    """Passes the tokens of a lexer through, counting them per type"""
+
+    lex: tokenizer.TokenSource
+    counts: Counter[tokenizer.TokenType]
+
+    def next_token(self) -> tokenizer.Token:
+        token = self.lex.next_token()
+        self.counts[token.type] += 1
+        return token
+
+
+@dataclass
+class ParseProfile:
+    """Counters and per-rule timings of a profiled parser
+
+    `calls` counts every `parse_*` call by the type of the current token, for the prefix and
+    infix parse functions that is the token they were dispatched on. `cumulative` is the time
+    spent in a rule including the rules it called, recursive calls counted once, `own` the time
+    spent in the rule itself. Times are `time.perf_counter_ns` nanoseconds.
+    """
+
+    tokens: Counter[tokenizer.TokenType] = field(default_factory=Counter)
+    calls: Counter[tuple[str, tokenizer.TokenType]] = field(default_factory=Counter)
+    cumulative: Counter[str] = field(default_factory=Counter)
+    own: Counter[str] = field(default_factory=Counter)
+    # where the report goes at the end of `parse_program`, standard error by default
+    out: IO[str] | None = None
+    # dispatch table entries of the profiled parser, for the report
+    prefix_rules: dict[tokenizer.TokenType, str] = field(default_factory=dict)
+    infix_rules: dict[tokenizer.TokenType, str] = field(default_factory=dict)
+    # time spent in the children of each running rule
+    children: list[int] = field(default_factory=list)
+    running: Counter[str] = field(default_factory=Counter)
+
+    def count_tokens(self, lex: tokenizer.TokenSource) -> CountingLexer:
+        return CountingLexer(lex, self.tokens)
+
+    def run(self, rule: str, function: Callable, parser: Any, args: tuple) -> Any:
+        """Calls a rule of a profiled parser, counting and timing it"""
+        children, running = self.children, self.running
+        self.calls[rule, parser.current.type] += 1
+        running[rule] += 1
+        children.append(0)
+        start = time.perf_counter_ns()
+        try:
+            result = function(parser, *args)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.own[rule] += elapsed - children.pop()
+            if children:
+                children[-1] += elapsed
+            running[rule] -= 1
+            if not running[rule]:
+                self.cumulative[rule] += elapsed
+        if rule == "parse_program" and not children:
+            self.report(self.out or sys.stderr)
+        return result
+
+    def instrument(self, parser: Any) -> None:
+        """Switches a parser to a subclass whose `parse_*` methods go through `run`"""
+        cls = instrumented_class(type(parser), "Profiled", "profile")
+        self.prefix_rules = {t: f.__name__ for t, f in cls.prefix_parse_functions.items()}
+        self.infix_rules = {t: f.__name__ for t, f in cls.infix_parse_functions.items()}
+        parser.__class__ = cls
+
+    def rule_calls(self) -> Counter[str]:
+        totals: Counter[str] = Counter()
+        for (rule, _), count in self.calls.items():
+            totals[rule] += count
+        return totals
+
+    def report(self, out: IO[str]) -> None:
+        """Writes rules by cumulative time, dispatched parse functions and tokens by count"""
+        totals = self.rule_calls()
+        out.write(f"{'rule':<28} {'calls':>10} {'cumulative ms':>14} {'own ms':>10}\n")
+        for rule, nanoseconds in self.cumulative.most_common():
+            out.write(
+                f"{rule:<28} {totals[rule]:>10,} {nanoseconds / 1e6:>14.3f} "
+                f"{self.own[rule] / 1e6:>10.3f}\n"
+            )
+
+        dispatched = [
+            (self.calls[rule, token_type], kind, token_type, rule)
+            for kind, rules in (("prefix", self.prefix_rules), ("infix", self.infix_rules))
+            for token_type, rule in rules.items()
+            if self.calls[rule, token_type]
+        ]
+        out.write(f"\n{'dispatch':<40} {'calls':>10}\n")
+        for count, kind, token_type, rule in sorted(dispatched, reverse=True):
+            out.write(f"{f'{kind} {token_type.name} {rule}':<40} {count:>10,}\n")
+
+        out.write(f"\n{'token':<28} {'count':>10}\n")
+        for token_type, count in self.tokens.most_common():
+            out.write(f"{token_type.name:<28} {count:>10,}\n")
@@ -1,28 +1,113 @@
-from dataclasses import dataclass
+import functools
+import json
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+
+@functools.cache
+def instrumented_class(cls: type, prefix: str, attribute: str) -> type:
+    """Subclass of a parser class running every `parse_*` method through the `run` method of the
+    parser attribute `attribute`, the dispatch tables of the subclass are built from these.
+    Parsers of the original class are not affected at all."""
+
+    def instrumented_rule(rule: str, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def instrumented(parser, *args):
+            return getattr(parser, attribute).run(rule, function, parser, args)
+
+        return instrumented
+
+    rules = {
+        name: instrumented_rule(name, getattr(cls, name))
+        for name in dir(cls)
+        if name.startswith("parse_")
+    }
+    return type(f"{prefix}{cls.__name__}", (cls,), rules)
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    rule: str
+    # source offset of the token the rule started at
+    token: int
+    depth: int
+    begin: int
+    duration: int = 0
 
 
 @dataclass
 class TraceDeez:
-    trace_level: int = 0
-    place_holder: str = "\t"
+    """Records a structured event for every grammar rule a traced parser runs
+
+    Events are kept in the order the rules started, each with its nesting depth, so the call
+    tree can be rebuilt from the buffer alone. Times are `time.perf_counter_ns` nanoseconds.
+    """
+
+    events: list[TraceEvent] = field(default_factory=list)
+    depth: int = 0
+
+    def run(self, rule: str, function: Callable, parser: Any, args: tuple) -> Any:
+        """Calls a rule of a traced parser, recording its event"""
+        event = TraceEvent(rule, parser.current.start, self.depth, time.perf_counter_ns())
+        self.events.append(event)
+        self.depth += 1
+        try:
+            return function(parser, *args)
+        finally:
+            self.depth -= 1
+            event.duration = time.perf_counter_ns() - event.begin
 
-    def ident_level(self) -> str:
-        return self.place_holder * (self.trace_level - 1)
+    def instrument(self, parser: Any) -> None:
+        """Switches a parser to a subclass whose `parse_*` methods go through `run`"""
+        parser.__class__ = instrumented_class(type(parser), "Traced", "tracer")
 
-    def printer(self, message: str):
-        print(f"{self.ident_level()}{message}")
+    def to_json(self) -> list[dict]:
+        """Events in the Trace Event Format, loads in chrome://tracing and Perfetto"""
+        return [
+            {
+                "name": event.rule,
+                "ph": "X",
+                "ts": event.begin / 1000,
+                "dur": event.duration / 1000,
+                "pid": 0,
+                "tid": 0,
+                "args": {"token": event.token, "depth": event.depth},
+            }
+            for event in self.events
+        ]
 
-    def increase_ident(self):
-        self.trace_level = self.trace_level + 1
+    def dump_json(self, out: IO[str]) -> None:
+        json.dump({"traceEvents": self.to_json()}, out)
 
-    def decrease_ident(self):
-        self.trace_level = self.trace_level - 1
+    def folded(self) -> list[str]:
+        """Self time per call stack, one `rule;rule;rule nanoseconds` line each, the input
+        format of flamegraph.pl and speedscope"""
+        stacks: Counter[str] = Counter()
+        path: list[str] = []
+        for event in self.events:
+            del path[event.depth :]
+            path.append(event.rule)
+            stacks[";".join(path)] += event.duration
+            # the parent only keeps the time spent outside of its children
+            if event.depth:
+                stacks[";".join(path[:-1])] -= event.duration
+        return [f"{stack} {nanoseconds}" for stack, nanoseconds in stacks.items()]
 
-    def begin_trace(self, message: str) -> str:
-        self.increase_ident()
-        self.printer(f"BEGIN {message}")
-        return message
+    def dump_folded(self, out: IO[str]) -> None:
+        out.writelines(f"{line}\n" for line in self.folded())
 
-    def end_trace(self, message: str):
-        self.printer(f"END {message}")
-        self.decrease_ident()
+    def dump_tree(self, out: IO[str]) -> None:
+        """Indented BEGIN/END view of the rules, as the tracer used to print it"""
+        ends: list[TraceEvent] = []
+        for event in self.events:
+            while len(ends) > event.depth:
+                closed = ends.pop()
+                out.write(f"{'\t' * closed.depth}END {closed.rule}\n")
+            out.write(f"{'\t' * event.depth}BEGIN {event.rule}\n")
+            ends.append(event)
+        while ends:
+            closed = ends.pop()
+            out.write(f"{'\t' * closed.depth}END {closed.rule}\n")
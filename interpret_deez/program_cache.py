@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from interpret_deez import ast, lexer, parser
+
+type CachedProgram = tuple[ast.Program, tuple[str, ...], tuple[parser.Diagnostic, ...]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+@dataclass
+class ProgramCache:
+    """Thread safe, in memory LRU cache of parsed programs keyed by source
+
+    Every caller asking for the same source shares one result. Its statements, arguments and
+    parameters are tuples (see `freeze`) and so are errors and diagnostics, so no caller can add
+    or remove nodes for the others. The program is a regular `ast.Program` that every backend
+    runs. Entries older than `ttl` seconds are parsed again, `ttl=None` keeps them until they are
+    evicted.
+    """
+
+    capacity: int = 1024
+    ttl: float | None = None
+    clock: Callable[[], float] = time.monotonic
+    stats: CacheStats = field(default_factory=CacheStats)
+    entries: OrderedDict[str, tuple[float, CachedProgram]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def parse(self, source: str) -> CachedProgram:
+        """Returns the cached parse result of the source, parsing it on a miss
+
+        Args:
+            source (str): program source
+
+        Returns:
+            CachedProgram: shared, immutable program, its parser errors and their diagnostics
+        """
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(source)
+            if entry is not None:
+                created, result = entry
+                if self.ttl is None or now - created < self.ttl:
+                    self.entries.move_to_end(source)
+                    self.stats.hits += 1
+                    return result
+                del self.entries[source]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+
+        # parsing happens outside the lock so a slow parse does not block cache hits
+        pars = parser.Parser(lexer.TableLexer(source))
+        program = freeze(pars.parse_program())
+        result = program, tuple(pars.get_errors()), tuple(pars.get_diagnostics())
+
+        with self.lock:
+            self.entries[source] = (now, result)
+            self.entries.move_to_end(source)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def freeze(program: ast.Program) -> ast.Program:
+    """Turns every child list of a parsed tree into a tuple, in place
+
+    Iterative, so trees nested deeper than the recursion limit are frozen too.
+
+    Args:
+        program (ast.Program): program built by `parser.Parser`
+
+    Returns:
+        ast.Program: the same program
+    """
+    stack: list[ast.Node | ast.Program] = [program]
+    while stack:
+        node = stack.pop()
+        for name, value in vars(node).items():
+            if type(value) is list:
+                value = tuple(value)
+                setattr(node, name, value)
+            if type(value) is tuple:
+                stack.extend(child for child in value if isinstance(child, ast.Node))
+            elif isinstance(value, ast.Node):
+                stack.append(value)
+    return program
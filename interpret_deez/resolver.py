@@ -0,0 +1,179 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from interpret_deez import ast
+
+
+@dataclass(frozen=True)
+class Binding:
+    """Where a name lives: `depth` function scopes out from the one using it, at `slot`"""
+
+    name: str
+    depth: int
+    slot: int
+
+
+@dataclass
+class Scope:
+    # slot of every name bound in the scope, parameters first then `let`s in source order
+    slots: dict[str, int]
+    # names bound so far while walking the scope, code before a `let` does not see it
+    defined: set[str] = field(default_factory=set)
+    function: ast.FunctionLiteral | None = None
+
+
+@dataclass
+class Resolution:
+    """Side table of a resolved program, nodes are keyed by `id` so the tree is left untouched
+
+    Only valid while the program it was built for is alive.
+    """
+
+    bindings: dict[int, Binding] = field(default_factory=dict)
+    # free variables of each function literal, as bindings seen from the scope creating it
+    free_variables: dict[int, list[Binding]] = field(default_factory=dict)
+    # slots each function needs, the program's under `id(program)`
+    slot_counts: dict[int, int] = field(default_factory=dict)
+    unresolved: list[ast.Identifier] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def lookup(self, identifier: ast.Identifier) -> Binding | None:
+        return self.bindings.get(id(identifier))
+
+    def free(self, function: ast.FunctionLiteral) -> list[Binding]:
+        return self.free_variables.get(id(function), [])
+
+
+def resolve(program: ast.Program) -> Resolution:
+    """Resolves every identifier of a program to a (depth, slot) pair
+
+    Scopes follow the evaluator: the program and each function call get one, `if` blocks bind in
+    the scope around them. Inside a scope a name is visible from its `let` on, names of enclosing
+    scopes are visible wherever they are bound since a function only runs when it is called.
+
+    Args:
+        program (ast.Program): parsed program
+
+    Returns:
+        Resolution: bindings, free variables and slot counts, plus the names bound nowhere
+    """
+    resolver = Resolver()
+    scope = Scope(collect_slots([], program.statements))
+    resolver.scopes.append(scope)
+    for statement in program.statements:
+        resolver.visit(statement)
+    resolver.resolution.slot_counts[id(program)] = len(scope.slots)
+    return resolver.resolution
+
+
+@dataclass
+class Resolver:
+    scopes: list[Scope] = field(default_factory=list)
+    resolution: Resolution = field(default_factory=Resolution)
+
+    def visit(self, node: ast.Node | None) -> None:
+        match node:
+            case ast.LetStatement():
+                self.visit(node.value)
+                if node.name is not None:
+                    self.define(node.name)
+            case ast.Identifier():
+                self.use(node)
+            case ast.FunctionLiteral():
+                self.visit_function(node)
+            case _:
+                for child in children(node):
+                    self.visit(child)
+
+    def visit_function(self, function: ast.FunctionLiteral) -> None:
+        parameters = function.parameters or []
+        body = function.body.statements if function.body else []
+        scope = Scope(collect_slots(parameters, body), function=function)
+        self.scopes.append(scope)
+        self.resolution.free_variables[id(function)] = []
+        for parameter in parameters:
+            self.define(parameter)
+        for statement in body:
+            self.visit(statement)
+        self.scopes.pop()
+        self.resolution.slot_counts[id(function)] = len(scope.slots)
+
+    def define(self, name: ast.Identifier) -> None:
+        scope = self.scopes[-1]
+        scope.defined.add(name.value)
+        self.resolution.bindings[id(name)] = Binding(name.value, 0, scope.slots[name.value])
+
+    def use(self, identifier: ast.Identifier) -> None:
+        name = identifier.value
+        if name in self.scopes[-1].defined:
+            binding = Binding(name, 0, self.scopes[-1].slots[name])
+            self.resolution.bindings[id(identifier)] = binding
+            return
+
+        for depth, scope in enumerate(reversed(self.scopes[:-1]), 1):
+            if name in scope.slots:
+                self.resolution.bindings[id(identifier)] = Binding(name, depth, scope.slots[name])
+                self.capture(name, depth, scope.slots[name])
+                return
+
+        self.resolution.unresolved.append(identifier)
+        self.resolution.errors.append(f"identifier not found: {name}")
+
+    def capture(self, name: str, depth: int, slot: int) -> None:
+        """Marks a name of a function scope free in every function between it and the use"""
+        if depth == len(self.scopes) - 1:
+            # globals stay reachable from anywhere and are not captured
+            return
+        for level in range(1, depth + 1):
+            function = self.scopes[-level].function
+            free = self.resolution.free_variables[id(function)]
+            binding = Binding(name, depth - level, slot)
+            if binding not in free:
+                free.append(binding)
+
+
+def collect_slots(
+    parameters: list[ast.Identifier], statements: list[ast.Statement]
+) -> dict[str, int]:
+    slots: dict[str, int] = {}
+    for parameter in parameters:
+        slots.setdefault(parameter.value, len(slots))
+    for statement in statements:
+        collect_lets(statement, slots)
+    return slots
+
+
+def collect_lets(node: ast.Node | None, slots: dict[str, int]) -> None:
+    """Adds the names bound by `let`s in a scope, nested functions have scopes of their own"""
+    match node:
+        case ast.FunctionLiteral():
+            return
+        case ast.LetStatement():
+            collect_lets(node.value, slots)
+            if node.name is not None:
+                slots.setdefault(node.name.value, len(slots))
+        case _:
+            for child in children(node):
+                collect_lets(child, slots)
+
+
+def children(node: ast.Node | None) -> Iterator[ast.Node | None]:
+    match node:
+        case ast.ExpressionStatement():
+            yield node.expression
+        case ast.ReturnStatement():
+            yield node.return_value
+        case ast.BlockStatement():
+            yield from node.statements
+        case ast.PrefixExpression():
+            yield node.right
+        case ast.InfixExpression():
+            yield node.left
+            yield node.right
+        case ast.IfExpression():
+            yield node.condition
+            yield node.consequence
+            yield node.alternative
+        case ast.CallExpression():
+            yield node.function
+            yield from node.arguments or ()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+type SymbolScope = str
+
+GLOBAL_SCOPE = "GLOBAL"
+LOCAL_SCOPE = "LOCAL"
+FREE_SCOPE = "FREE"
+FUNCTION_SCOPE = "FUNCTION"
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    scope: SymbolScope
+    index: int
+
+
+@dataclass
+class SymbolTable:
+    """Resolves let bindings and parameters to slot indexes of their scope"""
+
+    outer: SymbolTable | None = None
+    store: dict[str, Symbol] = field(default_factory=dict)
+    num_definitions: int = 0
+    free_symbols: list[Symbol] = field(default_factory=list)
+
+    def define(self, name: str) -> Symbol:
+        scope = GLOBAL_SCOPE if self.outer is None else LOCAL_SCOPE
+        existing = self.store.get(name)
+        if scope == GLOBAL_SCOPE and existing is not None and existing.scope == GLOBAL_SCOPE:
+            # a global bound again keeps its slot, functions read it when called, not when made
+            return existing
+        symbol = Symbol(name, scope, self.num_definitions)
+        self.store[name] = symbol
+        self.num_definitions += 1
+        return symbol
+
+    def define_function_name(self, name: str) -> Symbol:
+        symbol = Symbol(name, FUNCTION_SCOPE, 0)
+        self.store[name] = symbol
+        return symbol
+
+    def define_free(self, original: Symbol) -> Symbol:
+        self.free_symbols.append(original)
+        symbol = Symbol(original.name, FREE_SCOPE, len(self.free_symbols) - 1)
+        self.store[original.name] = symbol
+        return symbol
+
+    def resolve(self, name: str) -> Symbol | None:
+        symbol = self.store.get(name)
+        if symbol is not None or self.outer is None:
+            return symbol
+
+        symbol = self.outer.resolve(name)
+        if symbol is None or symbol.scope == GLOBAL_SCOPE:
+            return symbol
+        # locals of an enclosing function are captured as free variables
+        return self.define_free(symbol)
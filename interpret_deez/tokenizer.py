@@ -1,68 +1,276 @@
-from dataclasses import dataclass
+import enum
+import itertools
+from array import array
+from bisect import bisect_right
+from collections.abc import Buffer
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Protocol
 
-type TokenType = str
+
+class TokenType(enum.IntEnum):
+    """Token kinds as small ints, `str()` gives back the name used in error messages"""
+
+    ILLEGAL = 0
+    EOF = 1
+
+    # Identifiers + literals
+    IDENT = 2  # add, foobar, x, y, ...
+    INT = 3  # 123456789
+
+    # Operators
+    ASSIGN = 4
+    PLUS = 5
+    MINUS = 6
+    BANG = 7
+    ASTERISK = 8
+    SLASH = 9
+
+    LT = 10
+    GT = 11
+    EQ = 12
+    NOT_EQ = 13
+
+    # Delimiters
+    COMMA = 14
+    SEMICOLON = 15
+    LPAREN = 16
+    RPAREN = 17
+    LBRACE = 18
+    RBRACE = 19
+    LBRACKET = 20
+    RBRACKET = 21
+
+    # Keywords
+    FUNCTION = 22
+    LET = 23
+    TRUE = 24
+    FALSE = 25
+    IF = 26
+    ELSE = 27
+    RETURN = 28
+
+    def __str__(self) -> str:
+        return token_names[self]
+
+    def __format__(self, format_spec: str) -> str:
+        return format(token_names[self], format_spec)
+
+
+token_names: dict[TokenType, str] = {
+    TokenType.ILLEGAL: "ILLEGAL",
+    TokenType.EOF: "EOF",
+    TokenType.IDENT: "IDENT",
+    TokenType.INT: "INT",
+    TokenType.ASSIGN: "=",
+    TokenType.PLUS: "+",
+    TokenType.MINUS: "-",
+    TokenType.BANG: "!",
+    TokenType.ASTERISK: "*",
+    TokenType.SLASH: "/",
+    TokenType.LT: "<",
+    TokenType.GT: ">",
+    TokenType.EQ: "==",
+    TokenType.NOT_EQ: "!=",
+    TokenType.COMMA: ",",
+    TokenType.SEMICOLON: ";",
+    TokenType.LPAREN: "(",
+    TokenType.RPAREN: ")",
+    TokenType.LBRACE: "{",
+    TokenType.RBRACE: "}",
+    TokenType.LBRACKET: "[",
+    TokenType.RBRACKET: "]",
+    TokenType.FUNCTION: "FUNCTION",
+    TokenType.LET: "LET",
+    TokenType.TRUE: "TRUE",
+    TokenType.FALSE: "FALSE",
+    TokenType.IF: "IF",
+    TokenType.ELSE: "ELSE",
+    TokenType.RETURN: "RETURN",
+}
+
+# Kind int -> TokenType, cheaper than calling `TokenType(kind)`
+TOKEN_TYPES: tuple[TokenType, ...] = tuple(TokenType)
 
 
 @dataclass
 class Token:
     type: TokenType
     literal: str
+    # offset of the first character in the source, -1 when unknown
+    start: int = field(default=-1, compare=False, repr=False)
+
+
+class TokenSource(Protocol):
+    def next_token(self) -> Token: ...
+
+
+@dataclass
+class LineIndex:
+    """Maps source offsets, like `Token.start`, to 1-based (line, column) pairs
+
+    The offsets where lines start are collected the first time a position is asked for, lexing
+    never pays for them. Each lookup is then a binary search. For UTF-8 buffers offsets and
+    columns are in bytes.
+    """
+
+    source: str | Buffer
+    starts: array | None = field(default=None, repr=False)
+
+    def line_starts(self) -> array:
+        if self.starts is None:
+            source = self.source
+            newline = "\n" if isinstance(source, str) else b"\n"
+            find = source.find if hasattr(source, "find") else bytes(source).find  # type: ignore
+            starts = array("q", [0])
+            index = find(newline)
+            while index != -1:
+                starts.append(index + 1)
+                index = find(newline, index + 1)
+            self.starts = starts
+        return self.starts
+
+    def position(self, offset: int) -> tuple[int, int]:
+        """Line and column of a source offset
+
+        Args:
+            offset (int): offset into the source, the end of the source included
+
+        Returns:
+            tuple[int, int]: 1-based line and column
+        """
+        starts = self.line_starts()
+        line = bisect_right(starts, offset)
+        return line, offset - starts[line - 1] + 1
 
+    def line(self, number: int) -> str | Buffer:
+        """Text of a 1-based line without its newline"""
+        starts = self.line_starts()
+        end = starts[number] - 1 if number < len(starts) else len(self.source)  # type: ignore
+        return self.source[starts[number - 1] : end]  # type: ignore
 
-ILLEGAL = "ILLEGAL"
-EOF = "EOF"
+
+ILLEGAL = TokenType.ILLEGAL
+EOF = TokenType.EOF
 
 # Identifiers + literals
-IDENT = "IDENT"  # add, foobar, x, y, ...
-INT = "INT"  # 123456789
+IDENT = TokenType.IDENT
+INT = TokenType.INT
 
 # Operators
-ASSIGN = "="
-PLUS = "+"
-MINUS = "-"
-BANG = "!"
-ASTERISK = "*"
-SLASH = "/"
-
-LT = "<"
-GT = ">"
-EQ = "=="
-NOT_EQ = "!="
+ASSIGN = TokenType.ASSIGN
+PLUS = TokenType.PLUS
+MINUS = TokenType.MINUS
+BANG = TokenType.BANG
+ASTERISK = TokenType.ASTERISK
+SLASH = TokenType.SLASH
+
+LT = TokenType.LT
+GT = TokenType.GT
+EQ = TokenType.EQ
+NOT_EQ = TokenType.NOT_EQ
 
 # Delimiters
-COMMA = ","
-SEMICOLON = ";"
-LPAREN = "("
-RPAREN = ")"
-LBRACE = "{"
-RBRACE = "}"
-LBRACKET = "["
-RBRACKET = "]"
+COMMA = TokenType.COMMA
+SEMICOLON = TokenType.SEMICOLON
+LPAREN = TokenType.LPAREN
+RPAREN = TokenType.RPAREN
+LBRACE = TokenType.LBRACE
+RBRACE = TokenType.RBRACE
+LBRACKET = TokenType.LBRACKET
+RBRACKET = TokenType.RBRACKET
 
 # Keywords
-FUNCTION = "FUNCTION"
-LET = "LET"
-TRUE = "TRUE"
-FALSE = "FALSE"
-IF = "IF"
-ELSE = "ELSE"
-RETURN = "RETURN"
+FUNCTION = TokenType.FUNCTION
+LET = TokenType.LET
+TRUE = TokenType.TRUE
+FALSE = TokenType.FALSE
+IF = TokenType.IF
+ELSE = TokenType.ELSE
+RETURN = TokenType.RETURN
 
 
-def keywords(name: str) -> TokenType | None:
-    _keywords = {
-        "fn": FUNCTION,
-        "let": LET,
-        "true": TRUE,
-        "false": FALSE,
-        "if": IF,
-        "else": ELSE,
-        "return": RETURN,
+@dataclass
+class TokenBuffer:
+    """Columnar token stream over a source string
+
+    Token kinds are `TokenType` ints and each token only keeps its `[start, end)` offsets
+    into `source`, literals are sliced out when asked for. The buffer always ends with an EOF token
+    and implements `next_token` so the parser can consume it like a lexer.
+
+    `source` can also be UTF-8 bytes (`bytes`, `mmap`, `memoryview`), offsets are then byte
+    offsets and literals are decoded when sliced out.
+    """
+
+    source: str | Buffer
+    kinds: array = field(default_factory=lambda: array("B"))
+    starts: array = field(default_factory=lambda: array("I"))
+    ends: array = field(default_factory=lambda: array("I"))
+    cursor: int = 0
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def append(self, kind: int, start: int, end: int) -> None:
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.kinds[index]]
+
+    def literal(self, index: int) -> str:
+        if self.kinds[index] == EOF:
+            return ""
+        literal = self.source[self.starts[index] : self.ends[index]]
+        if isinstance(literal, str):
+            return literal
+        return str(literal, "utf-8", "replace")
+
+    def token(self, index: int) -> Token:
+        return Token(self.type(index), self.literal(index), self.starts[index])
+
+    def next_token(self) -> Token:
+        # keep returning EOF once the stream is exhausted, like the lexers do
+        index = min(self.cursor, len(self.kinds) - 1)
+        self.cursor += 1
+        return self.token(index)
+
+    def rewind(self) -> None:
+        self.cursor = 0
+
+
+def _case_variants(word: str) -> list[str]:
+    return ["".join(chars) for chars in itertools.product(*((c, c.upper()) for c in word))]
+
+
+# Keywords are case insensitive, every casing is precomputed so a lookup never lowercases
+_keywords: MappingProxyType[str, TokenType] = MappingProxyType(
+    {
+        variant: token_type
+        for name, token_type in (
+            ("fn", FUNCTION),
+            ("let", LET),
+            ("true", TRUE),
+            ("false", FALSE),
+            ("if", IF),
+            ("else", ELSE),
+            ("return", RETURN),
+        )
+        for variant in _case_variants(name)
     }
-    return _keywords.get(name.lower(), None)
+)
+
+
+# Same keywords for tokenizers working on UTF-8 bytes
+byte_keywords: MappingProxyType[bytes, TokenType] = MappingProxyType(
+    {variant.encode(): token_type for variant, token_type in _keywords.items()}
+)
+
+
+def keywords(name: str) -> TokenType | None:
+    return _keywords.get(name)
 
 
 def lookup_identfier(ident: str) -> TokenType:
-    if (token_type := keywords(ident)) is not None:
-        return token_type
-    return IDENT
+    return _keywords.get(ident, IDENT)
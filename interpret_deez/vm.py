@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+
+from interpret_deez import evaluator, objects
+from interpret_deez.bytecode import Opcode
+from interpret_deez.compiler import Bytecode
+from interpret_deez.evaluator import or_null
+
+STACK_SIZE = 1 << 16
+GLOBALS_SIZE = 1 << 16
+MAX_FRAMES = 1 << 14
+
+# Plain ints, comparing against them is cheaper than against enum members
+CONSTANT = Opcode.CONSTANT.value
+POP = Opcode.POP.value
+ADD = Opcode.ADD.value
+SUB = Opcode.SUB.value
+MUL = Opcode.MUL.value
+DIV = Opcode.DIV.value
+TRUE = Opcode.TRUE.value
+FALSE = Opcode.FALSE.value
+EQUAL = Opcode.EQUAL.value
+NOT_EQUAL = Opcode.NOT_EQUAL.value
+GREATER_THAN = Opcode.GREATER_THAN.value
+LESS_THAN = Opcode.LESS_THAN.value
+MINUS = Opcode.MINUS.value
+BANG = Opcode.BANG.value
+JUMP_NOT_TRUTHY = Opcode.JUMP_NOT_TRUTHY.value
+JUMP = Opcode.JUMP.value
+NULL = Opcode.NULL.value
+GET_GLOBAL = Opcode.GET_GLOBAL.value
+SET_GLOBAL = Opcode.SET_GLOBAL.value
+CALL = Opcode.CALL.value
+RETURN_VALUE = Opcode.RETURN_VALUE.value
+RETURN = Opcode.RETURN.value
+GET_LOCAL = Opcode.GET_LOCAL.value
+SET_LOCAL = Opcode.SET_LOCAL.value
+CLOSURE = Opcode.CLOSURE.value
+GET_FREE = Opcode.GET_FREE.value
+CURRENT_CLOSURE = Opcode.CURRENT_CLOSURE.value
+
+binary_opcodes = {
+    ADD: "+",
+    SUB: "-",
+    MUL: "*",
+    DIV: "/",
+    EQUAL: "==",
+    NOT_EQUAL: "!=",
+    GREATER_THAN: ">",
+    LESS_THAN: "<",
+}
+
+
+class VMError(Exception):
+    pass
+
+
+@dataclass
+class Frame:
+    closure: objects.Closure
+    base_pointer: int
+    ip: int = 0
+
+
+@dataclass
+class VM:
+    """Stack machine running `compiler.Bytecode`
+
+    Pass the `globals` of a previous VM to keep global bindings across runs, like a REPL does.
+    """
+
+    bytecode: Bytecode
+    # globals not set yet, like one bound in a branch not taken, read as NULL
+    globals: list[objects.Object] = field(default_factory=lambda: [objects.NULL] * GLOBALS_SIZE)
+    stack: list[objects.Object | None] = field(default_factory=lambda: [None] * STACK_SIZE)
+    sp: int = 0
+
+    def last_popped_stack_elem(self) -> objects.Object | None:
+        return self.stack[self.sp]
+
+    def run(self) -> None:
+        main = objects.Closure(objects.CompiledFunction(self.bytecode.instructions))
+        try:
+            self.sp = self.execute([Frame(main, 0)])
+        except IndexError as error:
+            # pushes are not bounds checked, running off the preallocated stack lands here
+            raise VMError("stack overflow") from error
+
+    def execute(self, frames: list[Frame]) -> int:
+        # The hot loop keeps the current frame state in locals and only writes it back to the
+        # frame on calls
+        stack = self.stack
+        globals_ = self.globals
+        constants = self.bytecode.constants
+        true, false, null = objects.TRUE, objects.FALSE, objects.NULL
+        Integer = objects.Integer
+
+        frame = frames[-1]
+        closure = frame.closure
+        instructions = closure.fn.instructions
+        end = len(instructions)
+        base_pointer = frame.base_pointer
+        ip = 0
+        sp = self.sp
+
+        while ip < end:
+            op = instructions[ip]
+
+            if op == GET_LOCAL:
+                stack[sp] = stack[base_pointer + instructions[ip + 1]]
+                sp += 1
+                ip += 2
+            elif op == CONSTANT:
+                stack[sp] = constants[(instructions[ip + 1] << 8) | instructions[ip + 2]]
+                sp += 1
+                ip += 3
+            elif op == GET_GLOBAL:
+                stack[sp] = globals_[(instructions[ip + 1] << 8) | instructions[ip + 2]]
+                sp += 1
+                ip += 3
+            elif op in (ADD, SUB, MUL):
+                right = stack[sp - 1]
+                left = stack[sp - 2]
+                sp -= 1
+                if type(left) is Integer and type(right) is Integer:
+                    if op == ADD:
+                        stack[sp - 1] = Integer(left.value + right.value)
+                    elif op == SUB:
+                        stack[sp - 1] = Integer(left.value - right.value)
+                    else:
+                        stack[sp - 1] = Integer(left.value * right.value)
+                else:
+                    stack[sp - 1] = self.binary_operation(op, left, right)  # type: ignore
+                ip += 1
+            elif op in (GREATER_THAN, LESS_THAN, EQUAL, NOT_EQUAL):
+                right = stack[sp - 1]
+                left = stack[sp - 2]
+                sp -= 1
+                if type(left) is Integer and type(right) is Integer:
+                    if op == GREATER_THAN:
+                        result = left.value > right.value
+                    elif op == LESS_THAN:
+                        result = left.value < right.value
+                    elif op == EQUAL:
+                        result = left.value == right.value
+                    else:
+                        result = left.value != right.value
+                    stack[sp - 1] = true if result else false
+                else:
+                    stack[sp - 1] = self.binary_operation(op, left, right)  # type: ignore
+                ip += 1
+            elif op == JUMP_NOT_TRUTHY:
+                sp -= 1
+                condition = stack[sp]
+                if condition is false or condition is null:
+                    ip = (instructions[ip + 1] << 8) | instructions[ip + 2]
+                else:
+                    ip += 3
+            elif op == JUMP:
+                ip = (instructions[ip + 1] << 8) | instructions[ip + 2]
+            elif op == CALL:
+                num_args = instructions[ip + 1]
+                callee = stack[sp - 1 - num_args]
+                if type(callee) is not objects.Closure:
+                    raise VMError(f"not a function: {or_null(callee).type()}")
+                fn = callee.fn
+                if num_args != fn.num_parameters:
+                    raise VMError(
+                        f"wrong number of arguments: want={fn.num_parameters}, got={num_args}"
+                    )
+                if len(frames) == MAX_FRAMES:
+                    raise VMError("stack overflow")
+                frame.ip = ip + 2
+                base_pointer = sp - num_args
+                frame = Frame(callee, base_pointer)
+                frames.append(frame)
+                closure = callee
+                instructions = fn.instructions
+                end = len(instructions)
+                ip = 0
+                sp = base_pointer + fn.num_locals
+                # locals not set yet read as NULL, not as what an earlier frame left there
+                for slot in range(base_pointer + num_args, sp):
+                    stack[slot] = null
+            elif op in (RETURN_VALUE, RETURN):
+                value = stack[sp - 1] if op == RETURN_VALUE else null
+                if len(frames) == 1:
+                    # top level return stops the program with its value as the result
+                    stack[sp - 1] = value
+                    return sp - 1
+                frames.pop()
+                sp = base_pointer - 1
+                stack[sp] = value
+                sp += 1
+                frame = frames[-1]
+                closure = frame.closure
+                instructions = closure.fn.instructions
+                end = len(instructions)
+                base_pointer = frame.base_pointer
+                ip = frame.ip
+            elif op == POP:
+                sp -= 1
+                ip += 1
+            elif op == SET_LOCAL:
+                sp -= 1
+                stack[base_pointer + instructions[ip + 1]] = stack[sp]
+                ip += 2
+            elif op == SET_GLOBAL:
+                sp -= 1
+                globals_[(instructions[ip + 1] << 8) | instructions[ip + 2]] = stack[sp]
+                ip += 3
+            elif op == GET_FREE:
+                stack[sp] = closure.free[instructions[ip + 1]]
+                sp += 1
+                ip += 2
+            elif op == CURRENT_CLOSURE:
+                stack[sp] = closure
+                sp += 1
+                ip += 1
+            elif op == CLOSURE:
+                fn = constants[(instructions[ip + 1] << 8) | instructions[ip + 2]]
+                num_free = instructions[ip + 3]
+                free = stack[sp - num_free : sp]
+                sp -= num_free
+                stack[sp] = objects.Closure(fn, free)  # type: ignore
+                sp += 1
+                ip += 4
+            elif op == TRUE:
+                stack[sp] = true
+                sp += 1
+                ip += 1
+            elif op == FALSE:
+                stack[sp] = false
+                sp += 1
+                ip += 1
+            elif op == NULL:
+                stack[sp] = null
+                sp += 1
+                ip += 1
+            elif op == DIV:
+                right = stack[sp - 1]
+                sp -= 1
+                stack[sp - 1] = self.binary_operation(op, stack[sp - 1], right)  # type: ignore
+                ip += 1
+            elif op == BANG:
+                operand = stack[sp - 1]
+                stack[sp - 1] = true if operand is false or operand is null else false
+                ip += 1
+            elif op == MINUS:
+                operand = stack[sp - 1]
+                if type(operand) is not Integer:
+                    raise VMError(f"unknown operator: -{or_null(operand).type()}")
+                stack[sp - 1] = Integer(-operand.value)
+                ip += 1
+            else:
+                raise VMError(f"unknown opcode {op}")
+
+        return sp
+
+    def binary_operation(
+        self, op: int, left: objects.Object | None, right: objects.Object | None
+    ) -> objects.Object:
+        operator = binary_opcodes[op]
+        result = evaluator.eval_infix_expression(operator, or_null(left), or_null(right))
+        if isinstance(result, objects.Error):
+            raise VMError(result.message)
+        return result
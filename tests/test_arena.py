@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+
+from interpret_deez import arena, compact_ast, evaluator, lexer, objects, parser
+
+programs = [
+    "let x = 5; return x;",
+    "-a * b + c / d == !e",
+    "add(a, b, 1, 2 * 3, 4 + 5, add(6, 7 * 8))",
+    "if (x < y) { x } else { y }",
+    "if (x) { let y = 1; }",
+    "let f = fn(x, y) { return x + y; }; f(1, true != false); fn() {}();",
+    "",
+]
+
+
+@pytest.mark.parametrize("input", programs)
+def test_arena_matches_compact_ast(input):
+    expected = compact_ast.parse_compact(input)[0].to_string()
+
+    tree, errors = arena.parse_arena(input)
+
+    assert errors == [], f"unexpected parser errors. got={errors}"
+    got = arena.to_string(tree)
+    assert got == expected, f"expected={expected}, got={got}"
+
+
+@pytest.mark.parametrize("input", programs)
+def test_arena_walk_visits_every_node_once(input):
+    tree, _ = arena.parse_arena(input)
+
+    visited = list(arena.walk(tree))
+
+    assert visited[0] == tree.root, f"walk should start at the root. got={visited[0]}"
+    assert sorted(visited) == list(range(len(tree))), f"nodes visited wrongly. got={visited}"
+
+
+def test_arena_layout():
+    input = "let total = add(1, 22);"
+    tree, _ = arena.parse_arena(input)
+
+    kinds = [tree.kind(node) for node in arena.walk(tree)]
+    expected = [
+        arena.NodeKind.PROGRAM,
+        arena.NodeKind.LET,
+        arena.NodeKind.IDENTIFIER,
+        arena.NodeKind.CALL,
+        arena.NodeKind.IDENTIFIER,
+        arena.NodeKind.INTEGER,
+        arena.NodeKind.INTEGER,
+    ]
+    assert kinds == expected, f"wrong pre-order kinds. want={expected}, got={kinds}"
+
+    let = arena.child_nodes(tree, tree.root)[0]
+    name, call = arena.child_nodes(tree, let)
+    assert tree.string(name) == "total", f"wrong let name. got={tree.string(name)}"
+    assert tree.starts[call] == input.index("("), f"wrong call start. got={tree.starts[call]}"
+    assert tree.strings == ["total", "add"], f"strings not interned. got={tree.strings}"
+
+
+def test_arena_pickles_as_arrays():
+    tree, _ = arena.parse_arena("let a = fn(x) { x * 2 }; a(21)")
+
+    restored = pickle.loads(pickle.dumps(tree))
+
+    assert restored == tree, "arena changed through pickling"
+    assert arena.to_string(restored) == arena.to_string(tree)
+
+
+def test_arena_keeps_wide_integers():
+    tree, errors = arena.parse_arena(f"let x = {2**64}; x + {-(2**63)} + {2**63 - 1}")
+
+    assert errors == [], f"unexpected parser errors. got={errors}"
+    # -2**63 is a prefix minus on the literal 2**63, which does not fit
+    assert tree.integers == [2**64, 2**63], f"wrong wide literals. got={tree.integers}"
+    expected = f"let x = {2**64};((x + (-{2**63})) + {2**63 - 1})"
+    assert arena.to_string(tree) == expected, f"got={arena.to_string(tree)}"
+    assert pickle.loads(pickle.dumps(tree)) == tree, "arena changed through pickling"
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "5 + 5 * 2 - -3 / 2",
+        "if (1 < 2) { 10 } else { 20 }",
+        "if (1 > 2) { 10 }",
+        "!true == false",
+        "let add = fn(a, b) { a + b }; add(1, add(2, 3))",
+        "let adder = fn(x) { fn(y) { x + y } }; adder(2)(3)",
+        "let f = fn(n) { if (n < 2) { return n; } f(n - 1) + f(n - 2) }; f(10)",
+        "if (10 > 1) { if (10 > 1) { return 10; } return 1; }",
+        "let x = 5; x;",
+        "foobar",
+        "true + false",
+        "fn(x) { x }(1, 2)",
+        "5(1)",
+        "let f = fn() {}; -f()",
+        "fn() {}() + 1",
+        "let f = fn() { fn() {} }; f()(1)",
+        "let a = fn() {}(); a",
+        "fn(x) { x }(fn() {}())",
+        "if (fn() {}()) { 1 } else { 2 }",
+        "let y = if (true) { return fn() {}(); }; y",
+        f"{2**64} * 2 - {2**70}",
+    ],
+)
+def test_arena_evaluate_matches_evaluator(input):
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+    expected = evaluator.evaluate(program, objects.Environment())
+
+    got = arena.evaluate(arena.from_program(program), objects.Environment())
+
+    assert got.inspect() == expected.inspect(), f"expected={expected}, got={got}"
@@ -1,4 +1,8 @@
-from interpret_deez import ast, tokenizer
+import io
+
+import pytest
+
+from interpret_deez import ast, lexer, parser, tokenizer
 from interpret_deez.ast import Identifier, LetStatement
 
 
@@ -15,3 +19,37 @@ def test_ast_to_string():
     assert program.to_string() == "let myVar = anotherVar;", (
         f"program.to_string() wrong. got={program.to_string()}"
     )
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        (
+            "let add = fn(first, second) { first + second; };",
+            "let add = fn(first, second) (first + second);",
+        ),
+        ("if (a < b) { return !a; } else { -b }", "if(a < b) return (!a);else (-b)"),
+        ("f(1, g(x), 2 * 3)", "f(1, g(x), (2 * 3))"),
+        ("f(1", "f()"),
+        ("fn(x { x }", "fn() x"),
+    ],
+)
+def test_write(input, expected):
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+
+    out = io.StringIO()
+    program.write(out)
+
+    assert out.getvalue() == expected, f"got={out.getvalue()}"
+    assert program.to_string() == expected, f"got={program.to_string()}"
+
+
+def test_write_to_file(tmp_path):
+    input = "let x = 1 * 2 * 3; let y = fn(a, b) { a - b }; y(x, 4);"
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+
+    path = tmp_path / "program.monkey"
+    with path.open("w") as file:
+        program.write(file)
+
+    assert path.read_text() == program.to_string(), f"got={path.read_text()}"
@@ -0,0 +1,136 @@
+import dataclasses
+
+import pytest
+
+from interpret_deez import arena, batch, compact_ast, lexer, parser, tokenizer
+
+sources = [
+    "let add = fn(x, y) { x + y; }; add(1, 2 * 3)",
+    "if (a < b) { return !true; } else { -a }",
+    "let x 5;",
+    "",
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for i, source in enumerate(sources * 3):
+        path = tmp_path / f"rules_{i}.monkey"
+        path.write_text(source)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_files(paths, workers):
+    results = batch.parse_files(paths, workers=workers, chunksize=2)
+
+    assert [result.path for result in results] == [str(path) for path in paths], (
+        "results are not in input order"
+    )
+    for result, path in zip(results, paths, strict=True):
+        expected, errors = compact_ast.parse_compact(path.read_text())
+        got = arena.to_string(result.program)
+        assert got == expected.to_string(), f"{path.name}: expected={expected.to_string()}"
+        assert list(result.errors) == errors, f"{path.name}: expected errors={errors}"
+        pars = parser.Parser(lexer.Lexer(path.read_text()))
+        pars.parse_program()
+        assert list(result.diagnostics) == pars.get_diagnostics(), f"{path.name}: diagnostics"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_files_failure_keeps_other_files(tmp_path, workers):
+    ok = tmp_path / "ok.monkey"
+    ok.write_text("let x = 1;")
+    missing = tmp_path / "missing.monkey"
+
+    results = batch.parse_files([ok, missing, ok], workers=workers)
+
+    assert [arena.to_string(result.program) for result in results] == [
+        "let x = 1;",
+        "",
+        "let x = 1;",
+    ]
+    assert results[0].errors == results[2].errors == (), f"got={results[0].errors}"
+    assert len(results[1].errors) == 1, f"got={results[1].errors}"
+    assert results[1].errors[0].startswith(f"cannot parse {missing}: "), f"got={results[1].errors}"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_files_wide_integers(tmp_path, workers):
+    ok = tmp_path / "ok.monkey"
+    ok.write_text("let y = 2;")
+    big = tmp_path / "big.monkey"
+    big.write_text("let x = 99999999999999999999; x * 2")
+
+    results = batch.parse_files([ok, big], workers=workers)
+
+    assert [result.errors for result in results] == [(), ()], f"got={results}"
+    got = arena.to_string(results[1].program)
+    assert got == "let x = 99999999999999999999;(x * 2)", f"got={got}"
+
+
+def token_starts(node) -> list[tuple[str, int]]:
+    """Literal and offset of every token in a tree, in field order"""
+    if isinstance(node, tokenizer.Token):
+        return [(node.literal, node.start)]
+    if isinstance(node, list):
+        return [start for item in node for start in token_starts(item)]
+    if dataclasses.is_dataclass(node):
+        fields = dataclasses.fields(node)
+        return [start for f in fields for start in token_starts(getattr(node, f.name))]
+    return []
+
+
+split_sources = [
+    "let a = 1; let b = fn(x) { let y = x; y * 2; }; b(a);",
+    "if (a) { b; c; } let d = 1; e; f(g(h; i)); j;",
+    # the parser peeks past a `;` when it ends an expression that is still missing operands
+    "-; (x); let y = 2; +; (z);",
+    "let x 5; let = 10; let 838383; ;; x;",
+    "let x = 1;\0 let y = 2;",
+    "a; b; fn(;",
+    "",
+]
+
+
+@pytest.mark.parametrize("source", split_sources)
+@pytest.mark.parametrize("chunk_size", [1, 8])
+def test_parse_split(source, chunk_size):
+    pars = parser.Parser(lexer.TableLexer(source))
+    expected = pars.parse_program()
+
+    program, errors, diagnostics = batch.parse_split(source, workers=1, chunk_size=chunk_size)
+
+    assert program == expected, f"expected={expected.to_string()} got={program.to_string()}"
+    assert token_starts(program) == token_starts(expected), "token offsets differ"
+    assert errors == pars.get_errors(), f"expected errors={pars.get_errors()}"
+    assert diagnostics == pars.get_diagnostics(), f"expected={pars.get_diagnostics()}"
+
+
+def test_parse_split_workers():
+    source = "".join(f"let x = fn(a) {{ a + {i}; }}; x({i}); let ;" for i in range(200))
+    pars = parser.Parser(lexer.TableLexer(source))
+    expected = pars.parse_program()
+
+    program, errors, diagnostics = batch.parse_split(source, workers=2, chunk_size=500)
+
+    assert program == expected, "stitched program differs from a single parse"
+    assert token_starts(program) == token_starts(expected), "token offsets differ"
+    assert errors == pars.get_errors(), "stitched errors differ from a single parse"
+    assert diagnostics == pars.get_diagnostics(), "stitched diagnostics differ"
+
+
+@pytest.mark.parametrize(
+    "source, chunk_size, expected",
+    [
+        ("a; b; c;", 1, [(0, 2), (2, 5), (5, 8)]),
+        ("a; b; c", 4, [(0, 5), (5, 7)]),
+        ("f(a; b); { c; } d;", 1, [(0, 8), (8, 18)]),
+        ("", 1, [(0, 0)]),
+    ],
+)
+def test_split_source(source, chunk_size, expected):
+    got = batch.split_source(source, chunk_size)
+    assert got == expected, f"expected={expected} got={got}"
@@ -0,0 +1,56 @@
+import pytest
+
+from interpret_deez import bytecode
+from interpret_deez.bytecode import Opcode
+
+
+@pytest.mark.parametrize(
+    "opcode,operands,expected",
+    [
+        (Opcode.CONSTANT, [65534], bytes([Opcode.CONSTANT, 255, 254])),
+        (Opcode.ADD, [], bytes([Opcode.ADD])),
+        (Opcode.GET_LOCAL, [255], bytes([Opcode.GET_LOCAL, 255])),
+        (Opcode.CLOSURE, [65534, 255], bytes([Opcode.CLOSURE, 255, 254, 255])),
+    ],
+)
+def test_make(opcode, operands, expected):
+    instruction = bytecode.make(opcode, *operands)
+    assert instruction == expected, f"instruction is wrong. expected={expected}, got={instruction}"
+
+
+@pytest.mark.parametrize(
+    "opcode,operands,bytes_read",
+    [
+        (Opcode.CONSTANT, [65535], 2),
+        (Opcode.GET_LOCAL, [255], 1),
+        (Opcode.CLOSURE, [65535, 255], 3),
+    ],
+)
+def test_read_operands(opcode, operands, bytes_read):
+    instruction = bytecode.make(opcode, *operands)
+    read, n = bytecode.read_operands(bytecode.definitions[opcode], instruction, 1)
+
+    assert n == bytes_read, f"n is wrong. expected={bytes_read}, got={n}"
+    assert read == operands, f"operands are wrong. expected={operands}, got={read}"
+
+
+def test_instructions_to_string():
+    instructions = b"".join(
+        [
+            bytecode.make(Opcode.ADD),
+            bytecode.make(Opcode.GET_LOCAL, 1),
+            bytecode.make(Opcode.CONSTANT, 2),
+            bytecode.make(Opcode.CONSTANT, 65535),
+            bytecode.make(Opcode.CLOSURE, 65535, 255),
+        ]
+    )
+    expected = (
+        "0000 OpAdd\n"
+        "0001 OpGetLocal 1\n"
+        "0003 OpConstant 2\n"
+        "0006 OpConstant 65535\n"
+        "0009 OpClosure 65535 255\n"
+    )
+
+    got = bytecode.instructions_to_string(instructions)
+    assert got == expected, f"instructions wrongly formatted.\nwant={expected!r}\ngot={got!r}"
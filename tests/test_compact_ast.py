@@ -0,0 +1,58 @@
+import dataclasses
+
+import pytest
+
+from interpret_deez import compact_ast, lexer, parser
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "let x = 5; return x;",
+        "-a * b + c / d == !e",
+        "add(a, b, 1, 2 * 3, 4 + 5, add(6, 7 * 8))",
+        "if (x < y) { x } else { y }",
+        "let f = fn(x, y) { return x + y; }; f(1, true != false);",
+    ],
+)
+def test_compact_matches_ast(input):
+    pars = parser.Parser(lexer.Lexer(input))
+    expected = pars.parse_program().to_string()
+
+    program, errors = compact_ast.parse_compact(input)
+
+    assert errors == [], f"unexpected parser errors. got={errors}"
+    assert program.to_string() == expected, f"expected={expected}, got={program.to_string()}"
+
+
+def test_compact_canonical_literals():
+    program, _ = compact_ast.parse_compact("LET foo = FN(first, second) { True }; 007")
+    expected = "let foo = fn(first, second) true;7"
+    assert program.to_string() == expected, f"expected={expected}, got={program.to_string()}"
+
+
+def test_compact_offsets():
+    input = "let total = add(1, 22);"
+    program, _ = compact_ast.parse_compact(input)
+    statement = program.statements[0]
+
+    call = statement.value
+    expected = [
+        (statement, "let"),
+        (statement.name, "total"),
+        (call, "("),
+        (call.function, "add"),
+        (call.arguments[1], "22"),
+    ]
+    for node, literal in expected:
+        got = input[node.start : node.start + len(literal)]
+        assert got == literal, f"{type(node).__name__}.start is wrong. want={literal}, got={got}"
+
+
+def test_compact_nodes_are_frozen_and_slotted():
+    program, _ = compact_ast.parse_compact("x + 1")
+    expression = program.statements[0].expression
+
+    assert not hasattr(expression, "__dict__"), "compact nodes should not have a __dict__"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        expression.operator = "-"
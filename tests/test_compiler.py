@@ -0,0 +1,116 @@
+import pytest
+
+from interpret_deez import bytecode, compiler, lexer, objects, parser
+from interpret_deez.bytecode import Opcode, make
+
+
+def compile_input(input: str) -> compiler.Bytecode:
+    comp = compiler.Compiler()
+    comp.compile(parser.Parser(lexer.Lexer(input)).parse_program())
+    return comp.bytecode()
+
+
+@pytest.mark.parametrize(
+    "input,expected_constants,expected_instructions",
+    [
+        (
+            "1 + 2",
+            [1, 2],
+            [make(Opcode.CONSTANT, 0), make(Opcode.CONSTANT, 1), make(Opcode.ADD)],
+        ),
+        (
+            "1 < 2",
+            [1, 2],
+            [make(Opcode.CONSTANT, 0), make(Opcode.CONSTANT, 1), make(Opcode.LESS_THAN)],
+        ),
+        (
+            "1 + 1 * 2",
+            [1, 2],
+            [
+                make(Opcode.CONSTANT, 0),
+                make(Opcode.CONSTANT, 0),
+                make(Opcode.CONSTANT, 1),
+                make(Opcode.MUL),
+                make(Opcode.ADD),
+            ],
+        ),
+        ("-1", [1], [make(Opcode.CONSTANT, 0), make(Opcode.MINUS)]),
+        ("!true", [], [make(Opcode.TRUE), make(Opcode.BANG)]),
+        (
+            "if (true) { 10 }; 3333;",
+            [10, 3333],
+            [
+                make(Opcode.TRUE),
+                make(Opcode.JUMP_NOT_TRUTHY, 10),
+                make(Opcode.CONSTANT, 0),
+                make(Opcode.JUMP, 11),
+                make(Opcode.NULL),
+                make(Opcode.POP),
+                make(Opcode.CONSTANT, 1),
+            ],
+        ),
+        (
+            "let one = 1; one;",
+            [1],
+            [make(Opcode.CONSTANT, 0), make(Opcode.SET_GLOBAL, 0), make(Opcode.GET_GLOBAL, 0)],
+        ),
+    ],
+)
+def test_compile(input, expected_constants, expected_instructions):
+    code = compile_input(input)
+    # every expression statement ends with a pop
+    expected = b"".join([*expected_instructions, make(Opcode.POP)])
+
+    assert code.instructions == expected, (
+        f"wrong instructions.\nwant={bytecode.instructions_to_string(expected)}"
+        f"\ngot={bytecode.instructions_to_string(code.instructions)}"
+    )
+    constants = [constant.value for constant in code.constants]  # type: ignore
+    assert constants == expected_constants, (
+        f"wrong constants. want={expected_constants}, got={constants}"
+    )
+
+
+def test_compile_closures():
+    code = compile_input("fn(a) { fn(b) { a + b } }")
+
+    inner, outer = code.constants
+    assert isinstance(inner, objects.CompiledFunction), f"not a function. got={inner}"
+    assert isinstance(outer, objects.CompiledFunction), f"not a function. got={outer}"
+
+    expected_inner = b"".join(
+        [
+            make(Opcode.GET_FREE, 0),
+            make(Opcode.GET_LOCAL, 0),
+            make(Opcode.ADD),
+            make(Opcode.RETURN_VALUE),
+        ]
+    )
+    expected_outer = b"".join(
+        [make(Opcode.GET_LOCAL, 0), make(Opcode.CLOSURE, 0, 1), make(Opcode.RETURN_VALUE)]
+    )
+    assert inner.instructions == expected_inner, (
+        f"wrong inner instructions. got={bytecode.instructions_to_string(inner.instructions)}"
+    )
+    assert outer.instructions == expected_outer, (
+        f"wrong outer instructions. got={bytecode.instructions_to_string(outer.instructions)}"
+    )
+
+
+def test_compile_undefined_variable():
+    with pytest.raises(compiler.CompileError, match="undefined variable foobar"):
+        compile_input("foobar")
+
+
+@pytest.mark.parametrize("input", ["let b = b;", "fn() { let b = b; b }", "fn(x) { let y = y; x }"])
+def test_compile_let_reads_its_own_name(input):
+    """The value of a `let` is compiled before its name is defined"""
+    with pytest.raises(compiler.CompileError, match="undefined variable"):
+        compile_input(input)
+
+
+def test_compile_too_many_constants():
+    comp = compiler.Compiler(constants=[objects.Integer(0)] * compiler.MAX_CONSTANTS)
+
+    with pytest.raises(compiler.CompileError, match="too many constants"):
+        comp.compile(parser.Parser(lexer.Lexer("1")).parse_program())
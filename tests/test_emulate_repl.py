@@ -0,0 +1,55 @@
+import dataclasses
+import io
+import json
+
+from interpret_deez import lexer, parser
+from interpret_deez.emulate_repl import emulate_repl
+
+inputs = [
+    "let  = 1 * 2 * 3 * 4 * 5;",
+    "x * y / 2 + 3 * 8 - 123",
+    "true == false",
+    "let x 5;",
+    "",
+    "if (x < y) { x } else { y }",
+]
+
+
+def test_parse_many():
+    outcomes = list(emulate_repl.parse_many(inputs))
+
+    assert [outcome.input for outcome in outcomes] == inputs, "outcomes are not in input order"
+    for outcome in outcomes:
+        pars = parser.Parser(lexer.Lexer(outcome.input))
+        expected = pars.parse_program()
+        assert outcome.program == expected, f"{outcome.input!r}: got={outcome.program}"
+        assert list(outcome.errors) == pars.get_errors(), f"{outcome.input!r}: errors leaked"
+        assert list(outcome.diagnostics) == pars.get_diagnostics(), f"{outcome.input!r}"
+
+
+def test_serve_ndjson():
+    out = io.StringIO()
+    emulate_repl.serve(io.StringIO("".join(f"{input}\n" for input in inputs)), out)
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == len(inputs), f"expected one line per input, got={lines}"
+    for line, input in zip(lines, inputs, strict=True):
+        outcome = json.loads(line)
+        pars = parser.Parser(lexer.Lexer(input))
+        program = pars.parse_program()
+        assert outcome == {
+            "input": input,
+            "program": program.to_string(),
+            "errors": pars.get_errors(),
+            "diagnostics": [
+                {**dataclasses.asdict(diagnostic), "line": 1, "column": diagnostic.start + 1}
+                for diagnostic in pars.get_diagnostics()
+            ],
+        }, f"got={outcome}"
+
+
+def test_get_errors():
+    got = emulate_repl.get_errors(["first", "second"])
+
+    assert got.startswith(emulate_repl.MONKEY_FACE), "monkey face is missing"
+    assert got.endswith("parser errors:\n\tfirst\n\tsecond\n"), f"got={got!r}"
@@ -0,0 +1,252 @@
+import pytest
+
+from interpret_deez import closure_compiler, evaluator, lexer, objects, parser
+
+
+def walk(input: str) -> objects.Object | None:
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+    return evaluator.evaluate(program, objects.Environment())
+
+
+def run_compiled(input: str) -> objects.Object | None:
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+    return closure_compiler.compile_program(program)(objects.Environment())
+
+
+backends = pytest.mark.parametrize("run", [walk, run_compiled], ids=["walker", "closures"])
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("5", 5),
+        ("10", 10),
+        ("-5", -5),
+        ("-10", -10),
+        ("5 + 5 + 5 + 5 - 10", 10),
+        ("2 * 2 * 2 * 2 * 2", 32),
+        ("-50 + 100 + -50", 0),
+        ("5 * 2 + 10", 20),
+        ("5 + 2 * 10", 25),
+        ("20 + 2 * -10", 0),
+        ("50 / 2 * 2 + 10", 60),
+        ("2 * (5 + 10)", 30),
+        ("3 * 3 * 3 + 10", 37),
+        ("3 * (3 * 3) + 10", 37),
+        ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+        ("-7 / 2", -3),
+        ("7 / -2", -3),
+    ],
+)
+def test_eval_integer_expression(run, input, expected):
+    evaluated = run(input)
+    passed, message = check_integer_object(evaluated, expected)
+    assert passed, message
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("true", True),
+        ("false", False),
+        ("1 < 2", True),
+        ("1 > 2", False),
+        ("1 < 1", False),
+        ("1 == 1", True),
+        ("1 != 1", False),
+        ("1 == 2", False),
+        ("true == true", True),
+        ("false == false", True),
+        ("true == false", False),
+        ("true != false", True),
+        ("(1 < 2) == true", True),
+        ("(1 > 2) == true", False),
+        ("!true", False),
+        ("!false", True),
+        ("!5", False),
+        ("!!true", True),
+        ("!!5", True),
+    ],
+)
+def test_eval_boolean_expression(run, input, expected):
+    evaluated = run(input)
+    passed, message = check_boolean_object(evaluated, expected)
+    assert passed, message
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("if (true) { 10 }", 10),
+        ("if (false) { 10 }", None),
+        ("if (1) { 10 }", 10),
+        ("if (1 < 2) { 10 }", 10),
+        ("if (1 > 2) { 10 }", None),
+        ("if (1 > 2) { 10 } else { 20 }", 20),
+        ("if (1 < 2) { 10 } else { 20 }", 10),
+    ],
+)
+def test_if_else_expressions(run, input, expected):
+    evaluated = run(input)
+    if expected is None:
+        assert evaluated is objects.NULL, f"object is not NULL. got={evaluated}"
+    else:
+        passed, message = check_integer_object(evaluated, expected)
+        assert passed, message
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("return 10;", 10),
+        ("return 10; 9;", 10),
+        ("return 2 * 5; 9;", 10),
+        ("9; return 2 * 5; 9;", 10),
+        ("if (10 > 1) { if (10 > 1) { return 10; } return 1; }", 10),
+    ],
+)
+def test_return_statements(run, input, expected):
+    evaluated = run(input)
+    passed, message = check_integer_object(evaluated, expected)
+    assert passed, message
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("5 + true;", "type mismatch: INTEGER + BOOLEAN"),
+        ("5 + true; 5;", "type mismatch: INTEGER + BOOLEAN"),
+        ("-true", "unknown operator: -BOOLEAN"),
+        ("true + false;", "unknown operator: BOOLEAN + BOOLEAN"),
+        ("5; true + false; 5", "unknown operator: BOOLEAN + BOOLEAN"),
+        ("if (10 > 1) { true + false; }", "unknown operator: BOOLEAN + BOOLEAN"),
+        (
+            "if (10 > 1) { if (10 > 1) { return true + false; } return 1; }",
+            "unknown operator: BOOLEAN + BOOLEAN",
+        ),
+        ("foobar", "identifier not found: foobar"),
+        ("5 / 0", "division by zero"),
+        ("let x = 1; x(2)", "not a function: INTEGER"),
+        ("fn(x, y) { x }(1)", "wrong number of arguments: want=2, got=1"),
+    ],
+)
+def test_error_handling(run, input, expected):
+    evaluated = run(input)
+    assert isinstance(evaluated, objects.Error), f"no error object returned. got={evaluated}"
+    assert evaluated.message == expected, (
+        f"wrong error message. expected={expected}, got={evaluated.message}"
+    )
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("let a = 5; a;", 5),
+        ("let a = 5 * 5; a;", 25),
+        ("let a = 5; let b = a; b;", 5),
+        ("let a = 5; let b = a; let c = a + b + 5; c;", 15),
+    ],
+)
+def test_let_statements(run, input, expected):
+    passed, message = check_integer_object(run(input), expected)
+    assert passed, message
+
+
+@backends
+def test_function_object(run):
+    evaluated = run("fn(x) { x + 2; };")
+    assert isinstance(evaluated, objects.Function), f"object is not Function. got={evaluated}"
+    assert [p.value for p in evaluated.parameters] == ["x"], (
+        f"function has wrong parameters. got={evaluated.parameters}"
+    )
+    assert evaluated.body.to_string() == "(x + 2)", (
+        f"body is not '(x + 2)'. got={evaluated.body.to_string()}"
+    )
+
+
+@backends
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("let identity = fn(x) { x; }; identity(5);", 5),
+        ("let identity = fn(x) { return x; }; identity(5);", 5),
+        ("let double = fn(x) { x * 2; }; double(5);", 10),
+        ("let add = fn(x, y) { x + y; }; add(5, 5);", 10),
+        ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
+        ("fn(x) { x; }(5)", 5),
+        ("let newAdder = fn(x) { fn(y) { x + y }; }; let addTwo = newAdder(2); addTwo(2);", 4),
+        ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15)", 610),
+    ],
+)
+def test_function_application(run, input, expected):
+    passed, message = check_integer_object(run(input), expected)
+    assert passed, message
+
+
+def check_integer_object(obj: objects.Object | None, expected: int) -> tuple[bool, str]:
+    if not isinstance(obj, objects.Integer):
+        return False, f"object is not Integer. got={obj}"
+    if obj.value != expected:
+        return False, f"object has wrong value. got={obj.value}, want={expected}"
+    return True, ""
+
+
+def check_boolean_object(obj: objects.Object | None, expected: bool) -> tuple[bool, str]:
+    if not isinstance(obj, objects.Boolean):
+        return False, f"object is not Boolean. got={obj}"
+    if obj.value is not expected:
+        return False, f"object has wrong value. got={obj.value}, want={expected}"
+    return True, ""
+
+
+@backends
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let a = fn() {}(); a", objects.NULL),
+        ("let a = if (true) { let b = 1; }; a", objects.NULL),
+        ("fn(x) { x }(fn() {}())", objects.NULL),
+        ("let f = fn() { let x = 1; }; f()(1)", "not a function: NULL"),
+        ("let f = fn() {}; -f()", "unknown operator: -NULL"),
+        ("fn() {}() + 1", "type mismatch: NULL + INTEGER"),
+        ("let y = if (true) { return fn() {}(); }; y", objects.NULL),
+        ("fn() { return fn() {}(); }()", objects.NULL),
+    ],
+)
+def test_missing_values_are_null(run, input, expected):
+    """Empty blocks and `let`s have no value, once bound or operated on they are NULL"""
+    evaluated = run(input)
+    if isinstance(expected, str):
+        assert isinstance(evaluated, objects.Error), f"no error object returned. got={evaluated}"
+        assert evaluated.message == expected, f"wrong error message. got={evaluated.message}"
+    else:
+        assert evaluated is expected, f"expected={expected}, got={evaluated}"
+
+
+@backends
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("if (fn() {}()) { 1 } else { 2 }", 2),
+        ("let f = fn() { let x = 1; }; if (f()) { 1 } else { 2 }", 2),
+        ("if (!fn() {}()) { 1 } else { 2 }", 1),
+    ],
+)
+def test_missing_value_conditions_are_falsy(run, input, expected):
+    evaluated = run(input)
+    passed, message = check_integer_object(evaluated, expected)
+    assert passed, message
+
+
+def test_return_value_of_missing_value_inspects_null():
+    env = objects.Environment()
+    pars = parser.Parser(lexer.Lexer("let y = if (true) { return fn() {}(); };"))
+    evaluator.evaluate(pars.parse_program(), env)
+
+    assert env.get("y").inspect() == "null", f"got={env.get('y')}"
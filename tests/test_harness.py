@@ -0,0 +1,66 @@
+import copy
+import json
+
+from benchmarks import harness
+from benchmarks.corpus import corpora
+
+
+def test_run_suite_and_compare():
+    current = harness.run_suite(statements=5, repeat=1)
+
+    expected_keys = {f"{corpus}/{stage}" for corpus in corpora(5) for stage in harness.stages}
+    assert set(current["results"]) == expected_keys, f"got={sorted(current['results'])}"
+    for key, result in current["results"].items():
+        assert result["tokens"] > 0 and result["seconds"] > 0, f"{key}: got={result}"
+        ratio = result["tokens"] / result["seconds"]
+        assert abs(result["tokens_per_second"] - ratio) <= ratio * 1e-9, f"{key}: got={result}"
+        assert result["peak_bytes"] > 0, f"{key}: got={result}"
+        if key.endswith("/parser"):
+            assert result["statements"] > 0, f"{key}: got={result}"
+        else:
+            assert "statements" not in result, f"{key}: got={result}"
+
+    assert harness.compare(current, current, threshold=0.1) == [], "a run regressed on itself"
+
+    # a baseline twice as fast is a 50% drop for every benchmark
+    baseline = copy.deepcopy(current)
+    for result in baseline["results"].values():
+        result["tokens_per_second"] *= 2
+    regressions = harness.compare(current, baseline, threshold=0.1)
+    assert len(regressions) == len(expected_keys), f"got={regressions}"
+    assert all(regression.endswith("(-50.0%)") for regression in regressions), f"{regressions}"
+    assert harness.compare(current, baseline, threshold=0.6) == [], "drop within the threshold"
+
+    # a baseline using half the memory is a 100% growth of every peak
+    baseline = copy.deepcopy(current)
+    for result in baseline["results"].values():
+        result["peak_bytes"] //= 2
+    regressions = harness.compare(current, baseline, threshold=0.1)
+    assert len(regressions) == len(expected_keys), f"got={regressions}"
+    assert all("peak bytes" in regression for regression in regressions), f"{regressions}"
+
+    # baselines of peak 0 only get the throughput check
+    baseline = copy.deepcopy(current)
+    for result in baseline["results"].values():
+        result["peak_bytes"] = 0
+    assert harness.compare(current, baseline, threshold=0.1) == [], "a peak of 0 was compared"
+
+    # benchmarks missing from the baseline are not compared
+    baseline["results"] = {}
+    assert harness.compare(current, baseline, threshold=0.1) == []
+
+
+def test_compare_old_baseline(tmp_path):
+    """Baselines saved without peak_bytes only get the throughput check"""
+    current = harness.run_suite(statements=5, repeat=1)
+    old = copy.deepcopy(current)
+    for result in old["results"].values():
+        del result["peak_bytes"]
+        result["tokens_per_second"] *= 2
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(old))
+
+    regressions = harness.compare(current, json.loads(path.read_text()), threshold=0.1)
+
+    assert len(regressions) == len(current["results"]), f"got={regressions}"
+    assert all("tokens/s" in regression for regression in regressions), f"got={regressions}"
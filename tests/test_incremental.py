@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import generate_program
+from interpret_deez import incremental, lexer, parser
+
+source = """let add = fn(x, y) { x + y; };
+let result = add(5, 10);
+if (result > 10) { return true; } else { return false; }
+!-5 * 3 == 10 != 9;
+"""
+
+
+def check_document(document: incremental.Document) -> None:
+    """The edited document must look exactly like a fresh parse of its source"""
+    expected = incremental.parse_document(document.source)
+
+    assert document.program == expected.program, (
+        f"expected={expected.program.to_string()}, got={document.program.to_string()}"
+    )
+    assert document.get_errors() == expected.get_errors(), (
+        f"expected errors={expected.get_errors()}, got={document.get_errors()}"
+    )
+    assert document.get_diagnostics() == expected.get_diagnostics(), (
+        f"expected={expected.get_diagnostics()}, got={document.get_diagnostics()}"
+    )
+    assert document.spans() == expected.spans(), f"spans: {expected.spans()} != {document.spans()}"
+    for i, statement in enumerate(document.statements):
+        if statement is None:
+            continue
+        start = document.token_start(i, statement.token)
+        assert start == document.span(i)[0], f"statement[{i}] token starts at {start}"
+
+
+def test_parse_document_matches_parser():
+    pars = parser.Parser(lexer.Lexer(source))
+    expected = pars.parse_program()
+
+    document = incremental.parse_document(source)
+
+    assert document.program == expected, f"expected={expected.to_string()}"
+    assert document.get_errors() == pars.get_errors()
+    assert document.get_diagnostics() == pars.get_diagnostics()
+    for i, (start, end) in enumerate(document.spans()):
+        line = source.splitlines()[i]
+        assert source[start:end] == line, f"statement[{i}] span is {source[start:end]!r}"
+
+
+@pytest.mark.parametrize(
+    "offset, deleted, inserted",
+    [
+        (source.index("10)"), 2, "20"),  # inside a statement
+        (source.index("add = "), 3, "sum"),  # rename, later statements still call add
+        (source.index(";\nlet result"), 1, ""),  # merge two statements
+        (source.index("{ x + y"), 1, ""),  # unbalanced brace swallows the rest
+        (source.index("let result"), 0, "let z = 1; "),  # new statement
+        (source.index("if"), 0, "x"),  # glued onto the next token
+        (len(source), 0, "fn("),  # trailing error
+        (0, len(source), ""),  # delete everything
+        (0, 0, "   "),  # whitespace only
+    ],
+)
+def test_edit(offset, deleted, inserted):
+    document = incremental.parse_document(source)
+
+    document.edit(offset, deleted, inserted)
+
+    assert document.source == source[:offset] + inserted + source[offset + deleted :]
+    check_document(document)
+
+
+def test_edit_reuses_untouched_statements():
+    big = generate_program(2000)
+    document = incremental.parse_document(big)
+    before = list(document.statements)
+    target = len(document.statements) // 2
+
+    offset = document.span(target)[0]
+    reparsed = document.edit(offset, 3, "let")
+
+    # the statement before is reparsed too, the parser peeked at the edited one to end it
+    assert reparsed == 2, f"only the edited statement should be reparsed. got={reparsed}"
+    for i, (old, new) in enumerate(zip(before, document.statements, strict=True)):
+        if i not in (target - 1, target):
+            assert old is new, f"statement[{i}] was not reused"
+    check_document(document)
+
+
+def test_edit_moves_diagnostics_of_reused_statements():
+    text = "let a = 1;\nlet b = 2;\nlet c 3;\nlet d = 4;\n"
+    document = incremental.parse_document(text)
+    broken = document.statements.index(None)
+    diagnostics = document.diagnostics[broken]
+
+    document.edit(0, 0, "let z = 0;\n")
+
+    assert document.diagnostics[broken + 1] is diagnostics, "the broken statement was reparsed"
+    (diagnostic,) = document.get_diagnostics()
+    start = document.source.index("3;")
+    assert (diagnostic.start, diagnostic.end) == (start, start + 1), f"got={diagnostic}"
+    assert diagnostic.line_column(document.source) == (4, 7)
+    check_document(document)
+
+
+def test_random_edits():
+    rng = random.Random(1234)
+    pieces = ["", " ", ";", "{", "}", "(", ")", "x", "let ", "= 1", "+ 2", "fn(a) { a }", "\n"]
+    document = incremental.parse_document(source)
+
+    for _ in range(300):
+        offset = rng.randint(0, len(document.source))
+        deleted = rng.randint(0, min(4, len(document.source) - offset))
+        document.edit(offset, deleted, rng.choice(pieces))
+        check_document(document)
+
+
+def test_edit_out_of_range():
+    document = incremental.parse_document(source)
+    with pytest.raises(ValueError):
+        document.edit(len(source), 1, "")
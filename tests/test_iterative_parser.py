@@ -0,0 +1,81 @@
+import pytest
+
+from interpret_deez import ast, lexer, parser
+from interpret_deez.iterative_parser import IterativeParser
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "-a * b",
+        "!-a",
+        "a + b * c + d / e - f",
+        "3 + 4; -5 * 5",
+        "5 < 4 != 3 > 4",
+        "1 + (2 + 3) + 4",
+        "-(5 + 5) * ((2))",
+        "a + add(b * c) + d",
+        "add(a, b, 1, 2 * 3, 4 + 5, add(6, 7 * 8))",
+        "f()()(1)(2, 3)",
+        "let add = fn(x, y) { x + y; }; add(1, 2 * 3) > 5",
+        "if (a < b) { return -a; } else { !b }",
+        "fn(x) { fn(y) { x * y } }(2)(3)",
+        # malformed input has to produce the same partial trees and errors
+        "let x 5; 1 + ; * 2",
+        "(1 + 2",
+        "add(1, 2",
+        "-",
+        "a + + b",
+        "if (x { y }; z",
+        "fn() { x + }; y",
+        "f(fn() { x } y); z",
+    ],
+)
+def test_iterative_parser_matches_parser(input):
+    pars = parser.Parser(lexer.Lexer(input))
+    expected = pars.parse_program()
+
+    iterative = IterativeParser(lexer.Lexer(input))
+    program = iterative.parse_program()
+
+    assert program == expected, f"expected={expected.to_string()}, got={program.to_string()}"
+    assert iterative.get_errors() == pars.get_errors(), (
+        f"expected errors={pars.get_errors()}, got={iterative.get_errors()}"
+    )
+
+
+def test_iterative_parser_long_chain():
+    terms = 100_000
+    input = " + ".join(str(i) for i in range(terms))
+
+    pars = IterativeParser(lexer.TableLexer(input))
+    program = pars.parse_program()
+
+    assert pars.get_errors() == [], f"unexpected parser errors. got={pars.get_errors()[:3]}"
+    # walk the left spine instead of comparing, equality and to_string recurse
+    node = program.statements[0].expression
+    depth = 0
+    while isinstance(node, ast.InfixExpression):
+        assert node.right.value == terms - 1 - depth, f"wrong operand at depth {depth}"
+        node = node.left
+        depth += 1
+    assert depth == terms - 1, f"expected {terms - 1} infix nodes, got={depth}"
+    assert node.value == 0, f"leftmost operand should be 0. got={node.value}"
+
+
+@pytest.mark.parametrize(
+    "template, node_type",
+    [
+        ("(" * 100_000 + "1" + ")" * 100_000, ast.IntegerLiteral),
+        ("-" * 100_000 + "1", ast.PrefixExpression),
+        ("f(" * 100_000 + "1" + ")" * 100_000, ast.CallExpression),
+    ],
+    ids=["parentheses", "prefix", "calls"],
+)
+def test_iterative_parser_deep_nesting(template, node_type):
+    pars = IterativeParser(lexer.TableLexer(template))
+    program = pars.parse_program()
+
+    assert pars.get_errors() == [], f"unexpected parser errors. got={pars.get_errors()[:3]}"
+    expression = program.statements[0].expression
+    assert isinstance(expression, node_type), f"expected {node_type}, got={type(expression)}"
@@ -1,8 +1,21 @@
+import io
+
+import pytest
+
 from interpret_deez import tokenizer
-from interpret_deez.lexer import Lexer
+from interpret_deez.lexer import (
+    Lexer,
+    StreamLexer,
+    TableLexer,
+    stream_tokens,
+    tokenize_all,
+    tokenize_bytes,
+    tokenize_file,
+)
 
 
-def test_next_token():
+@pytest.mark.parametrize("lexer_class", [Lexer, TableLexer])
+def test_next_token(lexer_class):
     input = """
         let five = 5;
         let ten = 10;
@@ -103,7 +116,7 @@ def test_next_token():
         tokenizer.Token(tokenizer.EOF, ""),
     ]
 
-    lexer = Lexer(input)
+    lexer = lexer_class(input)
 
     for i, tt in enumerate(expected):
         next_token = lexer.next_token()
@@ -115,3 +128,187 @@ def test_next_token():
         assert next_token.literal == tt.literal, (
             f"expected[{i}] - literal is wrong. expected: {tt.literal}, got: {next_token.literal}"
         )
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "",
+        "   \n\t  ",
+        "let a_b=10;;",
+        "x==y!=!z",
+        "foo1 23bar",
+        "@ # $ é",
+        "let x = 1;\0 let y = 2;",
+        "if(a<b){return c}else{d} ",
+    ],
+)
+def test_table_lexer_matches_lexer(input):
+    """TableLexer must yield exactly the same tokens as Lexer"""
+    lexer = Lexer(input)
+    table_lexer = TableLexer(input)
+
+    for i in range(len(input) + 2):
+        expected = lexer.next_token()
+        got = table_lexer.next_token()
+        assert got == expected, f"token[{i}] is wrong. expected: {expected}, got: {got}"
+        assert got.start == expected.start, (
+            f"token[{i}] start is wrong. expected: {expected.start}, got: {got.start}"
+        )
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "",
+        "let add = fn(x, y) { x + y; };\n  add(5, 10) == 15 != !true",
+        "@ # $ é",
+        "let x = 1;\0 let y = 2;",
+    ],
+)
+def test_tokenize_all_matches_lexer(input):
+    """tokenize_all must hold the same tokens as Lexer, stopping at the first EOF"""
+    lexer = Lexer(input)
+    buffer = tokenize_all(input)
+
+    for i in range(len(buffer)):
+        expected = lexer.next_token()
+        assert buffer.token(i) == expected, (
+            f"token[{i}] is wrong. expected: {expected}, got: {buffer.token(i)}"
+        )
+        assert input[buffer.starts[i] : buffer.ends[i]] == expected.literal or (
+            expected.type == tokenizer.EOF
+        ), f"token[{i}] offsets are wrong. got: ({buffer.starts[i]}, {buffer.ends[i]})"
+        assert buffer.starts[i] == expected.start, (
+            f"token[{i}] start is wrong. expected: {expected.start}, got: {buffer.starts[i]}"
+        )
+
+    assert buffer.type(len(buffer) - 1) == tokenizer.EOF, "buffer does not end with EOF"
+    assert buffer.next_token() == buffer.token(0), "buffer cursor does not start at 0"
+
+
+stream_inputs = [
+    "",
+    "   \n\t  ",
+    "let add = fn(x, y) { x + y; };\n  add(5, 10) == 15 != !true",
+    "x==y!=!z  ",
+    "@ # $ é",
+    "let x = 1;\0 let y = 2;",
+]
+
+
+def table_tokens(input: str) -> list[tokenizer.Token]:
+    lexer = TableLexer(input)
+    tokens = [lexer.next_token()]
+    while tokens[-1].type != tokenizer.EOF:
+        tokens.append(lexer.next_token())
+    return tokens
+
+
+def check_tokens(got: list[tokenizer.Token], expected: list[tokenizer.Token]) -> None:
+    assert got == expected, f"tokens are wrong. expected: {expected}, got: {got}"
+    starts = [token.start for token in got]
+    expected_starts = [token.start for token in expected]
+    assert starts == expected_starts, (
+        f"starts are wrong. expected: {expected_starts}, got: {starts}"
+    )
+
+
+@pytest.mark.parametrize("input", stream_inputs)
+def test_stream_lexer_every_split(input):
+    """Tokens must not depend on where the input is split into chunks"""
+    expected = table_tokens(input)
+    for split in range(len(input) + 1):
+        got = list(stream_tokens([input[:split], input[split:]]))
+        check_tokens(got, expected)
+
+
+@pytest.mark.parametrize("input", stream_inputs)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 16])
+def test_stream_lexer_file_objects(input, chunk_size):
+    expected = table_tokens(input)
+
+    check_tokens(list(stream_tokens(io.StringIO(input), chunk_size)), expected)
+    # bytes chunks may cut multi byte characters in half
+    check_tokens(list(stream_tokens(io.BytesIO(input.encode()), chunk_size)), expected)
+
+
+def test_stream_lexer_buffer_is_bounded():
+    line = "let value = 10 * (other + 42);\n"
+    lexer = StreamLexer(io.StringIO(line * 1000), chunk_size=64)
+
+    longest = 0
+    while lexer.next_token().type != tokenizer.EOF:
+        longest = max(longest, len(lexer.buffer))
+    assert longest <= 64 + len(line), f"buffer grew to {longest} characters"
+
+
+@pytest.mark.parametrize("input", stream_inputs)
+def test_tokenize_bytes_matches_tokenize_all(input):
+    """Same tokens as tokenize_all, with offsets counted in UTF-8 bytes"""
+    expected = tokenize_all(input)
+    data = input.encode()
+    buffer = tokenize_bytes(memoryview(data))
+
+    assert len(buffer) == len(expected), f"expected {len(expected)} tokens, got {len(buffer)}"
+    for i in range(len(buffer)):
+        got = buffer.token(i)
+        assert got == expected.token(i), f"token[{i}] is wrong. expected: {expected.token(i)}"
+        byte_start = len(input[: expected.starts[i]].encode())
+        assert buffer.starts[i] == byte_start, (
+            f"token[{i}] start is wrong. expected: {byte_start}, got: {buffer.starts[i]}"
+        )
+
+
+@pytest.mark.parametrize("input", ["", "let add = fn(x, y) { x + y; }; add(1, 2) != é"])
+def test_tokenize_file(tmp_path, input):
+    path = tmp_path / "program.monkey"
+    path.write_bytes(input.encode())
+
+    buffer = tokenize_file(path)
+    expected = tokenize_bytes(input.encode())
+
+    tokens = [buffer.token(i) for i in range(len(buffer))]
+    expected_tokens = [expected.token(i) for i in range(len(expected))]
+    assert tokens == expected_tokens, f"expected: {expected_tokens}, got: {tokens}"
+
+
+@pytest.mark.parametrize(
+    "ident,expected",
+    [
+        ("let", tokenizer.LET),
+        ("True", tokenizer.TRUE),
+        ("RETURN", tokenizer.RETURN),
+        ("fN", tokenizer.FUNCTION),
+        ("lets", tokenizer.IDENT),
+    ],
+)
+def test_lookup_identifier(ident, expected):
+    got = tokenizer.lookup_identfier(ident)
+    assert got is expected, (
+        f"lookup_identfier({ident!r}) is wrong. expected: {expected}, got: {got}"
+    )
+
+
+def test_token_type_names():
+    assert str(tokenizer.NOT_EQ) == "!=", f"str(NOT_EQ) is wrong. got: {tokenizer.NOT_EQ}"
+    assert f"{tokenizer.LET}" == "LET", f"formatted LET is wrong. got: {tokenizer.LET}"
+
+
+@pytest.mark.parametrize("input", ["", "\n", "let x = 5;\n\nx", *stream_inputs])
+@pytest.mark.parametrize("encode", [False, True])
+def test_line_index(input, encode):
+    """Every token position matches counting the newlines before its start"""
+    buffer = tokenize_bytes(input.encode()) if encode else tokenize_all(input)
+    source = buffer.source
+    newline = b"\n" if encode else "\n"
+    lines = tokenizer.LineIndex(source)
+
+    assert lines.starts is None, "the index was built before a position was asked for"
+    for i, start in enumerate(buffer.starts):
+        line_start = source.rfind(newline, 0, start) + 1
+        expected = (source.count(newline, 0, line_start) + 1, start - line_start + 1)
+        got = lines.position(start)
+        assert got == expected, f"token[{i}] at {start}: expected {expected}, got {got}"
+        line = source[line_start:].split(newline)[0]
+        assert lines.line(got[0]) == line, f"line {got[0]} is wrong. got: {lines.line(got[0])}"
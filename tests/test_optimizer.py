@@ -0,0 +1,82 @@
+import copy
+
+import pytest
+
+from interpret_deez import evaluator, lexer, objects, optimizer, parser
+
+
+def parse(input: str):
+    pars = parser.Parser(lexer.Lexer(input))
+    program = pars.parse_program()
+    assert not pars.errors, f"parser errors: {pars.errors}"
+    return program
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1 * 2 * 3 * 4 * 5", "120"),
+        ("!true", "false"),
+        ("!!5", "true"),
+        ("-(-5) + -3", "2"),
+        ("2 - 7", "(-5)"),
+        ("1 < 2 == true", "true"),
+        ("let x = 3 * (4 + 1);", "let x = 15;"),
+        ("10 / 3 * 3", "9"),
+        ("-7 / 2", "(-3)"),
+        ("10 / 0", "(10 / 0)"),
+        ("1 + true", "(1 + true)"),
+        ("let x = 5; (x * 2) * 1", "let x = 5;(x * 2)"),
+        ("let x = 5; 0 + x * 3 - 0", "let x = 5;(x * 3)"),
+        ("let x = 5; x / 1", "let x = 5;(x / 1)"),
+        ("if (1 < 2) { 10 } else { 20 }", "10"),
+        ("if (1 > 2) { 10 } else { 20 }", "20"),
+        ("if (false) { 10 }; 5", "5"),
+        ("if (false) { 10 }", "iffalse 10"),
+        ("5; if (true) { }", "5iftrue "),
+        ("fn(a) { if (true) { return a; } a }(2 * 2)", "fn(a) return a;a(4)"),
+        ("let f = fn(a) { a + 2 * 3 }; f(1 + 1)", "let f = fn(a) (a + 6);f(2)"),
+        ("let a = 1; let x = if (1 < 2) { a } else { b };", "let a = 1;let x = a;"),
+        ("let f = fn(x) { x }; f(if (false) { 1 } else { 2 * 3 })", "let f = fn(x) x;f(6)"),
+        ("1 + if (true) { 2 }", "3"),
+        ("-if (true) { 5 }", "(-5)"),
+        ("if (true) { if (false) { 1 } else { 2 } } + 1", "3"),
+        # branches with more than one statement or a missing value are kept
+        ("let x = if (true) { let y = 1; y };", "let x = iftrue let y = 1;y;"),
+        ("let x = if (false) { 1 };", "let x = iffalse 1;"),
+        ("let x = if (true) { return 1; };", "let x = iftrue return 1;;"),
+    ],
+)
+def test_fold_constants(input, expected):
+    program = parse(input)
+    original = copy.deepcopy(program)
+
+    folded = optimizer.fold_constants(program)
+
+    assert folded.to_string() == expected, f"got={folded.to_string()}"
+    assert program == original, "the input program was modified"
+    want = evaluator.evaluate(program, objects.Environment())
+    got = evaluator.evaluate(folded, objects.Environment())
+    assert (got and got.inspect()) == (want and want.inspect()), (
+        f"folded program evaluates to {got}, original to {want}"
+    )
+
+
+def test_fold_constants_shares_unchanged_subtrees():
+    program = parse("let f = fn(x) { x + y }; f(1 + 2); g(z);")
+
+    folded = optimizer.fold_constants(program)
+
+    assert folded.statements[0] is program.statements[0], "unchanged statement was copied"
+    assert folded.statements[2] is program.statements[2], "unchanged statement was copied"
+    assert folded.statements[1] is not program.statements[1], "folded statement is shared"
+    assert optimizer.fold_constants(parse("x + y")).statements, "empty result"
+
+
+def test_fold_constants_keeps_offsets():
+    program = parse("let x = 1 + 2;")
+
+    folded = optimizer.fold_constants(program)
+
+    literal = folded.statements[0].value
+    assert literal.token.start == program.statements[0].value.token.start, "position was lost"
@@ -0,0 +1,143 @@
+import pickle
+
+import pytest
+
+from interpret_deez import lexer, parser
+from interpret_deez.emulate_repl import emulate_repl
+from interpret_deez.parse_cache import ParseCache
+
+
+def test_parse_cache_hit(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    input = "let x = 1 * 2 * 3; let y = fn(a) { a + x };"
+
+    program, errors, diagnostics = cache.parse(input)
+    assert errors == diagnostics == [], f"unexpected parser errors. got={errors}"
+    assert len(list(cache.version_directory.glob("*.pickle"))) == 1, "entry was not stored"
+
+    def fail_parse(self):
+        raise AssertionError("cached source was parsed again")
+
+    monkeypatch.setattr(parser.Parser, "parse_program", fail_parse)
+    cached, cached_errors, _ = ParseCache(tmp_path).parse(input)
+
+    assert cached == program, f"expected={program.to_string()}, got={cached.to_string()}"
+    assert cached_errors == errors, f"expected={errors}, got={cached_errors}"
+
+
+def test_parse_cache_keeps_errors(tmp_path):
+    cache = ParseCache(tmp_path)
+    input = "let = 5;"
+
+    pars = parser.Parser(lexer.Lexer(input))
+    pars.parse_program()
+
+    for _ in range(2):
+        _, errors, diagnostics = cache.parse(input)
+        assert errors == pars.get_errors(), f"expected={pars.get_errors()}, got={errors}"
+        assert diagnostics == pars.get_diagnostics(), f"got={diagnostics}"
+
+
+def test_parse_cache_corrupted_entry(tmp_path):
+    cache = ParseCache(tmp_path)
+    input = "1 + 2"
+    expected, _, _ = cache.parse(input)
+
+    cache.entry_path(input).write_bytes(b"not a pickle")
+    program, _, _ = cache.parse(input)
+
+    assert program == expected, f"expected={expected.to_string()}, got={program.to_string()}"
+
+
+def test_parse_cache_eviction(tmp_path):
+    cache = ParseCache(tmp_path, max_bytes=0)
+    cache.parse("1 + 2")
+    cache.parse("3 + 4")
+
+    entries = list(cache.version_directory.glob("*.pickle"))
+    assert entries == [], f"cache over max_bytes was not evicted. got={entries}"
+
+
+def test_parse_cache_grammar_version(tmp_path, monkeypatch):
+    old = ParseCache(tmp_path)
+    old.parse("1 + 2")
+
+    next_version = f"{int(parser.GRAMMAR_VERSION, 16) ^ 1:016x}"
+    monkeypatch.setattr(parser, "GRAMMAR_VERSION", next_version)
+    new = ParseCache(tmp_path)
+
+    assert not old.version_directory.exists(), "entries of an old grammar version were kept"
+    assert new.version_directory.exists(), "new grammar version directory was not created"
+
+
+def test_parse_cache_keeps_foreign_directories(tmp_path):
+    for name in ("venv", "vendor", "v1", f"v{'0' * 16}.bak"):
+        (tmp_path / name).mkdir()
+
+    ParseCache(tmp_path)
+
+    for name in ("venv", "vendor", "v1", f"v{'0' * 16}.bak"):
+        assert (tmp_path / name).is_dir(), f"directory not owned by the cache was removed: {name}"
+
+
+def test_parse_cache_load_evicted_entry(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    cache.parse("1 + 2")
+    path = cache.entry_path("1 + 2")
+    load = pickle.load
+
+    def load_then_evict(file):
+        result = load(file)
+        path.unlink()
+        return result
+
+    monkeypatch.setattr(pickle, "load", load_then_evict)
+    result = cache.load(path)
+
+    assert result is not None, "stored entry was not loaded"
+    assert not path.exists(), "an entry evicted while loading was recreated"
+
+
+def test_parse_cache_store_failure_cleans_up(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", fail_replace)
+    with pytest.raises(OSError):
+        cache.parse("1 + 2")
+
+    leftovers = list(cache.version_directory.iterdir())
+    assert leftovers == [], f"temporary files were left behind. got={leftovers}"
+
+
+def test_grammar_version():
+    version = parser.grammar_version()
+
+    assert version == parser.GRAMMAR_VERSION, f"got={version}"
+    assert len(version) == 16 and int(version, 16) >= 0, f"not a hex digest. got={version}"
+
+
+def test_grammar_version_without_sources(tmp_path, monkeypatch):
+    for module in ("tokenizer", "lexer", "ast", "parser"):
+        (tmp_path / f"{module}.pyc").write_bytes(module.encode())
+    monkeypatch.setattr(parser, "__file__", str(tmp_path / "parser.pyc"))
+    bytecode = parser.grammar_version()
+
+    for path in tmp_path.iterdir():
+        path.unlink()
+    fallback = parser.grammar_version()
+
+    assert bytecode != parser.GRAMMAR_VERSION, "bytecode was not hashed"
+    assert len(fallback) == 16 and int(fallback, 16) >= 0, f"not a hex digest. got={fallback}"
+
+
+def test_emulate_parser_with_cache(tmp_path):
+    cache = ParseCache(tmp_path)
+    input = "x * y / 2 + 3 * 8 - 123"
+
+    expected = emulate_repl.emulate_parser(input)
+    for _ in range(2):
+        got = emulate_repl.emulate_parser(input, cache)
+        assert got == expected, f"expected={expected}, got={got}"
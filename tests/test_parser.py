@@ -1,9 +1,12 @@
 # type: ignore[reportOptionalMemberAccess, reportGeneralTypeIssues]
 
+import io
+import json
+
 import pytest
 from pytest_check import check
 
-from interpret_deez import ast, lexer, parser
+from interpret_deez import ast, lexer, parser, parser_profiling, parser_tracing, tokenizer
 
 
 @pytest.mark.parametrize(
@@ -50,6 +53,79 @@ def test_parse_errors_should_fail(input):
     check_parse_errors(pars)
 
 
+def test_parse_error_messages():
+    lex = lexer.Lexer("let x 5;")
+    pars = parser.Parser(lex)
+    pars.parse_program()
+
+    expected = ["expected next token to be '=', got 'INT' instead"]
+    assert pars.get_errors() == expected, f"expected={expected}, got={pars.get_errors()}"
+
+
+@pytest.mark.parametrize(
+    "input, expected_program, expected_errors",
+    [
+        ("let = 5; x", "x", ["expected next token to be 'IDENT', got '=' instead"]),
+        ("if (x { y }; z", "z", ["expected next token to be ')', got '{' instead"]),
+        ("fn() { x + }; y", "fn() (x + )y", ["no prefix parse function } found"]),
+        ("f(fn() { x } y); z", "f()z", ["expected next token to be ')', got 'IDENT' instead"]),
+        (
+            "let f = fn() { let = 1; x }; f()",
+            "let f = fn() x;f()",
+            ["expected next token to be 'IDENT', got '=' instead"],
+        ),
+        (
+            "let a 1; let b = (2; let c = 3;",
+            "let b =;let c = 3;",
+            [
+                "expected next token to be '=', got 'INT' instead",
+                "expected next token to be ')', got ';' instead",
+            ],
+        ),
+        (
+            "let f = fn() { if (x) { y + } }; let g = 1;",
+            "let f = fn() ifx (y + );let g = 1;",
+            ["no prefix parse function } found"],
+        ),
+        ("fn() { if (x) { y + } z }; w", "fn() ifx (y + )zw", ["no prefix parse function } found"]),
+    ],
+)
+def test_error_recovery(input, expected_program, expected_errors):
+    """One error per broken statement, parsing resumes after its `;` or its block"""
+    pars = parser.Parser(lexer.Lexer(input))
+    program = pars.parse_program()
+
+    assert pars.get_errors() == expected_errors, f"got={pars.get_errors()}"
+    assert program.to_string() == expected_program, f"got={program.to_string()}"
+
+
+def test_error_recovery_keeps_enclosing_blocks():
+    """An error on the `}` of a nested block closes only that block"""
+    pars = parser.Parser(lexer.Lexer("fn() { if (x) { y + } z }; w"))
+    program = pars.parse_program()
+
+    body = program.statements[0].expression.body.statements
+    assert [statement.to_string() for statement in body] == ["ifx (y + )", "z"], f"got={body}"
+    assert len(program.statements) == 2, f"got={program.statements}"
+
+
+def test_diagnostics():
+    input = "let a = 1;\nlet b 2;\n  (3;\n"
+    pars = parser.Parser(lexer.Lexer(input))
+    pars.parse_program()
+
+    expected = [
+        parser.Diagnostic("expected next token to be '=', got 'INT' instead", 17, 18),
+        parser.Diagnostic("expected next token to be ')', got ';' instead", 24, 25),
+    ]
+    assert pars.diagnostics == expected, f"got={pars.diagnostics}"
+    assert [diagnostic.message for diagnostic in pars.diagnostics] == pars.get_errors()
+    assert pars.diagnostics[0].line_column(input) == (2, 7)
+    lines = tokenizer.LineIndex(input)
+    positions = [diagnostic.line_column(lines) for diagnostic in pars.diagnostics]
+    assert positions == [(2, 7), (3, 5)], f"got={positions}"
+
+
 @pytest.mark.parametrize(
     "input,expected_value",
     [
@@ -369,20 +445,121 @@ def test_operator_precedence(input, expected):
     assert program_string == expected, f"expected={expected}, got={program_string}"
 
 
+def test_parse_token_buffer():
+    input = "let add = fn(x, y) { x + y; }; if (add(1, 2 * 3) > 5) { return !true; } else { -a }"
+
+    pars = parser.Parser(lexer.Lexer(input))
+    expected = pars.parse_program()
+    check_parse_errors(pars)
+
+    for tokens in (lexer.tokenize_all(input), lexer.tokenize_bytes(input.encode())):
+        pars = parser.Parser(tokens)
+        program = pars.parse_program()
+        check_parse_errors(pars)
+
+        assert program == expected, f"expected={expected.to_string()}, got={program.to_string()}"
+
+
 def test_tracer_operator_precedence():
     input = "-1 * 2 + 3"
     expected = "(((-1) * 2) + 3)"
     lex = lexer.Lexer(input)
-    pars = parser.Parser(lex, enable_defer=True)
+    tracer = parser_tracing.TraceDeez()
+    pars = parser.Parser(lex, tracer=tracer)
     program = pars.parse_program()
     check_parse_errors(pars)
 
-    print(f"\nOperator precedence for input: {input}")
-    print(f"Operator precedence expected result: {expected}")
+    out = io.StringIO()
+    tracer.dump_tree(out)
+    tree = out.getvalue().splitlines()
+    assert tree[:2] == ["BEGIN parse_program", "\tBEGIN parse_statement"], f"got={tree[:2]}"
+    assert tree[-1] == "END parse_program", f"got={tree[-1]}"
+    assert len(tree) == 2 * len(tracer.events), "every rule needs a BEGIN and an END line"
+    assert "\t\t\t\tBEGIN parse_infix_expression" in tree, f"got={tree}"
 
     program_string = program.to_string()
     assert program_string == expected, f"expected={expected}, got={program_string}"
 
+    rules = [(event.rule, event.token, event.depth) for event in tracer.events]
+    assert rules[:6] == [
+        ("parse_program", 0, 0),
+        ("parse_statement", 0, 1),
+        ("parse_expression_statement", 0, 2),
+        ("parse_expression", 0, 3),
+        ("parse_prefix_expression", 0, 4),
+        ("parse_expression", 1, 5),
+    ], f"got={rules[:6]}"
+    assert rules.count(("parse_infix_expression", 3, 4)) == 1, f"got={rules}"
+    assert all(event.duration > 0 for event in tracer.events), "events were not closed"
+
+
+def test_tracer_outputs():
+    tracer = parser_tracing.TraceDeez()
+    parser.Parser(lexer.Lexer("f(1 + 2)"), tracer=tracer).parse_program()
+
+    out = io.StringIO()
+    tracer.dump_json(out)
+    trace_events = json.loads(out.getvalue())["traceEvents"]
+    assert [event["name"] for event in trace_events] == [event.rule for event in tracer.events]
+    assert trace_events[0]["dur"] == tracer.events[0].duration / 1000
+
+    folded = dict(line.rsplit(" ", 1) for line in tracer.folded())
+    total = sum(int(nanoseconds) for nanoseconds in folded.values())
+    assert total == tracer.events[0].duration, "self times do not add up to the whole parse"
+    stack = "parse_program;parse_statement;parse_expression_statement;parse_expression"
+    assert f"{stack};parse_call_expression;parse_call_arguments" in folded, f"got={folded}"
+
+
+def test_profile_counters():
+    out = io.StringIO()
+    profile = parser_profiling.ParseProfile(out=out)
+    pars = parser.Parser(lexer.Lexer("-1 * 2 + 3; f(x);"), profile=profile)
+    program = pars.parse_program()
+    check_parse_errors(pars)
+
+    assert program.to_string() == "(((-1) * 2) + 3)f(x)", f"got={program.to_string()}"
+    assert profile.tokens[tokenizer.INT] == 3, f"got={profile.tokens}"
+    assert profile.tokens[tokenizer.SEMICOLON] == 2, f"got={profile.tokens}"
+    assert profile.calls["parse_infix_expression", tokenizer.ASTERISK] == 1
+    assert profile.calls["parse_infix_expression", tokenizer.PLUS] == 1
+    assert profile.calls["parse_call_expression", tokenizer.LPAREN] == 1
+    assert profile.rule_calls()["parse_expression"] == 6, f"got={profile.rule_calls()}"
+    assert profile.cumulative["parse_program"] >= profile.cumulative["parse_expression"]
+    assert sum(profile.own.values()) == profile.cumulative["parse_program"], (
+        "own times do not add up to the whole parse"
+    )
+
+    report = out.getvalue()
+    assert report.startswith("rule"), "report was not written at the end of parse_program"
+    assert "infix ASTERISK parse_infix_expression" in report, report
+    assert report.index("parse_program") < report.index("parse_expression"), (
+        "rules are not sorted by cumulative time"
+    )
+
+
+def test_untraced_parser_is_not_instrumented():
+    pars = parser.Parser(lexer.Lexer("1 + 2"))
+    assert type(pars) is parser.Parser, "parser is instrumented without a tracer"
+    assert pars.prefix_parse_functions[tokenizer.INT] is parser.Parser.parse_integer_literal
+
+    traced = parser.Parser(lexer.Lexer("1 + 2"), tracer=parser_tracing.TraceDeez())
+    assert isinstance(traced, parser.Parser), f"got={type(traced)}"
+    assert traced.prefix_parse_functions[tokenizer.INT] is type(traced).parse_integer_literal
+    untraced = parser.Parser.prefix_parse_functions[tokenizer.INT]
+    assert untraced is parser.Parser.parse_integer_literal, "tracing changed the other parsers"
+
+
+def test_parser_reuse():
+    pars = parser.Parser(lexer.TableLexer(""))
+    for input, expected, errors in [
+        ("let x = 1 * 2;", "let x = (1 * 2);", 0),
+        ("let = 5", "", 1),
+        ("-a + b", "((-a) + b)", 0),
+    ]:
+        program = pars.parse(input)
+        assert program.to_string() == expected, f"{input}: got={program.to_string()}"
+        assert len(pars.errors) == errors, f"{input}: errors={pars.errors}"
+
 
 def test_if_expression():
     input = "if (x < y) { x };"
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from interpret_deez import ast, closure_compiler, compiler, evaluator, objects, vm
+from interpret_deez.program_cache import CacheStats, ProgramCache
+
+
+def test_program_cache_hit():
+    cache = ProgramCache()
+    input = "x * y / 2 + 3 * 8 - 123"
+
+    program, errors, _ = cache.parse(input)
+    cached, cached_errors, _ = cache.parse(input)
+
+    assert cached is program, "cached program is not shared"
+    assert cached_errors == errors == (), f"unexpected parser errors. got={cached_errors}"
+    assert program.to_string() == "((((x * y) / 2) + (3 * 8)) - 123)", (
+        f"wrong program. got={program.to_string()}"
+    )
+    assert cache.stats == CacheStats(hits=1, misses=1), f"wrong stats. got={cache.stats}"
+
+
+def test_program_cache_keeps_errors():
+    cache = ProgramCache()
+    _, errors, diagnostics = cache.parse("let = 5;")
+
+    assert errors, "parser errors were not returned"
+    assert [diagnostic.message for diagnostic in diagnostics] == list(errors)
+    assert (diagnostics[0].start, diagnostics[0].end) == (4, 5), f"got={diagnostics[0]}"
+    assert cache.parse("let = 5;")[1] is errors, "cached errors are not shared"
+    assert cache.parse("let = 5;")[2] is diagnostics, "cached diagnostics are not shared"
+
+
+def test_program_cache_program_is_immutable():
+    """Hits share one program, no caller can add or remove nodes for the others"""
+    cache = ProgramCache()
+    program, errors, _ = cache.parse("let f = fn(a) { a }; f(1)")
+
+    with pytest.raises(AttributeError):
+        program.statements.pop()
+    with pytest.raises(AttributeError):
+        program.statements[0].value.parameters.append(None)
+    with pytest.raises(AttributeError):
+        program.statements[0].value.body.statements.clear()
+    with pytest.raises(AttributeError):
+        program.statements[1].expression.arguments.append(None)
+    with pytest.raises(AttributeError):
+        errors.append("error")
+
+    cached, _, _ = cache.parse("let f = fn(a) { a }; f(1)")
+    assert cached is program, "cached program is not shared"
+    assert cached.to_string() == "let f = fn(a) a;f(1)", (
+        f"a hit was changed. got={cached.to_string()}"
+    )
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda program: evaluator.evaluate(program, objects.Environment()),
+        lambda program: closure_compiler.compile_program(program)(objects.Environment()),
+        lambda program: run_vm(program),
+    ],
+    ids=["walker", "closures", "vm"],
+)
+def test_program_cache_program_runs(run):
+    cache = ProgramCache()
+    input = "let add = fn(a, b) { a + b }; let x = 2; add(x, 1) * 3"
+
+    for _ in range(2):
+        program, _, _ = cache.parse(input)
+        result = run(program)
+        assert result == objects.Integer(9), f"wrong result. got={result}"
+
+
+def run_vm(program: ast.Program) -> objects.Object | None:
+    comp = compiler.Compiler()
+    comp.compile(program)
+    machine = vm.VM(comp.bytecode())
+    machine.run()
+    return machine.last_popped_stack_elem()
+
+
+def test_program_cache_evicts_least_recently_used():
+    cache = ProgramCache(capacity=2)
+    cache.parse("1")
+    cache.parse("2")
+    cache.parse("1")
+    cache.parse("3")
+
+    assert list(cache.entries) == ["1", "3"], f"wrong entries kept. got={list(cache.entries)}"
+    assert cache.stats.evictions == 1, f"wrong evictions. got={cache.stats.evictions}"
+
+
+def test_program_cache_ttl():
+    now = [0.0]
+    cache = ProgramCache(ttl=10, clock=lambda: now[0])
+
+    first, _, _ = cache.parse("1 + 2")
+    now[0] = 9.0
+    assert cache.parse("1 + 2")[0] is first, "entry expired before its ttl"
+    now[0] = 10.0
+    assert cache.parse("1 + 2")[0] is not first, "entry did not expire after its ttl"
+
+    assert cache.stats == CacheStats(hits=1, misses=2, expirations=1), (
+        f"wrong stats. got={cache.stats}"
+    )
+
+
+def test_program_cache_threads():
+    cache = ProgramCache(capacity=8)
+    inputs = [f"{i} * x + {i}" for i in range(16)]
+
+    # an assert failing in a thread does not fail the test, failures are checked afterwards
+    failures = []
+
+    def worker():
+        for _ in range(20):
+            for input in inputs:
+                program, _, _ = cache.parse(input)
+                if not program.statements:
+                    failures.append(f"empty program for {input}")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == [], f"got={failures}"
+    stats = cache.stats
+    assert stats.hits + stats.misses == 4 * 20 * 16, f"lookups were lost. got={stats}"
+    assert len(cache) <= 8, f"cache grew over its capacity. got={len(cache)}"
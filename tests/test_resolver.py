@@ -0,0 +1,117 @@
+import pytest
+
+from interpret_deez import ast, lexer, parser, resolver
+
+
+def parse(input: str) -> ast.Program:
+    pars = parser.Parser(lexer.Lexer(input))
+    program = pars.parse_program()
+    assert not pars.errors, f"parser errors: {pars.errors}"
+    return program
+
+
+def identifiers(node) -> list[ast.Identifier]:
+    """Every identifier of a tree in source order, definitions included"""
+    match node:
+        case ast.Program() | ast.BlockStatement():
+            return [found for statement in node.statements for found in identifiers(statement)]
+        case ast.Identifier():
+            return [node]
+        case ast.LetStatement():
+            return [node.name, *identifiers(node.value)]
+        case ast.FunctionLiteral():
+            return [*node.parameters, *identifiers(node.body)]
+    return [found for child in resolver.children(node) for found in identifiers(child)]
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let a = 1; let b = a;", [("a", 0, 0), ("b", 0, 1), ("a", 0, 0)]),
+        ("let a = 1; let a = a + 1;", [("a", 0, 0), ("a", 0, 0), ("a", 0, 0)]),
+        (
+            "let f = fn(x, y) { let z = x; z + y };",
+            [
+                ("f", 0, 0),
+                ("x", 0, 0),
+                ("y", 0, 1),
+                ("z", 0, 2),
+                ("x", 0, 0),
+                ("z", 0, 2),
+                ("y", 0, 1),
+            ],
+        ),
+        # enclosing scopes are visible wherever they bind the name, the function runs later
+        (
+            "let f = fn() { g() }; let g = fn() { f };",
+            [("f", 0, 0), ("g", 1, 1), ("g", 0, 1), ("f", 1, 0)],
+        ),
+        # inside a scope the name is only bound from its let on
+        (
+            "let x = 1; fn() { let y = x; let x = 2; x }",
+            [("x", 0, 0), ("y", 0, 0), ("x", 1, 0), ("x", 0, 1), ("x", 0, 1)],
+        ),
+        # if blocks bind in the scope around them
+        ("fn(c) { if (c) { let t = 1; } t }", [("c", 0, 0), ("c", 0, 0), ("t", 0, 1), ("t", 0, 1)]),
+        (
+            "fn(a) { fn(b) { fn() { a + b } } }",
+            [("a", 0, 0), ("b", 0, 0), ("a", 2, 0), ("b", 1, 0)],
+        ),
+    ],
+)
+def test_resolve(input, expected):
+    program = parse(input)
+
+    resolution = resolver.resolve(program)
+
+    assert not resolution.errors, f"unexpected errors: {resolution.errors}"
+    got = []
+    for identifier in identifiers(program):
+        binding = resolution.lookup(identifier)
+        assert binding is not None, f"{identifier.value} was not resolved"
+        got.append((binding.name, binding.depth, binding.slot))
+    assert got == expected, f"got={got}"
+
+
+def test_free_variables():
+    program = parse("let g = 1; let make = fn(x) { let y = 2; fn(z) { fn() { g + x + y + z } } };")
+    make = program.statements[1].value
+    middle = make.body.statements[1].expression
+    inner = middle.body.statements[0].expression
+
+    resolution = resolver.resolve(program)
+
+    # seen from the scope creating each function, globals are never captured
+    assert resolution.free(make) == [], f"got={resolution.free(make)}"
+    assert resolution.free(middle) == [
+        resolver.Binding("x", 0, 0),
+        resolver.Binding("y", 0, 1),
+    ], f"got={resolution.free(middle)}"
+    assert resolution.free(inner) == [
+        resolver.Binding("x", 1, 0),
+        resolver.Binding("y", 1, 1),
+        resolver.Binding("z", 0, 0),
+    ], f"got={resolution.free(inner)}"
+    assert resolution.slot_counts[id(program)] == 2
+    assert resolution.slot_counts[id(make)] == 2
+    assert resolution.slot_counts[id(inner)] == 0
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("x", ["x"]),
+        ("let a = b; let b = 1;", ["b"]),
+        ("let f = fn(x) { x + y }; f(z)", ["y", "z"]),
+        ("let x = x;", ["x"]),
+        ("fn(a) { a }; a", ["a"]),
+    ],
+)
+def test_unresolved(input, expected):
+    program = parse(input)
+
+    resolution = resolver.resolve(program)
+
+    got = [identifier.value for identifier in resolution.unresolved]
+    assert got == expected, f"got={got}"
+    assert resolution.errors == [f"identifier not found: {name}" for name in expected]
@@ -0,0 +1,53 @@
+from interpret_deez import symbol_table
+from interpret_deez.symbol_table import Symbol, SymbolTable
+
+
+def test_define_and_resolve():
+    global_table = SymbolTable()
+    global_table.define("a")
+    local = SymbolTable(outer=global_table)
+    local.define("b")
+    nested = SymbolTable(outer=local)
+    nested.define("c")
+
+    expected = [
+        Symbol("a", symbol_table.GLOBAL_SCOPE, 0),
+        Symbol("b", symbol_table.FREE_SCOPE, 0),
+        Symbol("c", symbol_table.LOCAL_SCOPE, 0),
+    ]
+    for symbol in expected:
+        got = nested.resolve(symbol.name)
+        assert got == symbol, f"expected {symbol.name} to resolve to {symbol}, got={got}"
+
+    assert nested.free_symbols == [Symbol("b", symbol_table.LOCAL_SCOPE, 0)], (
+        f"free symbols are wrong. got={nested.free_symbols}"
+    )
+
+
+def test_resolve_unresolvable():
+    table = SymbolTable(outer=SymbolTable())
+    assert table.resolve("missing") is None, "expected missing to be unresolvable"
+
+
+def test_define_function_name_is_shadowed():
+    table = SymbolTable()
+    table.define_function_name("a")
+    table.define("a")
+
+    got = table.resolve("a")
+    expected = Symbol("a", symbol_table.GLOBAL_SCOPE, 0)
+    assert got == expected, f"expected a to resolve to {expected}, got={got}"
+
+
+def test_define_global_again_keeps_slot():
+    global_table = SymbolTable()
+    first = global_table.define("a")
+    global_table.define("b")
+    again = global_table.define("a")
+    local = SymbolTable(outer=global_table)
+    local.define("c")
+    local_again = local.define("c")
+
+    assert again == first, f"expected a to keep {first}, got={again}"
+    assert global_table.num_definitions == 2, f"got={global_table.num_definitions}"
+    assert local_again == Symbol("c", symbol_table.LOCAL_SCOPE, 1), f"got={local_again}"
@@ -0,0 +1,127 @@
+import re
+
+import pytest
+
+from interpret_deez import compiler, evaluator, lexer, objects, parser, vm
+
+
+def run(input: str) -> objects.Object | None:
+    comp = compiler.Compiler()
+    comp.compile(parser.Parser(lexer.Lexer(input)).parse_program())
+    machine = vm.VM(comp.bytecode())
+    machine.run()
+    return machine.last_popped_stack_elem()
+
+
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("1 + 2", 3),
+        ("50 / 2 * 2 + 10 - 5", 55),
+        ("5 * (2 + 10)", 60),
+        ("-50 + 100 + -50", 0),
+        ("-7 / 2", -3),
+        ("if (true) { 10 }", 10),
+        ("if (1 > 2) { 10 } else { 20 }", 20),
+        ("let one = 1; let two = one + one; one + two", 3),
+        ("let one = fn() { let one = 1; one }; one() + one()", 2),
+        ("let add = fn(a, b) { a + b }; add(1, 2)", 3),
+        ("let early = fn() { return 99; 100; }; early()", 99),
+        ("let newAdder = fn(a) { fn(b) { a + b } }; newAdder(2)(3)", 5),
+        (
+            "let newAdder = fn(a, b) { let c = a + b; fn(d) { let e = d + c; fn(f) { e + f } } };"
+            "newAdder(1, 2)(3)(8)",
+            14,
+        ),
+        (
+            "let wrapper = fn() { let countDown = fn(x) { if (x == 0) { return 0; } "
+            "else { countDown(x - 1); } }; countDown(1); }; wrapper();",
+            0,
+        ),
+        ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15)", 610),
+        ("return 5; 10", 5),
+        ("if (false) { let a = 1; }; if (a) { 1 } else { 2 }", 2),
+        ("let x = 5; let y = fn() { x }; let x = 6; y()", 6),
+        ("let f = fn() { 1 }; let g = fn() { f() }; let f = fn() { 2 }; g()", 2),
+    ],
+)
+def test_integer_results(input, expected):
+    result = run(input)
+    assert isinstance(result, objects.Integer), f"object is not Integer. got={result}"
+    assert result.value == expected, f"object has wrong value. got={result.value}, want={expected}"
+
+
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("true", objects.TRUE),
+        ("1 < 2", objects.TRUE),
+        ("1 == 2", objects.FALSE),
+        ("true != false", objects.TRUE),
+        ("(1 > 2) == false", objects.TRUE),
+        ("!5", objects.FALSE),
+        ("!(if (false) { 5; })", objects.TRUE),
+        ("if (false) { 10 }", objects.NULL),
+        ("if (true) { let a = 1; }", objects.NULL),
+        ("let noReturn = fn() { }; noReturn();", objects.NULL),
+        # the slot of `b` held the local `a` of the previous call
+        (
+            "let f = fn() { let a = 5; a }; let g = fn() { if (false) { let b = 1; }; b };"
+            " f(); g()",
+            objects.NULL,
+        ),
+        ("if (false) { let a = 1; }; a", objects.NULL),
+        ("if (false) { let a = 1; }; !a", objects.TRUE),
+        ("fn() { return; }()", objects.NULL),
+        ("fn() { if (true) { return; }; 1 }()", objects.NULL),
+    ],
+)
+def test_singleton_results(input, expected):
+    result = run(input)
+    assert result is expected, f"wrong result. want={expected}, got={result}"
+
+
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("5 + true", "type mismatch: INTEGER + BOOLEAN"),
+        ("-true", "unknown operator: -BOOLEAN"),
+        ("1 / 0", "division by zero"),
+        ("fn() { 1; }(1);", "wrong number of arguments: want=0, got=1"),
+        ("1(2)", "not a function: INTEGER"),
+        ("let loop = fn() { loop() }; loop()", "stack overflow"),
+        ("1 < true", "type mismatch: INTEGER < BOOLEAN"),
+        ("if (false) { let a = 1; }; -a", "unknown operator: -NULL"),
+        ("if (false) { let a = 1; }; a + 1", "type mismatch: NULL + INTEGER"),
+        ("if (false) { let a = 1; }; a()", "not a function: NULL"),
+    ],
+)
+def test_runtime_errors(input, expected):
+    with pytest.raises(vm.VMError, match=re.escape(expected)):
+        run(input)
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "let x = 1; let x = x + 1; x",
+        "let x = 1; fn() { let x = x + 1; x }()",
+        "let f = fn(x) { let x = x * 2; let x = x + 1; x }; f(3)",
+        "let x = 10; let f = fn() { let y = x; let x = y + 1; x }; f()",
+        "1 < true",
+        "let f = fn() { let x = 1; }; f()",
+        "let x = 5; let y = fn() { x }; let x = 6; y()",
+        "fn() { return; }()",
+    ],
+)
+def test_vm_matches_evaluator(input):
+    program = parser.Parser(lexer.Lexer(input)).parse_program()
+    expected = evaluator.evaluate(program, objects.Environment())
+
+    if isinstance(expected, objects.Error):
+        with pytest.raises(vm.VMError, match=re.escape(expected.message)):
+            run(input)
+    else:
+        # a missing value is None for the evaluator, the VM pushes NULL
+        result = run(input)
+        assert result == evaluator.or_null(expected), f"expected={expected}, got={result}"